@@ -15,6 +15,9 @@ MAX_TG_FILE_SIZE = 2**31
 DEFAULT_SIZE_LIMIT = 20 * 2**20
 MIN_CHUNK_SIZE = 5 * 2**20
 MAX_CHUNK_SIZE = MAX_TG_FILE_SIZE
+DEFAULT_TRANSFER_MEMORY_LIMIT = 100 * 2**20
+DEFAULT_ARCHIVE_MAX_SIZE = 4 * 2**30
+MIN_SHARE_LINK_DAYS = 2
 
 
 class Database(BaseModel):
@@ -27,6 +30,12 @@ class Database(BaseModel):
     :param port: The port number on which the database server listens, defaults to 5432.
     :param driver: The database driver to use, defaults to "asyncpg".
     :param database_system: The type of database system, defaults to "postgresql".
+    :param user_cache_size: Maximum number of users cached in process, defaults to 1000.
+    :param user_cache_ttl: Seconds a user is cached in process, defaults to 60.
+    :param pool_size: Number of connections kept in the pool, defaults to 5.
+    :param max_overflow: Number of connections allowed above `pool_size`, defaults to 10.
+    :param pool_timeout: Seconds to wait for a connection from the pool, defaults to 30.
+    :param pool_pre_ping: Test connections for liveness on checkout, defaults to True.
     """
 
     host: str
@@ -36,6 +45,12 @@ class Database(BaseModel):
     port: int = 5432
     driver: str = "asyncpg"
     database_system: str = "postgresql"
+    user_cache_size: int = 1000
+    user_cache_ttl: int = 60
+    pool_size: int = 5
+    max_overflow: int = 10
+    pool_timeout: float = 30
+    pool_pre_ping: bool = True
 
     @property
     def url(self) -> str:
@@ -62,6 +77,9 @@ class Redis(BaseModel):
     :param password: Password for Redis authentication, defaults to None.
     :param state_ttl: Time-to-live for state data in Redis, defaults to None.
     :param data_ttl: Time-to-live for operational data in Redis, defaults to None.
+    :param user_ttl: Time-to-live for cached authorized users in Redis, defaults to 3600.
+    :param tg_file_id_ttl: Time-to-live for Telegram file ids of sent files in Redis,
+        defaults to None.
     """
 
     host: str
@@ -71,6 +89,8 @@ class Redis(BaseModel):
     password: str | None = None
     state_ttl: int | None = None
     data_ttl: int | None = None
+    user_ttl: int | None = 3600
+    tg_file_id_ttl: int | None = None
 
 
 class Webhook(BaseModel):
@@ -118,6 +138,56 @@ class Nextcloud(BaseModel):
     :param port: Port number on which the Nextcloud server listens, defaults to 80.
     :param chunksize: Maximum size of file chunks for uploads, defaults to MIN_CHUNK_SIZE.
     :param overwrite: Overwrite settings for Nextcloud server, defaults to None.
+    :param pool_size: Maximum number of pooled per-user clients, defaults to 100.
+    :param pool_ttl: Seconds after which an idle pooled client is closed, defaults to 600.
+    :param listing_cache_size: Maximum number of cached fsnode listings, defaults to 1000.
+    :param path_index_size: Maximum number of fsnodes in the path index, defaults to 100000.
+    :param trashbin_cache_size: Maximum number of cached trash bin snapshots, defaults to 100.
+    :param trashbin_cache_ttl: Seconds a trash bin snapshot is used without listing the trash
+        bin again, defaults to 60.
+    :param search_cache_size: Maximum number of cached search results, defaults to 100.
+    :param search_cache_ttl: Seconds the search results are cached, defaults to 30.
+    :param search_window: Number of search results fetched from the server at once,
+        defaults to 64.
+    :param index: Keep a local index of users' files in the database and search in it,
+        defaults to False.
+    :param index_interval: Seconds between crawls updating the index, defaults to 300.
+    :param index_concurrency: Maximum number of users whose files are crawled at once,
+        defaults to 4.
+    :param fuzzy_search: Search the index by trigram similarity of names and paths,
+        defaults to True.
+    :param fuzzy_search_limit: Maximum number of fuzzy search results, defaults to 200.
+    :param fuzzy_search_timeout: Milliseconds a fuzzy search query may take before falling
+        back to the substring search, defaults to 500.
+    :param tg_file_cache_size: Maximum number of Telegram file ids of sent files cached in
+        process, defaults to 10000.
+    :param share_link_days: Number of days after which the share links of files too big to
+        be sent to Telegram expire, at least 2, defaults to 2.
+    :param share_link_cache_size: Maximum number of cached share links, defaults to 1000.
+    :param download_connections: Number of concurrent range requests used to download files
+        bigger than `spool_size`, 1 disables ranged downloads, defaults to 4.
+    :param download_retries: Number of retries of a failed range request, defaults to 3.
+    :param upload_retries: Number of retries of a failed upload chunk, defaults to 3.
+    :param upload_concurrency: Maximum number of files of one media group uploaded at once,
+        defaults to 3.
+    :param download_concurrency: Maximum number of selected files downloaded at once to be
+        sent as a media group, defaults to 3.
+    :param delete_concurrency: Maximum number of selected fsnodes deleted at once,
+        defaults to 4.
+    :param trashbin_concurrency: Maximum number of trash bin items restored or deleted at
+        once, defaults to 4.
+    :param archive_concurrency: Maximum number of directories listed at once while a
+        directory is archived, defaults to 4.
+    :param archive_max_size: Maximum total size of a directory downloaded as a zip archive,
+        defaults to DEFAULT_ARCHIVE_MAX_SIZE.
+    :param upload_progress_size: Maximum number of interrupted uploads whose progress is
+        kept in process when Redis is not configured, defaults to 1000.
+    :param upload_progress_ttl: Number of seconds the progress of an interrupted upload is
+        kept, Nextcloud removes unfinished uploads after a day, defaults to 86400.
+    :param spool_size: Size above which a transferred file is spooled to disk, defaults to
+        MIN_CHUNK_SIZE.
+    :param transfer_memory_limit: Maximum memory held by all in-flight transfers, defaults to
+        DEFAULT_TRANSFER_MEMORY_LIMIT.
     """
 
     protocol: str = "https"
@@ -125,12 +195,52 @@ class Nextcloud(BaseModel):
     port: int = 443
     chunksize: int = MIN_CHUNK_SIZE
     overwrite: Overwrite | None = None
+    pool_size: int = 100
+    pool_ttl: int = 600
+    listing_cache_size: int = 1000
+    path_index_size: int = 100000
+    trashbin_cache_size: int = 100
+    trashbin_cache_ttl: int = 60
+    search_cache_size: int = 100
+    search_cache_ttl: int = 30
+    search_window: int = 64
+    index: bool = False
+    index_interval: int = 300
+    index_concurrency: int = 4
+    fuzzy_search: bool = True
+    fuzzy_search_limit: int = 200
+    fuzzy_search_timeout: int = 500
+    tg_file_cache_size: int = 10000
+    share_link_days: int = 2
+    share_link_cache_size: int = 1000
+    download_connections: int = 4
+    download_retries: int = 3
+    upload_retries: int = 3
+    upload_concurrency: int = 3
+    download_concurrency: int = 3
+    delete_concurrency: int = 4
+    trashbin_concurrency: int = 4
+    archive_concurrency: int = 4
+    archive_max_size: int = DEFAULT_ARCHIVE_MAX_SIZE
+    upload_progress_size: int = 1000
+    upload_progress_ttl: int = 86400
+    spool_size: int = MIN_CHUNK_SIZE
+    transfer_memory_limit: int = DEFAULT_TRANSFER_MEMORY_LIMIT
 
     @property
     def url(self) -> str:
         """Constructs and returns the URL for connecting to the Nextcloud server."""
         return f"{self.protocol}://{self.host}:{self.port}"
 
+    @field_validator("share_link_days")
+    @classmethod
+    def check_share_link_days(cls, v: int) -> int:
+        """Validates that a share link outlives the last day it is reused on."""
+        if v < MIN_SHARE_LINK_DAYS:
+            msg = f"Share links must expire after at least {MIN_SHARE_LINK_DAYS} days."
+            raise ValueError(msg)
+        return v
+
     @field_validator("chunksize")
     @classmethod
     def check_chunksize(cls, v: int) -> int:
@@ -153,6 +263,12 @@ class Telegram(BaseModel):
     :param drop_pending_updates: Whether to drop pending updates on bot restart, defaults to True.
     :param api_server: The URL of the Telegram API server, defaults to None.
     :param local_mode: Use local requests if True, defaults to False.
+    :param local_dir: Directory shared with the Telegram API server where downloaded files are
+        put in local mode, defaults to None (system temporary directory).
+    :param album_latency: Seconds to wait for the rest of a media group after its first
+        message, defaults to 0.5.
+    :param min_upload_speed: Slowest transfer rate in bytes per second an uploaded file is
+        expected to be received from Telegram at, defaults to 262144.
     """
 
     token: str
@@ -162,6 +278,14 @@ class Telegram(BaseModel):
     drop_pending_updates: bool = True
     api_server: str | None = None
     local_mode: bool = False
+    local_dir: str | None = None
+    album_latency: float = 0.5
+    min_upload_speed: int = 256 * 2**10
+
+    @property
+    def upload_timeout(self) -> int:
+        """Seconds a file of `max_upload_size` may take to be received at the slowest rate."""
+        return max(60, self.max_upload_size // self.min_upload_speed)
 
     @field_validator("max_upload_size")
     @classmethod
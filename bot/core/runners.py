@@ -4,6 +4,7 @@ import asyncio
 
 from aiogram import Bot, Dispatcher, loggers
 from aiogram.enums import MenuButtonType
+from aiogram.fsm.storage.redis import RedisStorage
 from aiogram.types import BotCommand, MenuButtonWebApp, WebAppInfo
 from aiogram.webhook.aiohttp_server import SimpleRequestHandler, setup_application
 from aiogram_i18n import I18nMiddleware
@@ -11,8 +12,17 @@ from aiogram_i18n.cores.fluent_runtime_core import FluentRuntimeCore
 from aiohttp.web import Application, AppRunner, TCPSite
 
 from bot.core.config import settings
+from bot.db import user_cache
 from bot.handlers import routers
 from bot.middlewares import LocaleManager, QueryMsgMD
+from bot.nextcloud import (
+    index_crawler,
+    listing_cache,
+    nc_pool,
+    single_flight,
+    tg_file_cache,
+    upload_progress,
+)
 
 
 async def _set_menu_button(bot: Bot) -> None:
@@ -66,6 +76,14 @@ async def on_startup(dispatcher: Dispatcher, bot: Bot) -> None:
     i18n_middleware.setup(dispatcher=dispatcher)
     dispatcher.callback_query.middleware.register(QueryMsgMD())
 
+    if isinstance(dispatcher.storage, RedisStorage):
+        user_cache.use_redis(dispatcher.storage.redis)
+        tg_file_cache.use_redis(dispatcher.storage.redis)
+        upload_progress.use_redis(dispatcher.storage.redis)
+
+    if settings.nc.index:
+        index_crawler.start()
+
     loggers.dispatcher.info("Bot started.")
 
 
@@ -83,6 +101,12 @@ async def on_shutdown(dispatcher: Dispatcher, bot: Bot) -> None:
     await bot.delete_webhook(drop_pending_updates=settings.tg.drop_pending_updates)
     await bot.session.close()
 
+    await index_crawler.stop()
+    await nc_pool.close()
+
+    loggers.dispatcher.info("Nextcloud listing cache: %s.", listing_cache.stats)
+    loggers.dispatcher.info("Nextcloud single-flight calls: %s.", single_flight.stats)
+
     loggers.dispatcher.info("Bot stopped.")
 
 
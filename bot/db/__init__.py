@@ -1,8 +1,12 @@
 """Database-related functionalities."""
 from .database import session_maker
 from .uow import UnitOfWork
+from .user_cache import CachedUser, UserCache, user_cache
 
 __all__ = (
     "session_maker",
     "UnitOfWork",
+    "CachedUser",
+    "UserCache",
+    "user_cache",
 )
@@ -4,5 +4,11 @@ from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 
 from bot.core import settings
 
-_engine = create_async_engine(settings.db.url, pool_pre_ping=True)
+_engine = create_async_engine(
+    settings.db.url,
+    pool_size=settings.db.pool_size,
+    max_overflow=settings.db.max_overflow,
+    pool_timeout=settings.db.pool_timeout,
+    pool_pre_ping=settings.db.pool_pre_ping,
+)
 session_maker = async_sessionmaker(_engine)
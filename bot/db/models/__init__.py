@@ -1,8 +1,10 @@
 """Data models for SQLAlchemy ORM."""
 from .base import Base
+from .fsnode import IndexedFsNode
 from .user import User
 
 __all__ = (
     "Base",
     "User",
+    "IndexedFsNode",
 )
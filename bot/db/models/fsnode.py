@@ -0,0 +1,57 @@
+"""Indexed fsnode model."""
+
+from datetime import datetime
+
+from sqlalchemy import BigInteger, ForeignKey, Index
+from sqlalchemy.orm import Mapped, mapped_column
+
+from bot.db.models import Base
+
+
+class IndexedFsNode(Base):
+    """Metadata of a user's fsnode kept in the local index.
+
+    :param user_id: Telegram identifier of the owner, part of the primary key.
+    :param file_id: Nextcloud file id of the fsnode, part of the primary key.
+    :param parent_id: File id of the parent directory, None for the root.
+    :param name: Name of the fsnode.
+    :param path: Path of the fsnode relative to the user's root.
+    :param is_dir: Whether the fsnode is a directory.
+    :param mimetype: MIME type of the fsnode.
+    :param size: Size of the fsnode in bytes.
+    :param last_modified: Time of the last modification of the fsnode.
+    :param etag: Etag of the fsnode, empty for directories whose content is not indexed yet.
+    """
+
+    __tablename__ = "fsnodes"
+    __table_args__ = (
+        Index("ix_fsnodes_user_id_parent_id", "user_id", "parent_id"),
+        Index("ix_fsnodes_user_id_name", "user_id", "name"),
+        Index(
+            "ix_fsnodes_name_trgm",
+            "name",
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"},
+        ),
+        Index(
+            "ix_fsnodes_path_trgm",
+            "path",
+            postgresql_using="gin",
+            postgresql_ops={"path": "gin_trgm_ops"},
+        ),
+    )
+
+    user_id: Mapped[int] = mapped_column(
+        ForeignKey("users.id", ondelete="CASCADE"),
+        primary_key=True,
+        nullable=False,
+    )
+    file_id: Mapped[str] = mapped_column(primary_key=True, nullable=False)
+    parent_id: Mapped[str] = mapped_column(nullable=True)
+    name: Mapped[str] = mapped_column(nullable=False)
+    path: Mapped[str] = mapped_column(nullable=False)
+    is_dir: Mapped[bool] = mapped_column(nullable=False)
+    mimetype: Mapped[str] = mapped_column(nullable=False)
+    size: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    last_modified: Mapped[datetime] = mapped_column(nullable=False)
+    etag: Mapped[str] = mapped_column(nullable=False)
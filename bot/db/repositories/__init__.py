@@ -1,10 +1,12 @@
 """Repository interfaces and implementations."""
 
 from ._abstract import _AbstractRepository, _Repository
+from ._fsnode import _FsNodeRepository
 from ._user import _UserRepository
 
 __all__ = (
     "_AbstractRepository",
     "_Repository",
     "_UserRepository",
+    "_FsNodeRepository",
 )
@@ -0,0 +1,275 @@
+from collections.abc import Sequence
+from datetime import UTC, datetime
+
+from nc_py_api import FsNode
+from sqlalchemy import case, delete, exists, func, literal, or_, select, update
+from sqlalchemy import text as sql_text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from bot.db.models import IndexedFsNode
+from bot.db.repositories import _Repository
+
+QUERY_CANCELED = "57014"
+
+
+def _naive_utc(value: datetime) -> datetime:
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(UTC).replace(tzinfo=None)
+
+
+class _FsNodeRepository(_Repository[IndexedFsNode]):
+    """Repository of the local fsnode index."""
+
+    def __init__(self, session: AsyncSession) -> None:
+        super().__init__(session, IndexedFsNode)
+
+    async def get_fsnode(self, user_id: int, file_id: str) -> IndexedFsNode | None:
+        """Return the indexed fsnode.
+
+        :param user_id: Telegram user id.
+        :param file_id: Nextcloud file id of the fsnode.
+        :return: The indexed fsnode or None if it is not indexed.
+        """
+        return await self._session.get(IndexedFsNode, (user_id, file_id))
+
+    async def is_indexed(self, user_id: int) -> bool:
+        """Check whether the file tree of the user was fully indexed at least once.
+
+        The etag of the root is stored only when a crawl of the whole tree completes.
+
+        :param user_id: Telegram user id.
+        :return: True if a crawl of the user's whole tree has completed.
+        """
+        statement = select(
+            exists().where(
+                IndexedFsNode.user_id == user_id,
+                IndexedFsNode.parent_id.is_(None),
+                IndexedFsNode.etag != "",
+            ),
+        )
+        return bool(await self._session.scalar(statement))
+
+    async def search_name(
+        self,
+        user_id: int,
+        text: str,
+        limit: int | None = None,
+    ) -> Sequence[IndexedFsNode]:
+        """Find the fsnodes of the user whose name contains the text, ignoring case.
+
+        :param user_id: Telegram user id.
+        :param text: Part of the name.
+        :param limit: Maximum number of returned fsnodes, defaults to None (all).
+        :return: The found fsnodes ordered by name.
+        """
+        statement = (
+            select(IndexedFsNode)
+            .where(
+                IndexedFsNode.user_id == user_id,
+                IndexedFsNode.parent_id.is_not(None),
+                IndexedFsNode.name.icontains(text, autoescape=True),
+            )
+            .order_by(IndexedFsNode.name)
+            .limit(limit)
+        )
+        return (await self._session.scalars(statement)).all()
+
+    async def search_fuzzy(
+        self,
+        user_id: int,
+        text: str,
+        limit: int,
+        statement_timeout: int,
+    ) -> Sequence[IndexedFsNode] | None:
+        """Find the fsnodes of the user whose name or path is similar to the text.
+
+        Trigram similarity of the name and word similarity of the path are used, so
+        typos are tolerated. The results are ranked by similarity, then by recency.
+
+        :param user_id: Telegram user id.
+        :param text: The searched text.
+        :param limit: Maximum number of returned fsnodes.
+        :param statement_timeout: Maximum duration of the query in milliseconds.
+        :return: The found fsnodes or None if the query did not finish in time.
+        """
+        similarity = func.greatest(
+            func.similarity(IndexedFsNode.name, text),
+            func.word_similarity(text, IndexedFsNode.path),
+        )
+        statement = (
+            select(IndexedFsNode)
+            .where(
+                IndexedFsNode.user_id == user_id,
+                IndexedFsNode.parent_id.is_not(None),
+                or_(
+                    IndexedFsNode.name.icontains(text, autoescape=True),
+                    IndexedFsNode.name.op("%")(text),
+                    literal(text).op("<%")(IndexedFsNode.path),
+                ),
+            )
+            .order_by(similarity.desc(), IndexedFsNode.last_modified.desc())
+            .limit(limit)
+        )
+        try:
+            async with self._session.begin_nested():
+                await self._session.execute(
+                    sql_text(f"SET LOCAL statement_timeout = {int(statement_timeout)}"),
+                )
+                fsnodes = (await self._session.scalars(statement)).all()
+                # Releasing the savepoint keeps the setting for the rest of the transaction.
+                await self._session.execute(sql_text("SET LOCAL statement_timeout = DEFAULT"))
+                return fsnodes
+        except DBAPIError as error:
+            if getattr(error.orig, "sqlstate", None) != QUERY_CANCELED:
+                raise
+            return None
+
+    async def save_listing(
+        self,
+        user_id: int,
+        fsnode: FsNode,
+        attached_fsnodes: list[FsNode],
+        parent_id: str | None,
+    ) -> list[FsNode]:
+        """Replace the indexed content of the directory with its fresh listing.
+
+        The etag of a directory is only stored by :meth:`save_etag` once its whole subtree
+        is indexed. Until then the listed directory and its attached directories that are
+        new or whose etag changed keep their previous etag, new ones an empty etag, so an
+        interrupted crawl lists them again. Vanished fsnodes are removed with all their
+        descendants, descendants of moved directories get their new paths.
+
+        :param user_id: Telegram user id.
+        :param fsnode: The listed directory.
+        :param attached_fsnodes: The list of fsnodes attached to the directory.
+        :param parent_id: File id of the parent of the directory, None for the root.
+        :return: The attached directories whose content has to be indexed.
+        """
+        attached_ids = [attached_fsnode.file_id for attached_fsnode in attached_fsnodes]
+        stored = {
+            record.file_id: record
+            for record in await self._session.scalars(
+                select(IndexedFsNode).where(
+                    IndexedFsNode.user_id == user_id,
+                    IndexedFsNode.file_id.in_(attached_ids),
+                ),
+            )
+        }
+
+        vanished = await self._session.scalars(
+            select(IndexedFsNode).where(
+                IndexedFsNode.user_id == user_id,
+                IndexedFsNode.parent_id == fsnode.file_id,
+                IndexedFsNode.file_id.not_in(attached_ids),
+            ),
+        )
+        for record in vanished.all():
+            await self._delete_subtree(user_id, record)
+
+        pending = []
+        for attached_fsnode in attached_fsnodes:
+            if not attached_fsnode.is_dir:
+                continue
+            record = stored.get(attached_fsnode.file_id)
+            path = attached_fsnode.user_path.rstrip("/")
+            if record is not None and record.path != path:
+                await self._move_subtree(user_id, record.path, path)
+            if record is None or record.etag != attached_fsnode.etag:
+                pending.append(attached_fsnode)
+
+        pending_ids = {pending_fsnode.file_id for pending_fsnode in pending}
+        values = [self._values(user_id, fsnode, parent_id, "")]
+        values.extend(
+            self._values(
+                user_id,
+                attached_fsnode,
+                fsnode.file_id,
+                "" if attached_fsnode.file_id in pending_ids else attached_fsnode.etag,
+            )
+            for attached_fsnode in attached_fsnodes
+        )
+        statement = insert(IndexedFsNode).values(values)
+        statement = statement.on_conflict_do_update(
+            index_elements=[IndexedFsNode.user_id, IndexedFsNode.file_id],
+            set_={
+                **{
+                    column: statement.excluded[column]
+                    for column in (
+                        "parent_id",
+                        "name",
+                        "path",
+                        "is_dir",
+                        "mimetype",
+                        "size",
+                        "last_modified",
+                        "updated_at",
+                    )
+                },
+                "etag": case(
+                    (statement.excluded.etag == "", IndexedFsNode.etag),
+                    else_=statement.excluded.etag,
+                ),
+            },
+        )
+        await self._session.execute(statement)
+        await self._session.flush()
+        return pending
+
+    async def save_etag(self, user_id: int, fsnode: FsNode) -> None:
+        """Store the etag of the directory whose whole subtree is indexed.
+
+        :param user_id: Telegram user id.
+        :param fsnode: The indexed directory.
+        """
+        await self._session.execute(
+            update(IndexedFsNode)
+            .where(IndexedFsNode.user_id == user_id, IndexedFsNode.file_id == fsnode.file_id)
+            .values(etag=fsnode.etag),
+        )
+
+    async def _delete_subtree(self, user_id: int, record: IndexedFsNode) -> None:
+        if record.is_dir:
+            await self._session.execute(
+                delete(IndexedFsNode).where(
+                    IndexedFsNode.user_id == user_id,
+                    IndexedFsNode.path.startswith(f"{record.path}/", autoescape=True),
+                ),
+            )
+        await self._session.delete(record)
+
+    async def _move_subtree(self, user_id: int, old_path: str, new_path: str) -> None:
+        await self._session.execute(
+            update(IndexedFsNode)
+            .where(
+                IndexedFsNode.user_id == user_id,
+                IndexedFsNode.path.startswith(f"{old_path}/", autoescape=True),
+            )
+            .values(path=new_path + func.substr(IndexedFsNode.path, len(old_path) + 1))
+            .execution_options(synchronize_session=False),
+        )
+
+    @staticmethod
+    def _values(
+        user_id: int,
+        fsnode: FsNode,
+        parent_id: str | None,
+        etag: str,
+    ) -> dict[str, object]:
+        now = datetime.now(UTC).replace(tzinfo=None)
+        return {
+            "user_id": user_id,
+            "file_id": fsnode.file_id,
+            "parent_id": parent_id,
+            "name": fsnode.name,
+            "path": fsnode.user_path.rstrip("/"),
+            "is_dir": fsnode.is_dir,
+            "mimetype": fsnode.info.mimetype,
+            "size": fsnode.info.size,
+            "last_modified": _naive_utc(fsnode.info.last_modified),
+            "etag": etag,
+            "created_at": now,
+            "updated_at": now,
+        }
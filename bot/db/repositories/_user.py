@@ -1,7 +1,11 @@
+from collections.abc import Sequence
+
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from bot.db.models import User
 from bot.db.repositories import _Repository
+from bot.db.user_cache import CachedUser, user_cache
 
 
 class _UserRepository(_Repository[User]):
@@ -9,3 +13,33 @@ class _UserRepository(_Repository[User]):
 
     def __init__(self, session: AsyncSession) -> None:
         super().__init__(session, User)
+        self._memo: dict[int, CachedUser | None] = {}
+
+    async def get_ids(self) -> Sequence[int]:
+        """Return the ids of all authorized users.
+
+        :return: Telegram user ids.
+        """
+        return (await self._session.scalars(select(User.id))).all()
+
+    async def get_cached(self, ident: int) -> CachedUser | None:
+        """Return credentials of the authorized user.
+
+        The result is memoized for the lifetime of the repository, i.e. for one update,
+        and authorized users are looked up in :data:`user_cache` before the database.
+
+        :param ident: Telegram user id.
+        :return: The user or None if the user is not authorized.
+        """
+        if ident in self._memo:
+            return self._memo[ident]
+
+        user = await user_cache.get(ident)
+        if user is None:
+            record = await self.get_by_id(ident)
+            if record is not None:
+                user = CachedUser.model_validate(record, from_attributes=True)
+                await user_cache.set(user)
+
+        self._memo[ident] = user
+        return user
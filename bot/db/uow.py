@@ -10,11 +10,19 @@ from typing import Self
 
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
-from bot.db.repositories import _UserRepository
+from bot.db.repositories import _FsNodeRepository, _UserRepository
 
 
 class _AbstractUnitOfWork(ABC):
-    users: _UserRepository
+    @property
+    @abstractmethod
+    def users(self) -> _UserRepository:
+        raise NotImplementedError
+
+    @property
+    @abstractmethod
+    def fsnodes(self) -> _FsNodeRepository:
+        raise NotImplementedError
 
     async def __aenter__(self) -> Self:
         return self
@@ -37,20 +45,60 @@ class _AbstractUnitOfWork(ABC):
 
 
 class UnitOfWork(_AbstractUnitOfWork):
-    """Unit of work implementation."""
+    """Unit of work implementation.
+
+    The session, and so a pooled connection, is acquired lazily on the first access
+    to a repository, updates that never touch the database do not check out a connection.
+    """
 
     def __init__(self, session_factory: async_sessionmaker[AsyncSession]) -> None:
         self._session_factory = session_factory
+        self._session: AsyncSession | None = None
+        self._users: _UserRepository | None = None
+        self._fsnodes: _FsNodeRepository | None = None
+
+    @property
+    def session(self) -> AsyncSession:
+        """Session of the unit of work, created on first access."""
+        if self._session is None:
+            self._session = self._session_factory()
+        return self._session
+
+    @property
+    def users(self) -> _UserRepository:
+        """User repository bound to the session of the unit of work."""
+        if self._users is None:
+            self._users = _UserRepository(self.session)
+        return self._users
+
+    @property
+    def fsnodes(self) -> _FsNodeRepository:
+        """Fsnode index repository bound to the session of the unit of work."""
+        if self._fsnodes is None:
+            self._fsnodes = _FsNodeRepository(self.session)
+        return self._fsnodes
 
-    async def __aenter__(self) -> Self:
-        self._session = self._session_factory()
-        self.users = _UserRepository(self._session)
-        return await super().__aenter__()
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        try:
+            await super().__aexit__(exc_type, exc_value, traceback)
+        finally:
+            if self._session is not None:
+                await self._session.close()
 
     async def commit(self) -> None:
         """Method to commit any changes made during the unit of work."""
-        await self._session.commit()
+        if self._session is not None:
+            await self._session.commit()
 
     async def rollback(self) -> None:
-        """If do not commit, or if exit the context manager by raising an error, do a rollback."""
-        await self._session.rollback()
+        """If do not commit, or if exit the context manager by raising an error, do a rollback.
+
+        Nothing is done if no transaction is in progress.
+        """
+        if self._session is not None and self._session.in_transaction():
+            await self._session.rollback()
@@ -0,0 +1,115 @@
+"""Cache of authorized users in front of the users table.
+
+The first level is an in-process LRU cache with a short time-to-live, so other workers'
+changes are picked up quickly. The optional second level is the Redis of the FSM storage
+shared by all workers, the users are stored there encrypted.
+"""
+
+import base64
+import hashlib
+
+from cryptography.fernet import Fernet, InvalidToken
+from pydantic import BaseModel
+from redis.asyncio import Redis
+
+from bot.core import settings
+from bot.utils import LRUCache
+
+
+class CachedUser(BaseModel):
+    """Credentials of an authorized user.
+
+    :param id: Unique Telegram identifier for the user.
+    :param nc_login: The user's Nextcloud login name.
+    :param nc_app_password: The user's Nextcloud app password.
+    """
+
+    id: int
+    nc_login: str
+    nc_app_password: str
+
+
+class UserCache:
+    """Two-level cache of authorized users.
+
+    Only authorized users are cached, a missing user is always looked up in the database.
+    The shared Redis level is used once a client is attached with :meth:`use_redis`. The
+    users are encrypted with a key derived from the secret, so app passwords are never
+    readable from Redis and entries written with another secret are ignored.
+
+    :param max_size: Maximum number of users in the in-process cache.
+    :param ttl: Number of seconds a user is kept in the in-process cache.
+    :param secret: Secret the encryption key of the Redis level is derived from.
+    :param redis_ttl: Number of seconds a user is kept in Redis, defaults to None (forever).
+    """
+
+    key_prefix = "nc_tg_bot:user:"
+
+    def __init__(
+        self,
+        max_size: int,
+        ttl: int,
+        secret: str,
+        redis_ttl: int | None = None,
+    ) -> None:
+        self._users: LRUCache[int, CachedUser] = LRUCache(max_size, ttl=ttl)
+        self._fernet = Fernet(base64.urlsafe_b64encode(hashlib.sha256(secret.encode()).digest()))
+        self._redis: Redis | None = None
+        self._redis_ttl = redis_ttl
+
+    def use_redis(self, redis: Redis) -> None:
+        """Share the cached users between workers through Redis.
+
+        :param redis: Redis client, e.g. the one of the FSM storage.
+        """
+        self._redis = redis
+
+    async def get(self, user_id: int) -> CachedUser | None:
+        """Return the cached user.
+
+        :param user_id: Telegram user id.
+        :return: The user or None if the user is not cached.
+        """
+        user = self._users.get(user_id)
+        if user is not None or self._redis is None:
+            return user
+
+        raw_user = await self._redis.get(f"{self.key_prefix}{user_id}")
+        if raw_user is None:
+            return None
+        try:
+            user = CachedUser.model_validate_json(self._fernet.decrypt(raw_user))
+        except InvalidToken:
+            return None
+        self._users.set(user_id, user)
+        return user
+
+    async def set(self, user: CachedUser) -> None:
+        """Put the user into both cache levels.
+
+        :param user: The user to cache.
+        """
+        self._users.set(user.id, user)
+        if self._redis is not None:
+            await self._redis.set(
+                f"{self.key_prefix}{user.id}",
+                self._fernet.encrypt(user.model_dump_json().encode()),
+                ex=self._redis_ttl,
+            )
+
+    async def invalidate(self, user_id: int) -> None:
+        """Remove the user from both cache levels, e.g. on authorization or logout.
+
+        :param user_id: Telegram user id.
+        """
+        self._users.pop(user_id)
+        if self._redis is not None:
+            await self._redis.delete(f"{self.key_prefix}{user_id}")
+
+
+user_cache = UserCache(
+    max_size=settings.db.user_cache_size,
+    ttl=settings.db.user_cache_ttl,
+    secret=settings.tg.token,
+    redis_ttl=settings.redis.user_ttl if settings.redis else None,
+)
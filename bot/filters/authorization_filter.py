@@ -23,7 +23,7 @@ class AuthorizedFilter(BaseFilter):
         if event.from_user is None:
             msg = "Event object must have the 'from_user' attribute."
             raise AttributeError(msg)
-        if await uow.users.get_by_id(event.from_user.id):
+        if await uow.users.get_cached(event.from_user.id):
             return True
         await event.answer(text=i18n.get("not-authorized"))
         return False
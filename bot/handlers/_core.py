@@ -1,6 +1,7 @@
 from typing import Any, TypeVar
 from urllib.parse import urlparse
 
+from aiogram import html
 from aiogram.types import InlineKeyboardMarkup
 from aiogram_i18n import I18nContext
 from nc_py_api import FsNode
@@ -82,12 +83,13 @@ def get_trashbin_msg(
     i18n: I18nContext,
     trashbin: list[FsNode],
     trashbin_size: int,
+    selected: set[int] | None = None,
     **kwargs: Any,
 ) -> tuple[str, InlineKeyboardMarkup | None]:
     if trashbin == []:
         text = i18n.get("trashbin-empty")
         return text, None
-    fsnodes_on_page = get_page_items(trashbin, **kwargs)
+    fsnodes_on_page = get_page_items(TrashbinBoard.selectable_fsnodes(trashbin), **kwargs)
     fsnodes_text = "\n".join(
         [
             i18n.get(
@@ -107,6 +109,7 @@ def get_trashbin_msg(
     text = f"{trashbin_text}\n{fsnodes_text}"
     reply_markup = TrashbinBoard(
         fsnodes=trashbin,
+        selected=selected,
         **kwargs,
     ).get_kb()
     return text, reply_markup
@@ -116,6 +119,8 @@ def get_search_msg(
     i18n: I18nContext,
     query: str,
     fsnodes: list[FsNode],
+    *,
+    complete: bool = True,
     **kwargs: Any,
 ) -> tuple[str, InlineKeyboardMarkup | None]:
     if fsnodes == []:
@@ -128,7 +133,12 @@ def get_search_msg(
             for fsnode in fsnodes_on_page
         ],
     )
-    text = f"{i18n.get('search', count=len(fsnodes), query=query)}\n{fsnodes_text}"
+    search_text = i18n.get(
+        "search" if complete else "search-partial",
+        count=len(fsnodes),
+        query=html.quote(query),
+    )
+    text = f"{search_text}\n{fsnodes_text}"
     reply_markup = SearchBoard(
         query=query,
         fsnodes=fsnodes,
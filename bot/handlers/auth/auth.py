@@ -8,10 +8,11 @@ from aiogram_i18n import I18nContext
 from nc_py_api import AsyncNextcloud, NextcloudException
 
 from bot.core import settings
-from bot.db import UnitOfWork
+from bot.db import UnitOfWork, user_cache
 from bot.db.models import User
 from bot.handlers._core import overwrite_url
 from bot.keyboards import menu_board
+from bot.nextcloud import nc_pool
 
 AUTH_TIMEOUT = 60 * 20
 AUTH_TIMEOUT_IN_MIN = AUTH_TIMEOUT // 60
@@ -36,7 +37,7 @@ async def auth(
     """
     msg_from_user = cast(TgUser, message.from_user)
 
-    if await uow.users.get_by_id(msg_from_user.id):
+    if await uow.users.get_cached(msg_from_user.id):
         return await message.reply(text=i18n.get("already-authorized"), reply_markup=menu_board())
 
     init = await nc.loginflow_v2.init(user_agent=settings.appname)
@@ -63,6 +64,8 @@ async def auth(
     )
     await uow.users.add(user)
     await uow.commit()
+    await user_cache.invalidate(msg_from_user.id)
+    await nc_pool.invalidate(msg_from_user.id)
 
     await init_message.edit_text(text=i18n.get("auth-success"))
 
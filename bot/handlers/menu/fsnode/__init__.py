@@ -7,8 +7,15 @@ from aiogram_i18n import LazyFilter
 from .back import back
 from .cancel import cancel_callback, cancel_message
 from .delete import delete, delete_confirm
-from .download import download
+from .download import download, download_dir
 from .menu import menu
+from .multiselect import (
+    multiselect,
+    multiselect_delete,
+    multiselect_delete_confirm,
+    multiselect_send,
+    multiselect_start,
+)
 from .new import (
     incorrectly_mkdir,
     mkdir,
@@ -20,8 +27,16 @@ from .new import (
 )
 from .pag import pag
 from .select import select
+from bot.core import settings
 from bot.filters import AuthorizedFilter, OnlyPrivateFilter
-from bot.keyboards.callback_data_factories import FsNodeData, FsNodeMenuActions, FsNodeMenuData
+from bot.keyboards.callback_data_factories import (
+    FsNodeData,
+    FsNodeMenuActions,
+    FsNodeMenuData,
+    FsNodeSelectActions,
+    FsNodeSelectData,
+)
+from bot.middlewares import AlbumMD
 from bot.states import FsNodeMenuStatesGroup
 
 
@@ -31,6 +46,7 @@ def fsnode_menu_router() -> Router:
     :return: Router with fsnode menu messages.
     """
     router = Router()
+    router.message.middleware.register(AlbumMD(latency=settings.tg.album_latency))
 
     # Menu block.
     router.message.register(
@@ -104,6 +120,29 @@ def fsnode_menu_router() -> Router:
         download,
         FsNodeMenuData.filter(F.action == FsNodeMenuActions.DOWNLOAD),
     )
+    router.callback_query.register(
+        download_dir,
+        FsNodeMenuData.filter(F.action == FsNodeMenuActions.DOWNLOAD_DIR),
+    )
+
+    # Multi-select block.
+    router.callback_query.register(
+        multiselect_start,
+        FsNodeMenuData.filter(F.action == FsNodeMenuActions.SELECT),
+    )
+    router.callback_query.register(
+        multiselect_send,
+        FsNodeSelectData.filter(F.action == FsNodeSelectActions.SEND),
+    )
+    router.callback_query.register(
+        multiselect_delete,
+        FsNodeSelectData.filter(F.action == FsNodeSelectActions.DELETE),
+    )
+    router.callback_query.register(
+        multiselect_delete_confirm,
+        FsNodeSelectData.filter(F.action == FsNodeSelectActions.DELETE_CONFIRM),
+    )
+    router.callback_query.register(multiselect, FsNodeSelectData.filter())
 
     # Back block.
     router.callback_query.register(back, FsNodeMenuData.filter(F.action == FsNodeMenuActions.BACK))
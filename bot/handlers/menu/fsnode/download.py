@@ -1,30 +1,37 @@
 """Download fsnode handler."""
 
+import pathlib
 from typing import cast
 
+from aiogram import Bot
+from aiogram.exceptions import TelegramBadRequest, TelegramEntityTooLarge
 from aiogram.types import CallbackQuery, Document, Message
 from aiogram_i18n import I18nContext
-from nc_py_api import AsyncNextcloud
+from nc_py_api import AsyncNextcloud, NextcloudException
 
 from bot.core import settings
-from bot.handlers._core import get_human_readable_bytes
+from bot.handlers._core import get_human_readable_bytes, overwrite_url
 from bot.keyboards.callback_data_factories import FsNodeMenuData
-from bot.nextcloud import FsNodeService
+from bot.nextcloud import FsNodeService, tg_file_cache
 from bot.nextcloud.exceptions import FsNodeNotFoundError
 
 
 async def download(
     query: CallbackQuery,
+    bot: Bot,
     callback_data: FsNodeMenuData,
     i18n: I18nContext,
     nc: AsyncNextcloud,
 ) -> Message | Document | bool:
     """Downloads a file from Nextcloud server.
 
-    If the file is larger than the specified size, then a link will be sent,
-    which will be valid for 8 hours.
+    If the file is larger than the specified size, then a public share link will be sent,
+    which will be valid for `settings.nc.share_link_days` days. In local mode the file is
+    passed to the Telegram Bot API server by its path on the shared volume. A file version
+    that was already sent is sent again by its Telegram file id without transferring it.
 
     :param query: Callback query object.
+    :param bot: Bot object.
     :param callback_data: Callback data object containing the necessary data for fsnode.
     :param i18n: I18nContext.
     :param nc: AsyncNextcloud.
@@ -40,14 +47,89 @@ async def download(
         return await query.answer(text=i18n.get("fsnode-empty"))
 
     if srv.fsnode.info.size > settings.tg.max_download_size:
+        try:
+            link = await srv.get_share_link()
+        except NextcloudException:
+            text = i18n.get(
+                "fsnode-size-limit",
+                size=get_human_readable_bytes(srv.fsnode.info.size),
+                size_limit=get_human_readable_bytes(settings.tg.max_download_size),
+            )
+            return await query.answer(text=text)
         text = i18n.get(
-            "fsnode-size-limit",
+            "fsnode-share-link",
             size=get_human_readable_bytes(srv.fsnode.info.size),
             size_limit=get_human_readable_bytes(settings.tg.max_download_size),
+            link=overwrite_url(link),
         )
-        return await query.answer(text=text)
+        msg = await query_msg.answer(text=text)
+        await query.answer()
+        return msg
 
-    doc = await query_msg.answer_document(await srv.download())
+    tg_file_id = await tg_file_cache.get(srv.fsnode)
+    if tg_file_id is not None:
+        try:
+            doc = await query_msg.answer_document(tg_file_id)
+        except TelegramBadRequest:
+            await tg_file_cache.invalidate(srv.fsnode)
+        else:
+            await query.answer()
+            return doc
+
+    if bot.session.api.is_local:
+        async with srv.download_to_dir(settings.tg.local_dir) as path:
+            server_path = pathlib.Path(bot.session.api.wrap_local_file.to_server(path))
+            doc = await query_msg.answer_document(server_path.as_uri())
+    else:
+        async with srv.download() as input_file:
+            doc = await query_msg.answer_document(input_file)
+    if doc.document is not None:
+        await tg_file_cache.set(srv.fsnode, doc.document.file_id)
     await query.answer()
 
     return doc
+
+
+async def download_dir(
+    query: CallbackQuery,
+    callback_data: FsNodeMenuData,
+    i18n: I18nContext,
+    nc: AsyncNextcloud,
+) -> Message | bool:
+    """Downloads a directory from Nextcloud server as a zip archive.
+
+    The archive is built on disk while the directory tree is walked. If it is larger than
+    `settings.tg.max_download_size`, it is sent as several volumes. A failure while the
+    archive is built or sent is reported to the user.
+
+    :param query: Callback query object.
+    :param callback_data: Callback data object containing the necessary data for fsnode.
+    :param i18n: I18nContext.
+    :param nc: AsyncNextcloud.
+    """
+    query_msg = cast(Message, query.message)
+
+    try:
+        srv = await FsNodeService.create_instance(nc, file_id=callback_data.file_id)
+    except FsNodeNotFoundError:
+        return await query_msg.edit_text(text=i18n.get("fsnode-not-found"))
+
+    if srv.fsnode.info.size > settings.nc.archive_max_size:
+        text = i18n.get(
+            "fsnode-size-limit",
+            size=get_human_readable_bytes(srv.fsnode.info.size),
+            size_limit=get_human_readable_bytes(settings.nc.archive_max_size),
+        )
+        return await query.answer(text=text)
+
+    await query.answer(text=i18n.get("fsnode-archive-start", name=srv.fsnode.name))
+    try:
+        async with srv.download_archive() as input_files:
+            docs = [await query_msg.answer_document(input_file) for input_file in input_files]
+    except (OSError, NextcloudException, TelegramBadRequest, TelegramEntityTooLarge):
+        return await query_msg.answer(
+            text=i18n.get("fsnode-archive-error", name=srv.fsnode.name),
+        )
+    if len(docs) > 1:
+        return await query_msg.answer(text=i18n.get("fsnode-archive-volumes", count=len(docs)))
+    return docs[-1]
@@ -0,0 +1,362 @@
+"""Multi-select mode handlers of the fsnode menu."""
+
+import asyncio
+import pathlib
+from contextlib import AsyncExitStack, suppress
+from typing import cast
+
+from aiogram import Bot, html
+from aiogram.exceptions import TelegramBadRequest
+from aiogram.fsm.context import FSMContext
+from aiogram.types import CallbackQuery, InlineKeyboardMarkup, InputMediaDocument, Message
+from aiogram_i18n import I18nContext
+from nc_py_api import AsyncNextcloud, FsNode
+
+from bot.core import settings
+from bot.handlers._core import get_fsnode_msg, get_human_readable_bytes
+from bot.keyboards import FsNodeMenuBoard, fsnode_select_delete_board
+from bot.keyboards.callback_data_factories import (
+    FsNodeMenuData,
+    FsNodeSelectActions,
+    FsNodeSelectData,
+)
+from bot.nextcloud import FsNodeService, tg_file_cache
+from bot.nextcloud.exceptions import FsNodeNotFoundError
+from bot.states import MAX_SELECTION, Selection
+
+MEDIA_GROUP_SIZE = 10
+
+
+async def multiselect_start(
+    query: CallbackQuery,
+    state: FSMContext,
+    callback_data: FsNodeMenuData,
+    i18n: I18nContext,
+    nc: AsyncNextcloud,
+) -> Message | bool:
+    """Switch the fsnode menu to the multi-select mode.
+
+    :param query: Callback query object.
+    :param state: State machine context.
+    :param callback_data: Callback data object containing the necessary data for fsnode.
+    :param i18n: I18nContext.
+    :param nc: AsyncNextcloud.
+    """
+    query_msg = cast(Message, query.message)
+
+    try:
+        srv = await FsNodeService.create_instance(nc, file_id=callback_data.file_id)
+    except FsNodeNotFoundError:
+        return await query_msg.edit_text(text=i18n.get("fsnode-not-found"))
+
+    selection = Selection(message_id=query_msg.message_id)
+    text, reply_markup = _get_selection_msg(i18n, srv, selection, callback_data.page)
+    await selection.save(state)
+    with suppress(TelegramBadRequest):
+        msg = await query_msg.edit_text(text=text, reply_markup=reply_markup)
+    await query.answer(text=i18n.get("fsnode-select-start"))
+    return msg
+
+
+async def multiselect(
+    query: CallbackQuery,
+    state: FSMContext,
+    callback_data: FsNodeSelectData,
+    i18n: I18nContext,
+    nc: AsyncNextcloud,
+) -> Message | bool:
+    """Toggle a file, turn the page or leave the multi-select mode.
+
+    :param query: Callback query object.
+    :param state: State machine context.
+    :param callback_data: Callback data object containing the necessary data for fsnode.
+    :param i18n: I18nContext.
+    :param nc: AsyncNextcloud.
+    """
+    query_msg = cast(Message, query.message)
+
+    selection = await Selection.load(state, query_msg.message_id)
+    page = callback_data.page
+    if callback_data.action == FsNodeSelectActions.TOGGLE:
+        if callback_data.index >= MAX_SELECTION:
+            return await query.answer(text=i18n.get("fsnode-select-limit", limit=MAX_SELECTION))
+        if selection is not None:
+            selection.toggle(callback_data.index)
+    elif callback_data.action == FsNodeSelectActions.PAG_NEXT:
+        page += 1
+    elif callback_data.action == FsNodeSelectActions.PAG_BACK:
+        page -= 1
+
+    try:
+        srv = await FsNodeService.create_instance(nc, file_id=callback_data.file_id)
+    except FsNodeNotFoundError:
+        return await query_msg.edit_text(text=i18n.get("fsnode-not-found"))
+
+    if selection is None or callback_data.action == FsNodeSelectActions.CANCEL:
+        if selection is not None:
+            await Selection.clear(state)
+        text, reply_markup = get_fsnode_msg(i18n, srv.fsnode, srv.attached_fsnodes, page=page)
+    else:
+        text, reply_markup = _get_selection_msg(i18n, srv, selection, page)
+        await selection.save(state)
+    with suppress(TelegramBadRequest):
+        msg = await query_msg.edit_text(text=text, reply_markup=reply_markup)
+    if selection is None and callback_data.action != FsNodeSelectActions.CANCEL:
+        await query.answer(text=i18n.get("fsnode-select-expired"), show_alert=True)
+    else:
+        await query.answer()
+    return msg
+
+
+def _get_selection_msg(
+    i18n: I18nContext,
+    srv: FsNodeService,
+    selection: Selection,
+    page: int,
+) -> tuple[str, InlineKeyboardMarkup]:
+    """Render the multi-select mode and remember the order of its keyboard."""
+    selected = selection.render(FsNodeMenuBoard.selectable_fsnodes(srv.attached_fsnodes))
+    return get_fsnode_msg(i18n, srv.fsnode, srv.attached_fsnodes, page=page, selected=selected)
+
+
+async def _get_selected(
+    query: CallbackQuery,
+    state: FSMContext,
+    i18n: I18nContext,
+    srv: FsNodeService,
+) -> list[FsNode] | None:
+    """Return the selected fsnodes that are still attached, in the order of the board.
+
+    The user is alerted and None is returned when the selection has expired or none of
+    the selected fsnodes is left.
+    """
+    selection = await Selection.load(state, cast(Message, query.message).message_id)
+    if selection is None:
+        await query.answer(text=i18n.get("fsnode-select-expired"), show_alert=True)
+        return None
+    selected = selection.resolve(FsNodeMenuBoard.selectable_fsnodes(srv.attached_fsnodes))
+    if not selected:
+        await query.answer(text=i18n.get("fsnode-select-empty"), show_alert=True)
+        return None
+    return selected
+
+
+async def _open_media(
+    stack: AsyncExitStack,
+    bot: Bot,
+    nc: AsyncNextcloud,
+    fsnode: FsNode,
+    semaphore: asyncio.Semaphore,
+    *,
+    use_cache: bool,
+) -> tuple[InputMediaDocument, bool]:
+    """Prepare the file to be sent in a media group.
+
+    A file version that was already sent is referenced by its Telegram file id, otherwise
+    it is downloaded into a temporary file on disk that stays open until the stack is
+    closed. No transfer memory is held while the rest of the batch is prepared.
+
+    :return: The media and whether it references a cached Telegram file id.
+    """
+    if use_cache:
+        tg_file_id = await tg_file_cache.get(fsnode)
+        if tg_file_id is not None:
+            return InputMediaDocument(media=tg_file_id), True
+
+    srv = FsNodeService(nc, fsnode, [])
+    async with semaphore:
+        if bot.session.api.is_local:
+            path = await stack.enter_async_context(srv.download_to_dir(settings.tg.local_dir))
+            server_path = pathlib.Path(bot.session.api.wrap_local_file.to_server(path))
+            return InputMediaDocument(media=server_path.as_uri()), False
+        input_file = await stack.enter_async_context(srv.download(to_disk=True))
+        return InputMediaDocument(media=input_file), False
+
+
+async def _send_batch(
+    query_msg: Message,
+    bot: Bot,
+    nc: AsyncNextcloud,
+    fsnodes: list[FsNode],
+    *,
+    use_cache: bool = True,
+) -> list[Message]:
+    """Send up to `MEDIA_GROUP_SIZE` files as one media group.
+
+    The files are downloaded concurrently, at most `settings.nc.download_concurrency` at
+    once. If Telegram rejects the batch while it references cached file ids, the cached
+    ids are dropped and the whole batch is downloaded again.
+    """
+    semaphore = asyncio.Semaphore(settings.nc.download_concurrency)
+    async with AsyncExitStack() as stack:
+        opened = await asyncio.gather(
+            *(
+                _open_media(stack, bot, nc, fsnode, semaphore, use_cache=use_cache)
+                for fsnode in fsnodes
+            ),
+        )
+        media = [item for item, _ in opened]
+        cached = [
+            fsnode for fsnode, (_, is_cached) in zip(fsnodes, opened, strict=True) if is_cached
+        ]
+        msgs: list[Message] | None
+        try:
+            if len(media) == 1:
+                msgs = [await query_msg.answer_document(media[0].media)]
+            else:
+                msgs = await query_msg.answer_media_group(list(media))
+        except TelegramBadRequest:
+            if not cached:
+                raise
+            msgs = None
+
+    if msgs is None:
+        for fsnode in cached:
+            await tg_file_cache.invalidate(fsnode)
+        return await _send_batch(query_msg, bot, nc, fsnodes, use_cache=False)
+
+    for fsnode, msg in zip(fsnodes, msgs, strict=False):
+        if msg.document is not None:
+            await tg_file_cache.set(fsnode, msg.document.file_id)
+    return msgs
+
+
+async def multiselect_send(
+    query: CallbackQuery,
+    state: FSMContext,
+    bot: Bot,
+    callback_data: FsNodeSelectData,
+    i18n: I18nContext,
+    nc: AsyncNextcloud,
+) -> Message | bool:
+    """Send the selected files as media groups of up to 10 documents.
+
+    Directories, empty files and files larger than `settings.tg.max_download_size` are
+    skipped.
+
+    :param query: Callback query object.
+    :param state: State machine context.
+    :param bot: Bot object.
+    :param callback_data: Callback data object containing the necessary data for fsnode.
+    :param i18n: I18nContext.
+    :param nc: AsyncNextcloud.
+    """
+    query_msg = cast(Message, query.message)
+
+    try:
+        srv = await FsNodeService.create_instance(nc, file_id=callback_data.file_id)
+    except FsNodeNotFoundError:
+        return await query_msg.edit_text(text=i18n.get("fsnode-not-found"))
+
+    selected = await _get_selected(query, state, i18n, srv)
+    if selected is None:
+        return False
+    sendable = [
+        fsnode
+        for fsnode in selected
+        if not fsnode.is_dir and 0 < fsnode.info.size <= settings.tg.max_download_size
+    ]
+    await query.answer(text=i18n.get("fsnode-select-sending", count=len(sendable)))
+
+    for start in range(0, len(sendable), MEDIA_GROUP_SIZE):
+        await _send_batch(query_msg, bot, nc, sendable[start : start + MEDIA_GROUP_SIZE])
+
+    if len(sendable) < len(selected):
+        return await query_msg.answer(
+            text=i18n.get(
+                "fsnode-select-skipped",
+                count=len(selected) - len(sendable),
+                size_limit=get_human_readable_bytes(settings.tg.max_download_size),
+            ),
+        )
+    return True
+
+
+async def multiselect_delete(
+    query: CallbackQuery,
+    state: FSMContext,
+    callback_data: FsNodeSelectData,
+    i18n: I18nContext,
+    nc: AsyncNextcloud,
+) -> Message | bool:
+    """Ask confirmation to delete the selected fsnodes.
+
+    :param query: Callback query object.
+    :param state: State machine context.
+    :param callback_data: Callback data object containing the necessary data for fsnode.
+    :param i18n: I18nContext.
+    :param nc: AsyncNextcloud.
+    """
+    query_msg = cast(Message, query.message)
+
+    try:
+        srv = await FsNodeService.create_instance(nc, file_id=callback_data.file_id)
+    except FsNodeNotFoundError:
+        return await query_msg.edit_text(text=i18n.get("fsnode-not-found"))
+
+    selected = await _get_selected(query, state, i18n, srv)
+    if selected is None:
+        return False
+    reply_markup = fsnode_select_delete_board(fsnode=srv.fsnode, page=callback_data.page)
+    return await query_msg.edit_text(
+        text=i18n.get(
+            "fsnode-select-delete",
+            count=len(selected),
+            names=", ".join(html.quote(fsnode.name) for fsnode in selected),
+        ),
+        reply_markup=reply_markup,
+    )
+
+
+async def multiselect_delete_confirm(
+    query: CallbackQuery,
+    state: FSMContext,
+    callback_data: FsNodeSelectData,
+    i18n: I18nContext,
+    nc: AsyncNextcloud,
+) -> Message | bool:
+    """Delete the selected fsnodes.
+
+    Only the fsnodes selected by their file ids are deleted, fsnodes added to the
+    directory since the confirmation are never touched. The fsnodes are deleted
+    concurrently and the directory is shown again from its locally patched listing.
+    Fsnodes that failed to be deleted are reported.
+
+    :param query: Callback query object.
+    :param state: State machine context.
+    :param callback_data: Callback data object containing the necessary data for fsnode.
+    :param i18n: I18nContext.
+    :param nc: AsyncNextcloud.
+    """
+    query_msg = cast(Message, query.message)
+
+    try:
+        srv = await FsNodeService.create_instance(nc, file_id=callback_data.file_id)
+    except FsNodeNotFoundError:
+        return await query_msg.edit_text(text=i18n.get("fsnode-not-found"))
+
+    selected = await _get_selected(query, state, i18n, srv)
+    if selected is None:
+        return False
+    deleted, failed = await srv.delete_many(selected)
+    await Selection.clear(state)
+
+    text, reply_markup = get_fsnode_msg(i18n, srv.fsnode, srv.attached_fsnodes)
+    with suppress(TelegramBadRequest):
+        msg = await query_msg.edit_text(text=text, reply_markup=reply_markup)
+
+    if failed:
+        await query.answer()
+        return await query_msg.answer(
+            text=i18n.get(
+                "fsnode-select-delete-partial",
+                count=len(deleted),
+                failed=len(failed),
+                names=", ".join(html.quote(fsnode.name) for fsnode in failed),
+            ),
+        )
+    await query.answer(
+        text=i18n.get("fsnode-select-delete-alert", count=len(deleted)),
+        show_alert=True,
+    )
+    return msg
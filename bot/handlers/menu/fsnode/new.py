@@ -1,13 +1,15 @@
 """File or directory creation handlers."""
 
+import asyncio
+import pathlib
 from typing import cast
 
 from aiogram import Bot
-from aiogram.exceptions import TelegramBadRequest
 from aiogram.fsm.context import FSMContext
 from aiogram.types import CallbackQuery, Document, Message
 from aiogram_i18n import I18nContext, LazyProxy
-from nc_py_api import AsyncNextcloud
+from aiohttp import ClientError
+from nc_py_api import AsyncNextcloud, NextcloudException
 
 from bot.core import settings
 from bot.handlers._core import get_fsnode_msg, get_human_readable_bytes
@@ -79,35 +81,22 @@ async def upload_start(
     return msg
 
 
-async def upload(  # noqa: PLR0911
+async def _upload_document(
     message: Message,
     bot: Bot,
-    state: FSMContext,
     i18n: I18nContext,
-    nc: AsyncNextcloud,
+    srv: FsNodeService,
+    name: str,
 ) -> Message:
-    """Upload a file to the Nextcloud server.
-
-    Set state to UPLOAD status and start waiting message with pinned documents to upload to
-    Nextcloud or cancelation.
+    """Upload the document of the message to the fsnode under the reserved name.
 
-    :param message: Message object.
+    :param message: Message object with the document.
     :param bot: Bot object.
-    :param state: State machine context.
     :param i18n: Internationalization context.
-    :param nc: AsyncNextcloud.
+    :param srv: Service of the destination fsnode.
+    :param name: The name reserved for the file.
     """
     msg_doc = cast(Document, message.document)
-    if msg_doc.file_name is None:
-        return await message.reply(text=i18n.get("fsnode-upload-error"))
-
-    data = await state.get_data()
-
-    try:
-        srv = await FsNodeService.create_instance(nc, file_id=data["file_id"])
-    except FsNodeNotFoundError:
-        return await message.reply(text=i18n.get("fsnode-not-found"))
-
     if msg_doc.file_size is None or msg_doc.file_size == 0:
         return await message.answer(text=i18n.get("fsnode-empty"))
 
@@ -124,17 +113,73 @@ async def upload(  # noqa: PLR0911
     if tg_file_obj.file_path is None:
         return await message.reply(text=i18n.get("fsnode-upload-error"))
 
+    if bot.session.api.is_local:
+        path = pathlib.Path(bot.session.api.wrap_local_file.to_local(tg_file_obj.file_path))
+        try:
+            fsnode = await srv.upload(path, name, source=msg_doc.file_unique_id)
+        except (OSError, NextcloudException):
+            return await message.reply(text=i18n.get("fsnode-upload-resume"))
+    else:
+        chunks = bot.session.stream_content(
+            url=bot.session.api.file_url(bot.token, tg_file_obj.file_path),
+            timeout=settings.tg.upload_timeout,
+            chunk_size=settings.nc.chunksize,
+            raise_for_status=True,
+        )
+        try:
+            fsnode = await srv.upload_chunks(chunks, name, source=msg_doc.file_unique_id)
+        except (ClientError, TimeoutError, NextcloudException):
+            return await message.reply(text=i18n.get("fsnode-upload-resume"))
+
+    return await message.reply(text=i18n.get("fsnode-upload-success", name=fsnode.name))
+
+
+async def upload(  # noqa: PLR0913
+    message: Message,
+    bot: Bot,
+    state: FSMContext,
+    i18n: I18nContext,
+    nc: AsyncNextcloud,
+    album: list[Message],
+) -> Message:
+    """Upload files to the Nextcloud server.
+
+    Set state to UPLOAD status and start waiting message with pinned documents to upload to
+    Nextcloud or cancelation. Documents sent as one media group are uploaded as a batch:
+    the destination is listed once, unique names are reserved for all of them up front and
+    at most `settings.nc.upload_concurrency` of them are transferred at once.
+
+    :param message: Message object.
+    :param bot: Bot object.
+    :param state: State machine context.
+    :param i18n: Internationalization context.
+    :param nc: AsyncNextcloud.
+    :param album: Messages of the media group, or the only message.
+    """
+    data = await state.get_data()
+
     try:
-        buff = await bot.download_file(tg_file_obj.file_path, chunk_size=settings.nc.chunksize)
-    except TelegramBadRequest:
-        return await message.reply(text=i18n.get("fsnode-upload-error"))
+        srv = await FsNodeService.create_instance(nc, file_id=data["file_id"])
+    except FsNodeNotFoundError:
+        return await message.reply(text=i18n.get("fsnode-not-found"))
 
-    if buff is None:
-        return await message.reply(text=i18n.get("fsnode-upload-error"))
+    names = {}
+    for album_msg in album:
+        if album_msg.document is not None and album_msg.document.file_name is not None:
+            names[album_msg.message_id] = srv.reserve_name(album_msg.document.file_name)
+
+    semaphore = asyncio.Semaphore(settings.nc.upload_concurrency)
 
-    await srv.upload(buff, msg_doc.file_name)
+    async def upload_one(album_msg: Message) -> Message:
+        if album_msg.document is None:
+            return await album_msg.reply(text=i18n.get("fsnode-upload-incorrectly"))
+        if album_msg.message_id not in names:
+            return await album_msg.reply(text=i18n.get("fsnode-upload-error"))
+        async with semaphore:
+            return await _upload_document(album_msg, bot, i18n, srv, names[album_msg.message_id])
 
-    return await message.reply(text=i18n.get("fsnode-upload-success", name=msg_doc.file_name))
+    replies = await asyncio.gather(*(upload_one(album_msg) for album_msg in album))
+    return replies[-1]
 
 
 async def mkdir_start(
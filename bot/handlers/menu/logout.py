@@ -7,8 +7,15 @@ from aiogram.types import CallbackQuery, Message, ReplyKeyboardRemove
 from aiogram_i18n import I18nContext
 from nc_py_api import AsyncNextcloud
 
-from bot.db import UnitOfWork
+from bot.db import UnitOfWork, user_cache
 from bot.keyboards import logout_board
+from bot.nextcloud import (
+    listing_cache,
+    nc_pool,
+    search_cache,
+    share_link_cache,
+    trashbin_cache,
+)
 
 
 async def logout(message: Message, i18n: I18nContext) -> Message:
@@ -37,9 +44,16 @@ async def logout_confirm(
     """
     query_msg = cast(Message, query.message)
 
+    user = await nc.user
+    listing_cache.invalidate_user(user)
+    trashbin_cache.invalidate_user(user)
+    search_cache.invalidate_user(user)
+    share_link_cache.invalidate_user(user)
     await nc.ocs("DELETE", "/ocs/v2.php/core/apppassword")
     await uow.users.delete(query.from_user.id)
     await uow.commit()
+    await user_cache.invalidate(query.from_user.id)
+    await nc_pool.invalidate(query.from_user.id)
 
     await state.clear()
 
@@ -8,6 +8,8 @@ from aiogram.types import CallbackQuery, Message
 from aiogram_i18n import I18nContext
 from nc_py_api import AsyncNextcloud
 
+from bot.core import settings
+from bot.db import UnitOfWork
 from bot.handlers._core import get_search_msg
 from bot.keyboards.callback_data_factories import SearchActions, SearchData
 from bot.nextcloud import SearchService
@@ -18,6 +20,7 @@ async def pag(
     callback_data: SearchData,
     i18n: I18nContext,
     nc: AsyncNextcloud,
+    uow: UnitOfWork,
 ) -> Message | bool:
     """Pagination for search results.
 
@@ -25,15 +28,28 @@ async def pag(
     :param callback_data: Callback data object containing the necessary data for the search result.
     :param i18n: Internationalization context.
     :param nc: Nextcloud API client.
+    :param uow: Unit of work.
     """
     query_msg = cast(Message, query.message)
 
-    srv = await SearchService.create_instance(nc, ["like", "name", f"%{callback_data.query}%"])
-
     page_num = int(callback_data.page)
     page = page_num + 1 if callback_data.action == SearchActions.PAG_NEXT else page_num - 1
 
-    text, reply_markup = get_search_msg(i18n, callback_data.query, srv.fsnodes, page=page)
+    srv = await SearchService.create_for_query(
+        nc,
+        uow,
+        query.from_user.id,
+        callback_data.query,
+        count=(page + 1) * settings.tg.page_size + 1,
+    )
+
+    text, reply_markup = get_search_msg(
+        i18n,
+        callback_data.query,
+        srv.fsnodes,
+        complete=srv.complete,
+        page=page,
+    )
     with suppress(TelegramBadRequest):
         msg = await query_msg.edit_text(text=text, reply_markup=reply_markup)
     return msg
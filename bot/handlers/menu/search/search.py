@@ -2,13 +2,18 @@
 
 from typing import cast
 
+from aiogram import html
 from aiogram.fsm.context import FSMContext
 from aiogram.types import Message
+from aiogram.types import User as TgUser
 from aiogram_i18n import I18nContext
 from nc_py_api import AsyncNextcloud
 
+from bot.core import settings
+from bot.db import UnitOfWork
 from bot.handlers._core import get_search_msg
 from bot.nextcloud import SearchService
+from bot.nextcloud.exceptions import SearchQueryError
 from bot.states import SearchStatesGroup
 
 
@@ -31,6 +36,7 @@ async def search(
     state: FSMContext,
     i18n: I18nContext,
     nc: AsyncNextcloud,
+    uow: UnitOfWork,
 ) -> Message:
     """Search for files in the Nextcloud instance based on the given search text.
 
@@ -38,12 +44,23 @@ async def search(
     :param state: State machine context.
     :param i18n: Internationalization context.
     :param nc: Nextcloud API client.
+    :param uow: Unit of work.
     """
     msg_text = cast(str, message.text)
 
     await state.clear()
 
-    srv = await SearchService.create_instance(nc, ["like", "name", f"%{message.text}%"])
+    try:
+        srv = await SearchService.create_for_query(
+            nc,
+            uow,
+            cast(TgUser, message.from_user).id,
+            msg_text,
+            count=settings.tg.page_size + 1,
+        )
+    except SearchQueryError as error:
+        text = i18n.get("search-query-invalid", value=html.quote(str(error)))
+        return await message.reply(text=text)
 
-    text, reply_markup = get_search_msg(i18n, msg_text, srv.fsnodes)
+    text, reply_markup = get_search_msg(i18n, msg_text, srv.fsnodes, complete=srv.complete)
     return await message.reply(text=text, reply_markup=reply_markup)
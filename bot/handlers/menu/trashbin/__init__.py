@@ -3,6 +3,17 @@
 from aiogram import F, Router
 from aiogram_i18n import LazyFilter
 
+from .bulk import (
+    filter_apply,
+    filter_cancel,
+    filter_delete,
+    filter_message,
+    filter_start,
+    multiselect,
+    multiselect_apply,
+    multiselect_delete,
+    multiselect_start,
+)
 from .cancel import cancel_callback
 from .cleanup import cleanup, cleanup_confirm
 from .fsnode import delete, restore, select
@@ -14,7 +25,10 @@ from bot.keyboards.callback_data_factories import (
     TrashbinData,
     TrashbinFsNodeActions,
     TrashbinFsNodeData,
+    TrashbinSelectActions,
+    TrashbinSelectData,
 )
+from bot.states import TrashbinStatesGroup
 
 
 def trashbin_router() -> Router:
@@ -58,6 +72,46 @@ def trashbin_router() -> Router:
         TrashbinData.filter(F.action == TrashbinActions.CLEANUP_CONFIRM),
     )
 
+    # Bulk actions block.
+    router.callback_query.register(
+        multiselect_start,
+        TrashbinData.filter(F.action == TrashbinActions.SELECT),
+    )
+    router.callback_query.register(
+        multiselect_delete,
+        TrashbinSelectData.filter(F.action == TrashbinSelectActions.DELETE),
+    )
+    router.callback_query.register(
+        multiselect_apply,
+        TrashbinSelectData.filter(
+            F.action.in_({TrashbinSelectActions.RESTORE, TrashbinSelectActions.DELETE_CONFIRM}),
+        ),
+    )
+    router.callback_query.register(multiselect, TrashbinSelectData.filter())
+
+    router.callback_query.register(
+        filter_start,
+        TrashbinData.filter(F.action == TrashbinActions.FILTER),
+    )
+    router.message.register(
+        filter_cancel,
+        TrashbinStatesGroup.FILTER,
+        LazyFilter("cancel-button"),
+    )
+    router.message.register(filter_message, TrashbinStatesGroup.FILTER, F.text)
+    router.callback_query.register(
+        filter_delete,
+        TrashbinData.filter(F.action == TrashbinActions.FILTER_DELETE),
+    )
+    router.callback_query.register(
+        filter_apply,
+        TrashbinData.filter(
+            F.action.in_(
+                {TrashbinActions.FILTER_RESTORE, TrashbinActions.FILTER_DELETE_CONFIRM},
+            ),
+        ),
+    )
+
     router.callback_query.register(
         pag,
         TrashbinData.filter(F.action.in_({TrashbinActions.PAG_BACK, TrashbinActions.PAG_NEXT})),
@@ -0,0 +1,432 @@
+"""Handlers of actions that are performed on many items of the trash bin at once."""
+
+from contextlib import suppress
+from typing import Any, cast
+
+from aiogram import html
+from aiogram.exceptions import TelegramBadRequest
+from aiogram.fsm.context import FSMContext
+from aiogram.types import CallbackQuery, InlineKeyboardMarkup, Message
+from aiogram_i18n import I18nContext, LazyProxy
+from nc_py_api import AsyncNextcloud, FsNode
+
+from bot.handlers._core import get_trashbin_msg
+from bot.keyboards import (
+    TrashbinBoard,
+    menu_board,
+    reply_board,
+    trashbin_filter_board,
+    trashbin_filter_delete_board,
+    trashbin_select_delete_board,
+)
+from bot.keyboards.callback_data_factories import (
+    TrashbinActions,
+    TrashbinData,
+    TrashbinSelectActions,
+    TrashbinSelectData,
+)
+from bot.nextcloud import TrashbinService
+from bot.states import MAX_SELECTION, Selection, TrashbinStatesGroup
+
+
+def _get_selection_msg(
+    i18n: I18nContext,
+    srv: TrashbinService,
+    selection: Selection,
+    page: int,
+) -> tuple[str, InlineKeyboardMarkup | None]:
+    """Render the multi-select mode and remember the order of its keyboard."""
+    selected = selection.render(TrashbinBoard.selectable_fsnodes(srv.trashbin))
+    return get_trashbin_msg(i18n, srv.trashbin, srv.get_size(), page=page, selected=selected)
+
+
+async def _get_selected(
+    query: CallbackQuery,
+    state: FSMContext,
+    i18n: I18nContext,
+    srv: TrashbinService,
+) -> list[FsNode] | None:
+    """Return the selected items that are still in the trash bin, in the order of the board.
+
+    The user is alerted and None is returned when the selection has expired or none of
+    the selected items is left.
+    """
+    selection = await Selection.load(state, cast(Message, query.message).message_id)
+    if selection is None:
+        await query.answer(text=i18n.get("trashbin-select-expired"), show_alert=True)
+        return None
+    selected = selection.resolve(TrashbinBoard.selectable_fsnodes(srv.trashbin))
+    if not selected:
+        await query.answer(text=i18n.get("trashbin-select-empty"), show_alert=True)
+        return None
+    return selected
+
+
+def _get_names(trashbin_items: list[FsNode]) -> str:
+    """Join the original locations of the items for a message."""
+    return ", ".join(
+        html.quote(fsnode.info.trashbin_original_location or fsnode.name)
+        for fsnode in trashbin_items
+    )
+
+
+async def _answer_result(
+    query: CallbackQuery,
+    i18n: I18nContext,
+    done: list[FsNode],
+    failed: list[FsNode],
+    *,
+    restored: bool,
+) -> Message | bool:
+    """Report the aggregated result of the bulk action."""
+    if failed:
+        await query.answer()
+        return await cast(Message, query.message).answer(
+            text=i18n.get(
+                "trashbin-bulk-partial",
+                count=len(done),
+                failed=len(failed),
+                names=_get_names(failed),
+            ),
+        )
+    return await query.answer(
+        text=i18n.get(
+            "trashbin-bulk-restore-alert" if restored else "trashbin-bulk-delete-alert",
+            count=len(done),
+        ),
+        show_alert=True,
+    )
+
+
+async def multiselect_start(
+    query: CallbackQuery,
+    state: FSMContext,
+    callback_data: TrashbinData,
+    i18n: I18nContext,
+    nc: AsyncNextcloud,
+) -> Message | bool:
+    """Switch the trash bin menu to the multi-select mode.
+
+    :param query: Callback query object.
+    :param state: State machine context.
+    :param callback_data: Callback data object containing the necessary data for the trash bin.
+    :param i18n: Internationalization context.
+    :param nc: Nextcloud API client.
+    """
+    query_msg = cast(Message, query.message)
+
+    srv = await TrashbinService.create_instance(nc)
+
+    selection = Selection(message_id=query_msg.message_id)
+    text, reply_markup = _get_selection_msg(i18n, srv, selection, callback_data.page)
+    await selection.save(state)
+    with suppress(TelegramBadRequest):
+        msg = await query_msg.edit_text(text=text, reply_markup=reply_markup)
+    await query.answer(text=i18n.get("trashbin-select-start"))
+    return msg
+
+
+async def multiselect(
+    query: CallbackQuery,
+    state: FSMContext,
+    callback_data: TrashbinSelectData,
+    i18n: I18nContext,
+    nc: AsyncNextcloud,
+) -> Message | bool:
+    """Toggle an item, turn the page or leave the multi-select mode.
+
+    :param query: Callback query object.
+    :param state: State machine context.
+    :param callback_data: Callback data object containing the necessary data for the trash bin.
+    :param i18n: Internationalization context.
+    :param nc: Nextcloud API client.
+    """
+    query_msg = cast(Message, query.message)
+
+    selection = await Selection.load(state, query_msg.message_id)
+    page = callback_data.page
+    if callback_data.action == TrashbinSelectActions.TOGGLE:
+        if callback_data.index >= MAX_SELECTION:
+            return await query.answer(text=i18n.get("trashbin-select-limit", limit=MAX_SELECTION))
+        if selection is not None:
+            selection.toggle(callback_data.index)
+    elif callback_data.action == TrashbinSelectActions.PAG_NEXT:
+        page += 1
+    elif callback_data.action == TrashbinSelectActions.PAG_BACK:
+        page -= 1
+
+    srv = await TrashbinService.create_instance(nc)
+
+    if selection is None or callback_data.action == TrashbinSelectActions.CANCEL:
+        if selection is not None:
+            await Selection.clear(state)
+        text, reply_markup = get_trashbin_msg(i18n, srv.trashbin, srv.get_size(), page=page)
+    else:
+        text, reply_markup = _get_selection_msg(i18n, srv, selection, page)
+        await selection.save(state)
+    with suppress(TelegramBadRequest):
+        msg = await query_msg.edit_text(text=text, reply_markup=reply_markup)
+    if selection is None and callback_data.action != TrashbinSelectActions.CANCEL:
+        await query.answer(text=i18n.get("trashbin-select-expired"), show_alert=True)
+    else:
+        await query.answer()
+    return msg
+
+
+async def multiselect_delete(
+    query: CallbackQuery,
+    state: FSMContext,
+    callback_data: TrashbinSelectData,
+    i18n: I18nContext,
+    nc: AsyncNextcloud,
+) -> Message | bool:
+    """Ask confirmation to delete the selected items permanently.
+
+    :param query: Callback query object.
+    :param state: State machine context.
+    :param callback_data: Callback data object containing the necessary data for the trash bin.
+    :param i18n: Internationalization context.
+    :param nc: Nextcloud API client.
+    """
+    query_msg = cast(Message, query.message)
+
+    srv = await TrashbinService.create_instance(nc)
+
+    selected = await _get_selected(query, state, i18n, srv)
+    if selected is None:
+        return False
+    return await query_msg.edit_text(
+        text=i18n.get("trashbin-select-delete", count=len(selected), names=_get_names(selected)),
+        reply_markup=trashbin_select_delete_board(callback_data.page),
+    )
+
+
+async def multiselect_apply(
+    query: CallbackQuery,
+    state: FSMContext,
+    callback_data: TrashbinSelectData,
+    i18n: I18nContext,
+    nc: AsyncNextcloud,
+) -> Message | bool:
+    """Restore the selected items or delete them after the confirmation.
+
+    Only the items selected by their file ids are processed, items trashed or reordered
+    since are never touched. The items are processed concurrently, the items that failed
+    are reported.
+
+    :param query: Callback query object.
+    :param state: State machine context.
+    :param callback_data: Callback data object containing the necessary data for the trash bin.
+    :param i18n: Internationalization context.
+    :param nc: Nextcloud API client.
+    """
+    query_msg = cast(Message, query.message)
+
+    srv = await TrashbinService.create_instance(nc)
+
+    selected = await _get_selected(query, state, i18n, srv)
+    if selected is None:
+        return False
+    restored = callback_data.action == TrashbinSelectActions.RESTORE
+    if restored:
+        done, failed = await srv.restore_many(selected)
+    else:
+        done, failed = await srv.delete_many(selected)
+    await Selection.clear(state)
+
+    text, reply_markup = get_trashbin_msg(i18n, srv.trashbin, srv.get_size())
+    with suppress(TelegramBadRequest):
+        await query_msg.edit_text(text=text, reply_markup=reply_markup)
+    return await _answer_result(query, i18n, done, failed, restored=restored)
+
+
+async def filter_start(
+    query: CallbackQuery,
+    state: FSMContext,
+    callback_data: TrashbinData,
+    i18n: I18nContext,
+) -> Message:
+    """Ask for the directory whose deleted items are restored or deleted at once.
+
+    :param query: Callback query object.
+    :param state: State machine context.
+    :param callback_data: Callback data object containing the necessary data for the trash bin.
+    :param i18n: Internationalization context.
+    """
+    query_msg = cast(Message, query.message)
+
+    await state.set_state(TrashbinStatesGroup.FILTER)
+    await state.update_data(page=callback_data.page)
+
+    reply_markup = reply_board(
+        LazyProxy("cancel-button"),
+        is_persistent=True,
+        resize_keyboard=True,
+        selective=True,
+    )
+    msg = await query_msg.answer(text=i18n.get("trashbin-filter-start"), reply_markup=reply_markup)
+    await query.answer()
+
+    return msg
+
+
+async def filter_message(
+    message: Message,
+    state: FSMContext,
+    i18n: I18nContext,
+    nc: AsyncNextcloud,
+) -> Message:
+    """Find the items deleted from the directory and offer to restore or delete them.
+
+    :param message: Message object.
+    :param state: State machine context.
+    :param i18n: Internationalization context.
+    :param nc: Nextcloud API client.
+    """
+    location = f"/{cast(str, message.text).strip().strip('/')}"
+
+    srv = await TrashbinService.create_instance(nc)
+
+    trashbin_items = srv.find_by_location(location)
+    if not trashbin_items:
+        return await message.reply(
+            text=i18n.get("trashbin-filter-empty", location=html.quote(location)),
+        )
+
+    data = await state.get_data()
+    await state.set_state(None)
+    await state.update_data(
+        file_ids=[trashbin_item.file_id for trashbin_item in trashbin_items],
+        location=location,
+    )
+
+    await message.reply(text=i18n.get("trashbin-filter-found"), reply_markup=menu_board())
+    return await message.reply(
+        text=i18n.get(
+            "trashbin-filter",
+            count=len(trashbin_items),
+            location=html.quote(location),
+        ),
+        reply_markup=trashbin_filter_board(data.get("page", 0)),
+    )
+
+
+def _get_filtered(srv: TrashbinService, data: dict[str, Any]) -> list[FsNode]:
+    """Return the items found when the directory was chosen that are still in the trash bin."""
+    file_ids = set(data.get("file_ids") or [])
+    return [trashbin_item for trashbin_item in srv.trashbin if trashbin_item.file_id in file_ids]
+
+
+async def filter_delete(
+    query: CallbackQuery,
+    state: FSMContext,
+    callback_data: TrashbinData,
+    i18n: I18nContext,
+    nc: AsyncNextcloud,
+) -> Message | bool:
+    """Ask confirmation to delete the items deleted from the chosen directory permanently.
+
+    :param query: Callback query object.
+    :param state: State machine context.
+    :param callback_data: Callback data object containing the necessary data for the trash bin.
+    :param i18n: Internationalization context.
+    :param nc: Nextcloud API client.
+    """
+    query_msg = cast(Message, query.message)
+
+    data = await state.get_data()
+    srv = await TrashbinService.create_instance(nc)
+
+    trashbin_items = _get_filtered(srv, data)
+    if not trashbin_items:
+        text, reply_markup = get_trashbin_msg(
+            i18n,
+            srv.trashbin,
+            srv.get_size(),
+            page=callback_data.page,
+        )
+        return await query_msg.edit_text(text=text, reply_markup=reply_markup)
+
+    return await query_msg.edit_text(
+        text=i18n.get(
+            "trashbin-filter-delete",
+            count=len(trashbin_items),
+            location=html.quote(data.get("location", "/")),
+        ),
+        reply_markup=trashbin_filter_delete_board(callback_data.page),
+    )
+
+
+async def filter_apply(
+    query: CallbackQuery,
+    state: FSMContext,
+    callback_data: TrashbinData,
+    i18n: I18nContext,
+    nc: AsyncNextcloud,
+) -> Message | bool:
+    """Restore all items deleted from the chosen directory or delete them after the confirmation.
+
+    Only the items found when the directory was chosen are processed.
+
+    :param query: Callback query object.
+    :param state: State machine context.
+    :param callback_data: Callback data object containing the necessary data for the trash bin.
+    :param i18n: Internationalization context.
+    :param nc: Nextcloud API client.
+    """
+    query_msg = cast(Message, query.message)
+
+    data = await state.get_data()
+    await state.clear()
+
+    srv = await TrashbinService.create_instance(nc)
+
+    trashbin_items = _get_filtered(srv, data)
+    if not trashbin_items:
+        text, reply_markup = get_trashbin_msg(
+            i18n,
+            srv.trashbin,
+            srv.get_size(),
+            page=callback_data.page,
+        )
+        return await query_msg.edit_text(text=text, reply_markup=reply_markup)
+
+    restored = callback_data.action == TrashbinActions.FILTER_RESTORE
+    if restored:
+        done, failed = await srv.restore_many(trashbin_items)
+    else:
+        done, failed = await srv.delete_many(trashbin_items)
+
+    text, reply_markup = get_trashbin_msg(i18n, srv.trashbin, srv.get_size())
+    with suppress(TelegramBadRequest):
+        await query_msg.edit_text(text=text, reply_markup=reply_markup)
+    return await _answer_result(query, i18n, done, failed, restored=restored)
+
+
+async def filter_cancel(
+    message: Message,
+    state: FSMContext,
+    i18n: I18nContext,
+    nc: AsyncNextcloud,
+) -> Message:
+    """Cancel choosing the directory and return to the trash bin menu.
+
+    :param message: Message object.
+    :param state: State machine context.
+    :param i18n: Internationalization context.
+    :param nc: Nextcloud API client.
+    """
+    data = await state.get_data()
+    await state.clear()
+
+    await message.reply(text=i18n.get("cancel"), reply_markup=menu_board())
+
+    srv = await TrashbinService.create_instance(nc)
+
+    text, reply_markup = get_trashbin_msg(
+        i18n,
+        srv.trashbin,
+        srv.get_size(),
+        page=data.get("page", 0),
+    )
+    return await message.reply(text=text, reply_markup=reply_markup)
@@ -2,6 +2,7 @@
 
 from typing import cast
 
+from aiogram.fsm.context import FSMContext
 from aiogram.types import CallbackQuery, Message
 from aiogram_i18n import I18nContext
 from nc_py_api import AsyncNextcloud
@@ -13,6 +14,7 @@ from bot.nextcloud import TrashbinService
 
 async def cancel_callback(
     query: CallbackQuery,
+    state: FSMContext,
     callback_data: TrashbinData,
     i18n: I18nContext,
     nc: AsyncNextcloud,
@@ -20,12 +22,15 @@ async def cancel_callback(
     """Cancel operation with trash bin.
 
     :param query: Callback query object.
+    :param state: State machine context.
     :param callback_data: Callback data object containing the necessary data for the trash bin.
     :param i18n: Internationalization context.
     :param nc: Nextcloud API client.
     """
     query_msg = cast(Message, query.message)
 
+    await state.clear()
+
     srv = await TrashbinService.create_instance(nc)
 
     text, reply_markup = get_trashbin_msg(
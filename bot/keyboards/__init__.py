@@ -1,10 +1,22 @@
 """Package with reply and inline keyboards."""
 
-from .fsnode_boards import FsNodeMenuBoard, fsnode_delete_board, fsnode_new_board
+from .fsnode_boards import (
+    FsNodeMenuBoard,
+    fsnode_delete_board,
+    fsnode_new_board,
+    fsnode_select_delete_board,
+)
 from .logout_boards import logout_board
 from .reply_boards import menu_board, reply_board
 from .search_boards import SearchBoard
-from .trashbin_boards import TrashbinBoard, trashbin_cleanup_board, trashbin_fsnode_board
+from .trashbin_boards import (
+    TrashbinBoard,
+    trashbin_cleanup_board,
+    trashbin_filter_board,
+    trashbin_filter_delete_board,
+    trashbin_fsnode_board,
+    trashbin_select_delete_board,
+)
 
 __all__ = (
     "logout_board",
@@ -13,8 +25,12 @@ __all__ = (
     "FsNodeMenuBoard",
     "fsnode_new_board",
     "fsnode_delete_board",
+    "fsnode_select_delete_board",
     "TrashbinBoard",
     "trashbin_fsnode_board",
     "trashbin_cleanup_board",
+    "trashbin_filter_board",
+    "trashbin_filter_delete_board",
+    "trashbin_select_delete_board",
     "SearchBoard",
 )
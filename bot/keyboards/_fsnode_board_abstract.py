@@ -12,9 +12,11 @@ from aiogram_i18n.types import InlineKeyboardButton
 from nc_py_api.files import FsNode
 
 from bot.core import settings
+from bot.states import MAX_SELECTION
 from bot.utils import MIME_SYMBOLS
 
 FSNODE_BUTTON_TEXT_LENGTH = 32
+MAX_CALLBACK_DATA_LENGTH = 64
 
 
 class _FsNodeAbstractBoard(ABC):
@@ -32,25 +34,70 @@ class _FsNodeAbstractBoard(ABC):
 
 
 class _FsNodeBaseBoard(_FsNodeAbstractBoard, ABC):
-    """Base class for fsnode boards."""
+    """Base class for fsnode boards.
+
+    A board with `select_callback_data` supports the multi-select mode. In this mode,
+    enabled by passing `selected`, fsnodes are shown as checkboxes carrying their indexes
+    in the board, the selection itself is kept in the FSM data. Only the first
+    `MAX_SELECTION` fsnodes can be selected.
+    """
 
     fsnode_callback_data: type[CallbackData]
     actions_callback_data: type[CallbackData]
     actions: type[IntEnum]
+    select_callback_data: type[CallbackData] | None = None
+    select_actions: type[IntEnum] | None = None
 
     def __init__(
         self,
         fsnodes: list[FsNode],
         page: int = 0,
         page_size: int = settings.tg.page_size,
+        selected: set[int] | None = None,
         **kwargs: Any,
     ) -> None:
         self.builder = InlineKeyboardBuilder()
-        self.fsnodes = sorted(fsnodes, key=lambda x: x.is_dir, reverse=True)
+        self.fsnodes = self.selectable_fsnodes(fsnodes)
         self.page = page
         self.page_size = page_size
+        self.selected = selected
         self.kwargs = kwargs
 
+    @staticmethod
+    def selectable_fsnodes(fsnodes: list[FsNode]) -> list[FsNode]:
+        """Return the fsnodes in the order of the board, their indexes are used by selection.
+
+        :param fsnodes: List of fsnodes shown by the board.
+        :return: The fsnodes, directories first.
+        """
+        return sorted(fsnodes, key=lambda x: x.is_dir, reverse=True)
+
+    @property
+    def is_select_mode(self) -> bool:
+        """Whether the board is in the multi-select mode."""
+        return self.selected is not None
+
+    def select_data(self, action: IntEnum, index: int = 0) -> str:
+        """Pack the callback data of the multi-select mode button.
+
+        :param action: The action of the button.
+        :param index: Index of the fsnode the action is performed on, defaults to 0.
+        :return: The packed callback data.
+        """
+        if self.select_callback_data is None or self.selected is None:
+            msg = "The board does not support the multi-select mode."
+            raise AttributeError(msg)
+        packed = self.select_callback_data(
+            action=action,
+            page=self.page,
+            index=index,
+            **self.kwargs,
+        ).pack()
+        if len(packed.encode()) > MAX_CALLBACK_DATA_LENGTH:
+            msg = f"The callback data of the multi-select mode is too long: {packed}."
+            raise ValueError(msg)
+        return packed
+
     def get_kb(self) -> InlineKeyboardMarkup:
         """Return fsnode InlineKeyboardMarkup."""
         self.builder.attach(self.build_fsnode_buttons())
@@ -68,9 +115,20 @@ class _FsNodeBaseBoard(_FsNodeAbstractBoard, ABC):
         start_index = self.page * self.page_size
         end_index = (self.page + 1) * self.page_size
 
-        for fsnode in self.fsnodes[start_index:end_index]:
+        for index, fsnode in enumerate(self.fsnodes[start_index:end_index], start=start_index):
             prefix = MIME_SYMBOLS.get(fsnode.info.mimetype, "")
 
+            if self.selected is not None and self.select_actions is not None:
+                if index >= MAX_SELECTION:
+                    checkbox = "🚫"
+                else:
+                    checkbox = "✅" if index in self.selected else "⬜"
+                builder.button(
+                    text=f"{checkbox} {prefix} {fsnode.name[:FSNODE_BUTTON_TEXT_LENGTH]}",
+                    callback_data=self.select_data(self.select_actions.TOGGLE, index),
+                )
+                continue
+
             builder.button(
                 text=(
                     f"{prefix} {fsnode.name[:FSNODE_BUTTON_TEXT_LENGTH]}"
@@ -90,7 +148,10 @@ class _FsNodeBaseBoard(_FsNodeAbstractBoard, ABC):
 
         :return: InlineKeyboardBuilder with pagination buttons.
         """
-        if not hasattr(self.actions, "PAG_BACK") or not hasattr(self.actions, "PAG_NEXT"):
+        actions = self.actions
+        if self.is_select_mode and self.select_actions is not None:
+            actions = self.select_actions
+        if not hasattr(actions, "PAG_BACK") or not hasattr(actions, "PAG_NEXT"):
             msg = (
                 "Pagination actions such as 'PAG_BACK' and 'PAG_NEXT' "
                 "must be defined in the CallbackData's actions."
@@ -107,11 +168,7 @@ class _FsNodeBaseBoard(_FsNodeAbstractBoard, ABC):
                 builder.add(
                     InlineKeyboardButton(
                         text=LazyProxy("fsnode-pag-back-button"),
-                        callback_data=self.actions_callback_data(
-                            action=self.actions.PAG_BACK,
-                            page=self.page,
-                            **self.kwargs,
-                        ).pack(),
+                        callback_data=self._pag_data(actions.PAG_BACK),
                     ),
                 )
 
@@ -121,17 +178,18 @@ class _FsNodeBaseBoard(_FsNodeAbstractBoard, ABC):
                 builder.add(
                     InlineKeyboardButton(
                         text=LazyProxy("fsnode-pag-next-button"),
-                        callback_data=self.actions_callback_data(
-                            action=self.actions.PAG_NEXT,
-                            page=self.page,
-                            **self.kwargs,
-                        ).pack(),
+                        callback_data=self._pag_data(actions.PAG_NEXT),
                     ),
                 )
 
         builder.adjust(3)
         return builder
 
+    def _pag_data(self, action: IntEnum) -> str:
+        if self.is_select_mode:
+            return self.select_data(action)
+        return self.actions_callback_data(action=action, page=self.page, **self.kwargs).pack()
+
     @abstractmethod
     def build_actions_buttons(self) -> InlineKeyboardBuilder:
         """Builds the actions buttons for the keyboard.
@@ -1,18 +1,35 @@
 """Package with data for keyboards buttons."""
 
-from .fsnode_data import FsNodeData, FsNodeMenuActions, FsNodeMenuData
+from .fsnode_data import (
+    FsNodeData,
+    FsNodeMenuActions,
+    FsNodeMenuData,
+    FsNodeSelectActions,
+    FsNodeSelectData,
+)
 from .logout_data import LogoutActions, LogoutData
 from .search_data import SearchActions, SearchData, SearchFsNodeData
-from .trashbin_data import TrashbinActions, TrashbinData, TrashbinFsNodeActions, TrashbinFsNodeData
+from .trashbin_data import (
+    TrashbinActions,
+    TrashbinData,
+    TrashbinFsNodeActions,
+    TrashbinFsNodeData,
+    TrashbinSelectActions,
+    TrashbinSelectData,
+)
 
 __all__ = (
     "FsNodeData",
     "FsNodeMenuData",
     "FsNodeMenuActions",
+    "FsNodeSelectData",
+    "FsNodeSelectActions",
     "TrashbinData",
     "TrashbinActions",
     "TrashbinFsNodeData",
     "TrashbinFsNodeActions",
+    "TrashbinSelectData",
+    "TrashbinSelectActions",
     "LogoutData",
     "LogoutActions",
     "SearchData",
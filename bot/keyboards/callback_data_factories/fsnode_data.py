@@ -29,6 +29,8 @@ class FsNodeMenuActions(IntEnum):
     :param MKDIR: Create a new dir.
     :param BACK: Go back to the previous dir.
     :param CANCEL: Cancel the current action.
+    :param DOWNLOAD_DIR: Download a dir as a zip archive.
+    :param SELECT: Switch to the multi-select mode.
     """
 
     PAG_NEXT = 0
@@ -41,6 +43,8 @@ class FsNodeMenuActions(IntEnum):
     MKDIR = 7
     BACK = 8
     CANCEL = 9
+    DOWNLOAD_DIR = 10
+    SELECT = 11
 
 
 class FsNodeMenuData(CallbackData, prefix="fsnode_menu"):
@@ -54,3 +58,41 @@ class FsNodeMenuData(CallbackData, prefix="fsnode_menu"):
     action: FsNodeMenuActions
     file_id: str
     page: int
+
+
+class FsNodeSelectActions(IntEnum):
+    """Actions that can be performed in the fsnode multi-select mode.
+
+    :param PAG_NEXT: Move to the next page.
+    :param PAG_BACK: Move to the previous page.
+    :param TOGGLE: Select or deselect a fsnode.
+    :param SEND: Send the selected files.
+    :param CANCEL: Leave the multi-select mode.
+    :param DELETE: Delete the selected fsnodes.
+    :param DELETE_CONFIRM: Confirm deletion of the selected fsnodes.
+    :param BACK: Return to the selection.
+    """
+
+    PAG_NEXT = 0
+    PAG_BACK = 1
+    TOGGLE = 2
+    SEND = 3
+    CANCEL = 4
+    DELETE = 5
+    DELETE_CONFIRM = 6
+    BACK = 7
+
+
+class FsNodeSelectData(CallbackData, prefix="fsnode_sel"):
+    """The data passed when button in the fsnode multi-select mode is clicked.
+
+    :param action: The action to be performed.
+    :param file_id: The ID of the directory.
+    :param page: The page number.
+    :param index: Index of the toggled fsnode.
+    """
+
+    action: FsNodeSelectActions
+    file_id: str
+    page: int
+    index: int = 0
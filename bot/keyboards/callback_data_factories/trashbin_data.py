@@ -44,6 +44,11 @@ class TrashbinActions(IntEnum):
     CLEANUP = 2
     CLEANUP_CONFIRM = 3
     CANCEL = 4
+    SELECT = 5
+    FILTER = 6
+    FILTER_RESTORE = 7
+    FILTER_DELETE = 8
+    FILTER_DELETE_CONFIRM = 9
 
 
 class TrashbinData(CallbackData, prefix="trashbin"):
@@ -56,3 +61,39 @@ class TrashbinData(CallbackData, prefix="trashbin"):
 
     action: TrashbinActions
     page: int
+
+
+class TrashbinSelectActions(IntEnum):
+    """Actions that can be performed in the trash bin multi-select mode.
+
+    :param PAG_NEXT: Move to the next page.
+    :param PAG_BACK: Move to the previous page.
+    :param TOGGLE: Select or deselect an item.
+    :param RESTORE: Restore the selected items.
+    :param DELETE: Ask confirmation to delete the selected items.
+    :param CANCEL: Leave the multi-select mode.
+    :param DELETE_CONFIRM: Confirm deletion of the selected items.
+    :param BACK: Return to the selection.
+    """
+
+    PAG_NEXT = 0
+    PAG_BACK = 1
+    TOGGLE = 2
+    RESTORE = 3
+    DELETE = 4
+    CANCEL = 5
+    DELETE_CONFIRM = 6
+    BACK = 7
+
+
+class TrashbinSelectData(CallbackData, prefix="trashbin_sel"):
+    """The data passed when button in the trash bin multi-select mode is clicked.
+
+    :param action: The action to be performed.
+    :param page: The page number.
+    :param index: Index of the toggled item.
+    """
+
+    action: TrashbinSelectActions
+    page: int
+    index: int = 0
@@ -8,12 +8,20 @@ from aiogram_i18n.types import InlineKeyboardButton, InlineKeyboardMarkup
 from nc_py_api.files import FsNode
 
 from bot.keyboards._fsnode_board_abstract import _FsNodeBaseBoard
-from bot.keyboards.callback_data_factories import FsNodeData, FsNodeMenuActions, FsNodeMenuData
+from bot.keyboards.callback_data_factories import (
+    FsNodeData,
+    FsNodeMenuActions,
+    FsNodeMenuData,
+    FsNodeSelectActions,
+    FsNodeSelectData,
+)
 
 
 class FsNodeMenuBoard(_FsNodeBaseBoard):
     """Keyboard for fsnode menu.
 
+    In the multi-select mode the attached fsnodes are shown as checkboxes.
+
     :param fsnode: File or directory to perform operations on.
     :param attached_fsnodes: List of files attached to the fsnode.
     :param kwargs: Additional parameters.
@@ -22,6 +30,8 @@ class FsNodeMenuBoard(_FsNodeBaseBoard):
     fsnode_callback_data = FsNodeData
     actions_callback_data = FsNodeMenuData
     actions = FsNodeMenuActions
+    select_callback_data = FsNodeSelectData
+    select_actions = FsNodeSelectActions
 
     def __init__(
         self,
@@ -32,11 +42,42 @@ class FsNodeMenuBoard(_FsNodeBaseBoard):
         self.fsnode = fsnode
         super().__init__(attached_fsnodes, **kwargs, file_id=self.fsnode.file_id)
 
+    def build_select_buttons(self) -> InlineKeyboardBuilder:
+        """Build buttons for the multi-select mode.
+
+        :return: InlineKeyboardBuilder object.
+        """
+        builder = InlineKeyboardBuilder()
+        if self.selected:
+            builder.add(
+                InlineKeyboardButton(
+                    text=LazyProxy("fsnode-select-send-button", count=len(self.selected)),
+                    callback_data=self.select_data(FsNodeSelectActions.SEND),
+                ),
+            )
+            builder.add(
+                InlineKeyboardButton(
+                    text=LazyProxy("fsnode-select-delete-button", count=len(self.selected)),
+                    callback_data=self.select_data(FsNodeSelectActions.DELETE),
+                ),
+            )
+        builder.add(
+            InlineKeyboardButton(
+                text=LazyProxy("cancel-button"),
+                callback_data=self.select_data(FsNodeSelectActions.CANCEL),
+            ),
+        )
+        builder.adjust(1)
+        return builder
+
     def build_actions_buttons(self) -> InlineKeyboardBuilder:
         """Build buttons for fsnode operations.
 
         :return: InlineKeyboardBuilder object.
         """
+        if self.is_select_mode:
+            return self.build_select_buttons()
+
         builder = InlineKeyboardBuilder()
         if not self.fsnode.is_dir:
             builder.add(
@@ -49,6 +90,28 @@ class FsNodeMenuBoard(_FsNodeBaseBoard):
                     ).pack(),
                 ),
             )
+        if self.fsnode.is_dir:
+            builder.add(
+                InlineKeyboardButton(
+                    text=LazyProxy("fsnode-download-dir-button"),
+                    callback_data=self.actions_callback_data(
+                        action=self.actions.DOWNLOAD_DIR,
+                        file_id=self.fsnode.file_id,
+                        page=self.page,
+                    ).pack(),
+                ),
+            )
+        if self.fsnode.is_dir and self.fsnodes:
+            builder.add(
+                InlineKeyboardButton(
+                    text=LazyProxy("fsnode-select-button"),
+                    callback_data=self.actions_callback_data(
+                        action=self.actions.SELECT,
+                        file_id=self.fsnode.file_id,
+                        page=self.page,
+                    ).pack(),
+                ),
+            )
         if self.fsnode.is_dir and self.fsnode.is_creatable:
             builder.add(
                 InlineKeyboardButton(
@@ -156,3 +219,34 @@ def fsnode_delete_board(fsnode: FsNode, page: int = 0) -> InlineKeyboardMarkup:
             ],
         ],
     )
+
+
+def fsnode_select_delete_board(fsnode: FsNode, page: int = 0) -> InlineKeyboardMarkup:
+    """Builds keyboard with confirm and deny buttons for deleting the selected fsnodes.
+
+    :param fsnode: Directory the selected fsnodes are attached to.
+    :param page: Page number.
+    :return: InlineKeyboardMarkup object.
+    """
+    return InlineKeyboardMarkup(
+        inline_keyboard=[
+            [
+                InlineKeyboardButton(
+                    text=LazyProxy("confirm-button"),
+                    callback_data=FsNodeSelectData(
+                        action=FsNodeSelectActions.DELETE_CONFIRM,
+                        file_id=fsnode.file_id,
+                        page=page,
+                    ).pack(),
+                ),
+                InlineKeyboardButton(
+                    text=LazyProxy("deny-button"),
+                    callback_data=FsNodeSelectData(
+                        action=FsNodeSelectActions.BACK,
+                        file_id=fsnode.file_id,
+                        page=page,
+                    ).pack(),
+                ),
+            ],
+        ],
+    )
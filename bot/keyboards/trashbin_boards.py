@@ -12,25 +12,81 @@ from bot.keyboards.callback_data_factories import (
     TrashbinData,
     TrashbinFsNodeActions,
     TrashbinFsNodeData,
+    TrashbinSelectActions,
+    TrashbinSelectData,
 )
 
 
 class TrashbinBoard(_FsNodeBaseBoard):
-    """Keyboard for trashbin menu."""
+    """Keyboard for trashbin menu.
+
+    In the multi-select mode the items of the trash bin are shown as checkboxes.
+    """
 
     fsnode_callback_data = TrashbinFsNodeData
     actions_callback_data = TrashbinData
     actions = TrashbinActions
+    select_callback_data = TrashbinSelectData
+    select_actions = TrashbinSelectActions
 
     def __init__(self, **kwargs: Any) -> None:
         super().__init__(**kwargs)
 
+    def build_select_buttons(self) -> InlineKeyboardBuilder:
+        """Build buttons for the multi-select mode.
+
+        :return: InlineKeyboardBuilder object.
+        """
+        builder = InlineKeyboardBuilder()
+        if self.selected:
+            builder.add(
+                InlineKeyboardButton(
+                    text=LazyProxy("trashbin-select-restore-button", count=len(self.selected)),
+                    callback_data=self.select_data(TrashbinSelectActions.RESTORE),
+                ),
+            )
+            builder.add(
+                InlineKeyboardButton(
+                    text=LazyProxy("trashbin-select-delete-button", count=len(self.selected)),
+                    callback_data=self.select_data(TrashbinSelectActions.DELETE),
+                ),
+            )
+        builder.add(
+            InlineKeyboardButton(
+                text=LazyProxy("cancel-button"),
+                callback_data=self.select_data(TrashbinSelectActions.CANCEL),
+            ),
+        )
+        builder.adjust(1)
+        return builder
+
     def build_actions_buttons(self) -> InlineKeyboardBuilder:
         """Build buttons for trashbin actions.
 
         :return: InlineKeyboardBuilder object.
         """
+        if self.is_select_mode:
+            return self.build_select_buttons()
+
         builder = InlineKeyboardBuilder()
+        builder.add(
+            InlineKeyboardButton(
+                text=LazyProxy("trashbin-select-button"),
+                callback_data=TrashbinData(
+                    action=TrashbinActions.SELECT,
+                    page=self.page,
+                ).pack(),
+            ),
+        )
+        builder.add(
+            InlineKeyboardButton(
+                text=LazyProxy("trashbin-filter-button"),
+                callback_data=TrashbinData(
+                    action=TrashbinActions.FILTER,
+                    page=self.page,
+                ).pack(),
+            ),
+        )
         builder.add(
             InlineKeyboardButton(
                 text=LazyProxy("trashbin-cleanup-button"),
@@ -40,6 +96,7 @@ class TrashbinBoard(_FsNodeBaseBoard):
                 ).pack(),
             ),
         )
+        builder.adjust(2, 1)
         return builder
 
 
@@ -73,6 +130,99 @@ def trashbin_cleanup_board(
     )
 
 
+def trashbin_select_delete_board(page: int = 0) -> InlineKeyboardMarkup:
+    """Build keyboard with confirm and deny buttons for deleting the selected items.
+
+    :param page: Page number.
+    :return: InlineKeyboardMarkup object.
+    """
+    return InlineKeyboardMarkup(
+        inline_keyboard=[
+            [
+                InlineKeyboardButton(
+                    text=LazyProxy("confirm-button"),
+                    callback_data=TrashbinSelectData(
+                        action=TrashbinSelectActions.DELETE_CONFIRM,
+                        page=page,
+                    ).pack(),
+                ),
+                InlineKeyboardButton(
+                    text=LazyProxy("deny-button"),
+                    callback_data=TrashbinSelectData(
+                        action=TrashbinSelectActions.BACK,
+                        page=page,
+                    ).pack(),
+                ),
+            ],
+        ],
+    )
+
+
+def trashbin_filter_board(page: int = 0) -> InlineKeyboardMarkup:
+    """Build keyboard for actions on the items deleted from a directory.
+
+    :param page: Page number.
+    :return: InlineKeyboardMarkup object.
+    """
+    return InlineKeyboardMarkup(
+        inline_keyboard=[
+            [
+                InlineKeyboardButton(
+                    text=LazyProxy("trashbin-restore-all-button"),
+                    callback_data=TrashbinData(
+                        action=TrashbinActions.FILTER_RESTORE,
+                        page=page,
+                    ).pack(),
+                ),
+                InlineKeyboardButton(
+                    text=LazyProxy("trashbin-delete-all-button"),
+                    callback_data=TrashbinData(
+                        action=TrashbinActions.FILTER_DELETE,
+                        page=page,
+                    ).pack(),
+                ),
+            ],
+            [
+                InlineKeyboardButton(
+                    text=LazyProxy("back-button"),
+                    callback_data=TrashbinData(
+                        action=TrashbinActions.CANCEL,
+                        page=page,
+                    ).pack(),
+                ),
+            ],
+        ],
+    )
+
+
+def trashbin_filter_delete_board(page: int = 0) -> InlineKeyboardMarkup:
+    """Build keyboard with confirm and deny buttons for deleting the items of a directory.
+
+    :param page: Page number.
+    :return: InlineKeyboardMarkup object.
+    """
+    return InlineKeyboardMarkup(
+        inline_keyboard=[
+            [
+                InlineKeyboardButton(
+                    text=LazyProxy("confirm-button"),
+                    callback_data=TrashbinData(
+                        action=TrashbinActions.FILTER_DELETE_CONFIRM,
+                        page=page,
+                    ).pack(),
+                ),
+                InlineKeyboardButton(
+                    text=LazyProxy("deny-button"),
+                    callback_data=TrashbinData(
+                        action=TrashbinActions.CANCEL,
+                        page=page,
+                    ).pack(),
+                ),
+            ],
+        ],
+    )
+
+
 def trashbin_fsnode_board(file_id: str, page: int = 0) -> InlineKeyboardMarkup:
     """Build keyboard for fsnode in trashbin.
 
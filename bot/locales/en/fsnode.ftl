@@ -33,6 +33,7 @@ fsnode-upload-start =
 
     Or click "{stop-button}" to finish the download.
 fsnode-upload-error = An error occurred while trying to upload files. 😵‍💫
+fsnode-upload-resume = The upload was interrupted. 😵‍💫 Send the file again to continue it from where it stopped.
 fsnode-upload-success =
     Your file <b>"{$name }"</b> has been successfully uploaded to Nextcloud.
 
@@ -41,11 +42,36 @@ fsnode-upload-incorrectly = The file must be in the form of a document. 🙅‍
 
 ## Download file.
 fsnode-size-limit = The weight of this file { $size } exceeds the allowed { $size_limit }. 🏋️‍♂️
+fsnode-share-link = The weight of this file { $size } exceeds the allowed { $size_limit }, download it directly from Nextcloud by the temporary <a href="{ $link }">link</a>. 🔗
 fsnode-empty = The file cannot be empty. 🫗
+fsnode-archive-start = Packing the folder "{ $name }" into a zip archive... 🗜
+fsnode-archive-error = Failed to pack or send the folder "{ $name }", try again later. 😵
+fsnode-archive-volumes =
+    The archive is split into { $count } volumes. 🧩
+
+    <i>Download all of them and open the first one with 7-Zip or join them with <code>cat</code>.</i>
+
+fsnode-select-start = Tap the files and folders to select them. ☑️
+fsnode-select-limit = Only the first { $limit } items of a folder can be selected. 🫷
+fsnode-select-expired = The selection has expired, select the files again. ⌛
+fsnode-select-empty = None of the selected files and folders are left. 🤷
+fsnode-select-sending = Sending { $count } files... 📨
+fsnode-select-skipped = { $count } of the selected items were skipped, because they are folders, empty files or exceed the allowed { $size_limit }. 🏋️‍♂️
+fsnode-select-delete =
+    Are you sure you want to delete { $count } selected files and folders: <b>{ $names }</b>? 💣
+
+    <b>This action cannot be undone.</b>
+fsnode-select-delete-alert = { $count } files and folders were successfully deleted. 💀
+fsnode-select-delete-partial =
+    { $count } files and folders were deleted, { $failed } could not be deleted: <b>{ $names }</b>. 😵‍💫
 
 ## File management menu buttons.
 fsnode-delete-button = 🔴 Delete
 fsnode-download-button = ⬇️ Download
+fsnode-download-dir-button = 🗜 Download as zip
+fsnode-select-button = ☑️ Select
+fsnode-select-send-button = 📨 Send selected ({ $count })
+fsnode-select-delete-button = 🔴 Delete selected ({ $count })
 fsnode-new-button = 🆕 New
 fsnode-upload-button = ⬆️ Upload
 fsnode-mkdir-button = 📁 Create folder
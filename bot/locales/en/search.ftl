@@ -1,13 +1,18 @@
 ### File search text messages.
 
 ## Searching files.
-search-enter = Enter part of the name of the file you are looking for or the full name to start searching. 🐕‍🦺
+search-enter = Enter part of the name of the file you are looking for or the full name to start searching. 🐕‍🦺 Filters like <code>type:pdf size:&gt;10M modified:&lt;30d</code> narrow the search.
 search = 
     Found { $count ->
             [one] <b>{ $count }</b> match.
             *[other] <b>{ $count }</b> matches.
         }
         
+    Search results for query "<b>{ $query }</b>":
+search-partial = 
+    Found <b>{ $count }+</b> matches.
+        
     Search results for query "<b>{ $query }</b>":
 search-item = 🔹 <i>{ $path }</i>
+search-query-invalid = Invalid value <b>{ $value }</b> in the search query. 😶
 search-empty = Unfortunately, no files were found with such a name. 😶
\ No newline at end of file
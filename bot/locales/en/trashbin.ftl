@@ -21,4 +21,31 @@ trashbin-fsnode = Choose an action
 trashbin-delete-button = ❌ Delete 
 trashbin-restore-button = 🔃 Restore
 trashbin-delete-alert = File deleted
-trashbin-restore-alert = File restored
\ No newline at end of file
+trashbin-restore-alert = File restored
+## Actions with many files inside the trash bin.
+trashbin-select-start = Tap the files to select them. ☑️
+trashbin-select-limit = Only the first { $limit } files of the trash bin can be selected. 🫷
+trashbin-select-expired = The selection has expired, select the files again. ⌛
+trashbin-select-empty = None of the selected files are left in the trash bin. 🤷
+trashbin-select-delete =
+    Are you sure you want to permanently delete { $count } selected files: <b>{ $names }</b>? 💣
+
+    <b>This action cannot be undone.</b>
+trashbin-filter-start = Send the path of the folder, e.g. <code>/Photos</code>, to restore or delete everything that was deleted from it. 📂
+trashbin-filter-empty = Nothing was deleted from <b>{ $location }</b>. Send another path or press "{ cancel-button }". 🤷
+trashbin-filter-found = Folder found. 🔎
+trashbin-filter = { $count } files were deleted from <b>{ $location }</b>. What should be done with them?
+trashbin-filter-delete =
+    Are you sure you want to permanently delete { $count } files deleted from <b>{ $location }</b>? 💣
+
+    <b>This action cannot be undone.</b>
+trashbin-bulk-restore-alert = { $count } files restored.
+trashbin-bulk-delete-alert = { $count } files deleted.
+trashbin-bulk-partial =
+    { $count } files were processed, { $failed } failed: <b>{ $names }</b>. 😵‍💫
+trashbin-select-button = ☑️ Select
+trashbin-filter-button = 📂 By folder
+trashbin-select-restore-button = 🔃 Restore selected ({ $count })
+trashbin-select-delete-button = ❌ Delete selected ({ $count })
+trashbin-restore-all-button = 🔃 Restore all
+trashbin-delete-all-button = ❌ Delete all
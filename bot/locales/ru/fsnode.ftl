@@ -33,6 +33,7 @@ fsnode-upload-start =
 
     Или нажмите "{ stop-button }", чтобы закончить загрузку.
 fsnode-upload-error = Произошла ошибка при попытке загрузить файлы. 😵‍💫
+fsnode-upload-resume = Загрузка прервалась. 😵‍💫 Отправьте файл ещё раз, чтобы продолжить её с места остановки.
 fsnode-upload-success =
     Ваш файл <b>"{ $name }"</b> успешно загружен в Nextcloud.
 
@@ -41,11 +42,36 @@ fsnode-upload-incorrectly = Файл должен быть в виде доку
 
 ## Скачаивание файла.
 fsnode-size-limit = Вес этого файла { $size } превышает допустимый { $size_limit }. 🏋️‍♂️
+fsnode-share-link = Вес этого файла { $size } превышает допустимый { $size_limit }, скачайте его напрямую из Nextcloud по временной <a href="{ $link }">ссылке</a>. 🔗
 fsnode-empty = Файл не может быть пустым. 🫗
+fsnode-archive-start = Упаковываем папку «{ $name }» в zip-архив... 🗜
+fsnode-archive-error = Не удалось упаковать или отправить папку «{ $name }», попробуйте позже. 😵
+fsnode-archive-volumes =
+    Архив разделён на { $count } частей. 🧩
+
+    <i>Скачайте их все и откройте первую в 7-Zip или объедините их командой <code>cat</code>.</i>
+
+fsnode-select-start = Нажимайте на файлы и папки, чтобы выбрать их. ☑️
+fsnode-select-limit = Можно выбрать только первые { $limit } элементов папки. 🫷
+fsnode-select-expired = Выбор устарел, выберите файлы заново. ⌛
+fsnode-select-empty = Ни одного из выбранных файлов и папок не осталось. 🤷
+fsnode-select-sending = Отправляем файлы: { $count }... 📨
+fsnode-select-skipped = Пропущено выбранных элементов: { $count }, это папки, пустые файлы или файлы больше допустимых { $size_limit }. 🏋️‍♂️
+fsnode-select-delete =
+    Вы уверены, что хотите удалить выбранные файлы и папки ({ $count }): <b>{ $names }</b>? 💣
+
+    <b>Это действие нельзя отменить.</b>
+fsnode-select-delete-alert = Удалено файлов и папок: { $count }. 💀
+fsnode-select-delete-partial =
+    Удалено файлов и папок: { $count }, не удалось удалить { $failed }: <b>{ $names }</b>. 😵‍💫
 
 ## Кнопки меню управления файлом.
 fsnode-delete-button = 🔴 Удалить
 fsnode-download-button = ⬇️ Скачать
+fsnode-download-dir-button = 🗜 Скачать zip-архивом
+fsnode-select-button = ☑️ Выбрать
+fsnode-select-send-button = 📨 Отправить выбранные ({ $count })
+fsnode-select-delete-button = 🔴 Удалить выбранные ({ $count })
 fsnode-new-button = 🆕 Создать
 fsnode-upload-button = ⬆️ Загрузить
 fsnode-mkdir-button = 📁 Создать папку
@@ -1,7 +1,7 @@
 ### Текстовые сообщения поиска файла.
 
 ## Поиск файлов.
-search-enter = Введите часть названия искомого файла или название целимком, чтобы начать поиск. 🐕‍🦺
+search-enter = Введите часть названия искомого файла или название целимком, чтобы начать поиск. 🐕‍🦺 Фильтры вида <code>type:pdf size:&gt;10M modified:&lt;30d</code> сужают поиск.
 search = 
     Найдено { $count ->
             [one] <b>{ $count }</b> совпадение.
@@ -9,6 +9,11 @@ search =
             *[other] <b>{ $count }</b> совпадений.
         }
         
+    Результаты поиска по запросу "<b>{ $query }</b>":
+search-partial = 
+    Найдено <b>{ $count }+</b> совпадений.
+        
     Результаты поиска по запросу "<b>{ $query }</b>":
 search-item = 🔹 <i>{ $path }</i>
+search-query-invalid = Неверное значение <b>{ $value }</b> в поисковом запросе. 😶
 search-empty = К сожалению, файлы с таким названием не найдены. 😶
\ No newline at end of file
@@ -23,4 +23,31 @@ trashbin-fsnode = Выберите действие.
 trashbin-delete-button = ❌ Удалить 
 trashbin-restore-button = 🔃 Восстановить
 trashbin-delete-alert = Файл удален.
-trashbin-restore-alert = Файл восстановлен.
\ No newline at end of file
+trashbin-restore-alert = Файл восстановлен.
+## Действия с несколькими файлами внутри корзины.
+trashbin-select-start = Нажимайте на файлы, чтобы выбрать их. ☑️
+trashbin-select-limit = Можно выбрать только первые { $limit } файлов корзины. 🫷
+trashbin-select-expired = Выбор устарел, выберите файлы заново. ⌛
+trashbin-select-empty = Ни одного из выбранных файлов не осталось в корзине. 🤷
+trashbin-select-delete =
+    Вы уверены, что хотите навсегда удалить выбранные файлы ({ $count }): <b>{ $names }</b>? 💣
+
+    <b>Это действие нельзя отменить.</b>
+trashbin-filter-start = Отправьте путь к папке, например <code>/Photos</code>, чтобы восстановить или удалить все, что было из нее удалено. 📂
+trashbin-filter-empty = Из <b>{ $location }</b> ничего не удалялось. Отправьте другой путь или нажмите "{ cancel-button }". 🤷
+trashbin-filter-found = Папка найдена. 🔎
+trashbin-filter = Из <b>{ $location }</b> удалено файлов: { $count }. Что с ними сделать?
+trashbin-filter-delete =
+    Вы уверены, что хотите навсегда удалить файлы ({ $count }), удалённые из <b>{ $location }</b>? 💣
+
+    <b>Это действие нельзя отменить.</b>
+trashbin-bulk-restore-alert = Восстановлено файлов: { $count }.
+trashbin-bulk-delete-alert = Удалено файлов: { $count }.
+trashbin-bulk-partial =
+    Обработано файлов: { $count }, не удалось обработать { $failed }: <b>{ $names }</b>. 😵‍💫
+trashbin-select-button = ☑️ Выбрать
+trashbin-filter-button = 📂 По папке
+trashbin-select-restore-button = 🔃 Восстановить выбранные ({ $count })
+trashbin-select-delete-button = ❌ Удалить выбранные ({ $count })
+trashbin-restore-all-button = 🔃 Восстановить все
+trashbin-delete-all-button = ❌ Удалить все
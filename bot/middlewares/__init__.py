@@ -1,5 +1,6 @@
 """Middlewares."""
 
+from .album_md import AlbumMD
 from .i18n import LocaleManager
 from .nextcloud_md import NextcloudMD
 from .query_msg_md import QueryMsgMD
@@ -10,4 +11,5 @@ __all__ = (
     "NextcloudMD",
     "LocaleManager",
     "QueryMsgMD",
+    "AlbumMD",
 )
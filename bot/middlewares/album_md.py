@@ -0,0 +1,49 @@
+"""Media group middleware."""
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from aiogram import BaseMiddleware
+from aiogram.types import Message, TelegramObject
+
+
+class AlbumMD(BaseMiddleware):
+    """Collects messages of one media group and passes them to a single handler call.
+
+    Telegram delivers every message of an album as a separate update. The first message of
+    a media group waits `latency` seconds for the rest of them and is handled with the whole
+    group in the `album` key, the other messages are dropped. A message without a media
+    group is handled alone.
+
+    :param latency: Number of seconds to wait for the rest of the media group.
+    """
+
+    def __init__(self, latency: float) -> None:
+        self.latency = latency
+        self._albums: dict[tuple[int, str], list[Message]] = {}
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
+        """Calls the handler function with the collected media group."""
+        if not isinstance(event, Message) or event.media_group_id is None:
+            data["album"] = [event]
+            return await handler(event, data)
+
+        key = (event.chat.id, event.media_group_id)
+        album = self._albums.get(key)
+        if album is not None:
+            album.append(event)
+            return None
+
+        self._albums[key] = album = [event]
+        try:
+            await asyncio.sleep(self.latency)
+        finally:
+            del self._albums[key]
+        data["album"] = sorted(album, key=lambda message: message.message_id)
+        return await handler(event, data)
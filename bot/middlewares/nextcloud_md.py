@@ -5,9 +5,8 @@ from typing import TYPE_CHECKING, Any
 
 from aiogram import BaseMiddleware
 from aiogram.types import TelegramObject
-from nc_py_api import AsyncNextcloud
 
-from bot.core import settings
+from bot.nextcloud import nc_pool
 
 if TYPE_CHECKING:
     from bot.db import UnitOfWork
@@ -16,7 +15,7 @@ if TYPE_CHECKING:
 class NextcloudMD(BaseMiddleware):
     """Middleware for Nextcloud.
 
-    Injects :class:`AsyncNextcloud` instance into the handler context.
+    Injects pooled :class:`AsyncNextcloud` instance of the user into the handler context.
 
     :param handler: The handler function to be executed.
     :param event: The event object.
@@ -37,10 +36,11 @@ class NextcloudMD(BaseMiddleware):
         if not hasattr(event, "from_user"):
             msg = "Telegram event object must have 'from_user' attribute."
             raise AttributeError(msg)
-        user = await uow.users.get_by_id(event.from_user.id)
-        data["nc"] = AsyncNextcloud(
-            nextcloud_url=settings.nc.url,
-            nc_auth_user=user.nc_login if user else None,
-            nc_auth_pass=user.nc_app_password if user else None,
-        )
-        return await handler(event, data)
+        user = await uow.users.get_cached(event.from_user.id)
+        async with nc_pool.acquire(
+            event.from_user.id,
+            login=user.nc_login if user else None,
+            password=user.nc_app_password if user else None,
+        ) as nc:
+            data["nc"] = nc
+            return await handler(event, data)
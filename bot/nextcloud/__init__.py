@@ -1,6 +1,25 @@
 """Module providing services for interacting with the Nextcloud API."""
 
+from ._base import single_flight
+from .cache import (
+    ListingCache,
+    PathIndex,
+    SearchCache,
+    SearchResult,
+    ShareLinkCache,
+    TelegramFileCache,
+    TrashbinCache,
+    TrashbinSnapshot,
+    listing_cache,
+    search_cache,
+    share_link_cache,
+    tg_file_cache,
+    trashbin_cache,
+)
 from .fsnode import FsNodeService, PrevFsNodeService, RootFsNodeService
+from .index import IndexCrawler, index_crawler
+from .pool import NextcloudPool, nc_pool
+from .progress import UploadProgress, UploadProgressStore, upload_progress
 from .search import SearchService
 from .trashbin import TrashbinService
 
@@ -10,4 +29,25 @@ __all__ = (
     "PrevFsNodeService",
     "TrashbinService",
     "SearchService",
+    "NextcloudPool",
+    "nc_pool",
+    "ListingCache",
+    "listing_cache",
+    "PathIndex",
+    "TrashbinCache",
+    "TrashbinSnapshot",
+    "trashbin_cache",
+    "SearchCache",
+    "SearchResult",
+    "search_cache",
+    "IndexCrawler",
+    "index_crawler",
+    "single_flight",
+    "TelegramFileCache",
+    "tg_file_cache",
+    "ShareLinkCache",
+    "share_link_cache",
+    "UploadProgress",
+    "UploadProgressStore",
+    "upload_progress",
 )
@@ -1,9 +1,32 @@
 """Base class for services."""
 
 from abc import ABC, abstractmethod
+from collections.abc import Awaitable, Callable, Hashable
 from typing import Any, Generic, TypeVar
 
+from nc_py_api import AsyncNextcloud
+
+from bot.utils import SingleFlight
+
 T = TypeVar("T")
+V = TypeVar("V")
+
+single_flight: SingleFlight[tuple[Hashable, ...]] = SingleFlight()
+
+
+async def coalesce(
+    nc: AsyncNextcloud,
+    key: tuple[Hashable, ...],
+    func: Callable[[], Awaitable[V]],
+) -> V:
+    """Share one in-flight call between concurrent identical requests of the user.
+
+    :param nc: The Nextcloud client object.
+    :param key: Key identifying identical requests of the user.
+    :param func: Function making the requests.
+    :return: Result of the call.
+    """
+    return await single_flight.do((await nc.user, *key), func)
 
 
 class BaseService(ABC, Generic[T]):
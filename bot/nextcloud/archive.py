@@ -0,0 +1,77 @@
+"""Zip archives of whole Nextcloud directories.
+
+The directory tree is listed with a bounded number of concurrent requests. Files are then
+downloaded one by one straight into the entries of a zip archive written to a temporary
+file, so only one chunk of a file is held in memory at a time.
+"""
+
+import asyncio
+import zipfile
+from typing import IO
+
+from nc_py_api import AsyncNextcloud, FsNode
+
+ZIP_MIN_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+
+
+async def walk(nc: AsyncNextcloud, fsnode: FsNode, concurrency: int) -> list[FsNode]:
+    """List all fsnodes inside the directory tree.
+
+    Directories of the same depth are listed concurrently.
+
+    :param nc: The Nextcloud client object.
+    :param fsnode: The root directory of the tree.
+    :param concurrency: Maximum number of directories listed at once.
+    :return: The list of fsnodes inside the tree, excluding the root itself.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def listdir(directory: FsNode) -> list[FsNode]:
+        async with semaphore:
+            return await nc.files.listdir(directory)
+
+    fsnodes: list[FsNode] = []
+    level = [fsnode]
+    while level:
+        listings = await asyncio.gather(*(listdir(directory) for directory in level))
+        level = []
+        for attached_fsnodes in listings:
+            fsnodes.extend(attached_fsnodes)
+            level.extend(
+                attached_fsnode for attached_fsnode in attached_fsnodes if attached_fsnode.is_dir
+            )
+    return fsnodes
+
+
+async def write_archive(
+    nc: AsyncNextcloud,
+    fsnode: FsNode,
+    file: IO[bytes],
+    concurrency: int,
+    chunk_size: int,
+) -> None:
+    """Write the zip archive of the directory tree into the file.
+
+    The entries are put into a folder named after the directory. They are stored without
+    compression, files are mostly compressed already and deflating them would block the
+    event loop.
+
+    :param nc: The Nextcloud client object.
+    :param fsnode: The directory to archive.
+    :param file: Binary file object the archive is written to.
+    :param concurrency: Maximum number of directories listed at once.
+    :param chunk_size: Size of the chunks files are downloaded by.
+    """
+    fsnodes = await walk(nc, fsnode, concurrency)
+    prefix_length = len(fsnode.user_path) - len(f"{fsnode.name}/") if fsnode.user_path else 0
+    with zipfile.ZipFile(file, "w", compression=zipfile.ZIP_STORED, allowZip64=True) as archive:
+        for attached_fsnode in sorted(fsnodes, key=lambda x: x.user_path):
+            name = attached_fsnode.user_path[prefix_length:]
+            date_time = max(attached_fsnode.info.last_modified.timetuple()[:6], ZIP_MIN_DATE_TIME)
+            info = zipfile.ZipInfo(name, date_time=date_time)
+            if attached_fsnode.is_dir:
+                archive.writestr(info, b"")
+                continue
+            with archive.open(info, "w", force_zip64=True) as entry:
+                await nc.files.download2stream(attached_fsnode, entry, chunk_size=chunk_size)
+    file.seek(0)
@@ -0,0 +1,512 @@
+"""Per-user caches of Nextcloud data shared between updates."""
+
+from collections.abc import Hashable
+from datetime import UTC, datetime
+
+from nc_py_api import AsyncNextcloud, FsNode, NextcloudExceptionNotFound
+from redis.asyncio import Redis
+
+from bot.core import settings
+from bot.nextcloud._base import coalesce
+from bot.utils import LRUCache
+
+
+class _Listing:
+    """Cached directory listing.
+
+    :param fsnode: The listed fsnode, its etag identifies the listing version.
+    :param attached_fsnodes: The list of attached fsnodes.
+    """
+
+    def __init__(self, fsnode: FsNode, attached_fsnodes: list[FsNode]) -> None:
+        self.fsnode = fsnode
+        self.attached_fsnodes = attached_fsnodes
+
+
+class PathIndex:
+    """Index of fsnode paths and parents keyed by Nextcloud user and file id.
+
+    It is populated from the listings fetched by the bot, so the parent of an already
+    seen fsnode is known without asking Nextcloud.
+
+    :param max_size: Maximum number of indexed fsnodes.
+    """
+
+    def __init__(self, max_size: int) -> None:
+        self._paths: LRUCache[tuple[str, str], tuple[str, str]] = LRUCache(max_size)
+
+    def add_listing(self, user: str, fsnode: FsNode, attached_fsnodes: list[FsNode]) -> None:
+        """Index the attached fsnodes of the listing as children of the fsnode.
+
+        :param user: Nextcloud user id.
+        :param fsnode: The listed fsnode.
+        :param attached_fsnodes: The list of attached fsnodes.
+        """
+        for attached_fsnode in attached_fsnodes:
+            self._paths.set(
+                (user, attached_fsnode.file_id),
+                (attached_fsnode.user_path, fsnode.file_id),
+            )
+
+    def get(self, user: str, file_id: str) -> tuple[str, str] | None:
+        """Return the path and the parent file id of the fsnode.
+
+        :param user: Nextcloud user id.
+        :param file_id: The file id of the fsnode.
+        :return: Tuple with user path and parent file id or None if the fsnode is unknown.
+        """
+        return self._paths.get((user, file_id))
+
+    def invalidate_user(self, user: str) -> None:
+        """Drop all paths of the user.
+
+        :param user: Nextcloud user id.
+        """
+        self._paths.discard_if(lambda key: key[0] == user)
+
+
+class ListingCache:
+    """Cache of fsnode listings keyed by Nextcloud user and file id.
+
+    A cached listing is revalidated with a single Depth:0 PROPFIND. The children are
+    fetched again only when the etag of the fsnode has changed. Every stored listing
+    is also added to the path index. The file id of every user's root fsnode is
+    remembered, so the root is never looked up with a search request.
+
+    Changes made by the bot are written through: the listing is patched in place and
+    stored under the etag the fsnode has right after the change, so it is not listed
+    again. Listings of the ancestors are left as is, their etags have changed as well
+    and they are listed again when visited.
+
+    :param max_size: Maximum number of cached listings.
+    :param paths: Index of fsnode paths and parents.
+    """
+
+    def __init__(self, max_size: int, paths: PathIndex) -> None:
+        self._listings: LRUCache[tuple[str, str], _Listing] = LRUCache(max_size)
+        self._root_ids: LRUCache[str, str] = LRUCache(max_size)
+        self.paths = paths
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def stats(self) -> dict[str, int]:
+        """Return hit and miss counters of the cache."""
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._listings)}
+
+    async def get(self, nc: AsyncNextcloud, file_id: str) -> tuple[FsNode, list[FsNode]] | None:
+        """Return an up-to-date listing of the fsnode if it was cached before.
+
+        :param nc: The Nextcloud client object.
+        :param file_id: The file id of the fsnode.
+        :return: Tuple with fsnode and attached fsnodes or None if the fsnode is not cached
+            or was moved or removed.
+        """
+        user = await nc.user
+        listing = self._listings.get((user, file_id))
+        if listing is None:
+            self.misses += 1
+            return None
+
+        try:
+            fsnode = await nc.files.by_path(listing.fsnode.user_path)
+        except NextcloudExceptionNotFound:
+            fsnode = None
+        if fsnode is None or fsnode.file_id != file_id:
+            self._listings.pop((user, file_id))
+            self.misses += 1
+            return None
+
+        if fsnode.etag == listing.fsnode.etag:
+            self.hits += 1
+            return fsnode, list(listing.attached_fsnodes)
+
+        self.misses += 1
+        attached_fsnodes = await nc.files.listdir(fsnode)
+        self._store(user, fsnode, attached_fsnodes)
+        return fsnode, list(attached_fsnodes)
+
+    async def get_parent(
+        self,
+        nc: AsyncNextcloud,
+        file_id: str,
+    ) -> tuple[FsNode, list[FsNode]] | None:
+        """Return an up-to-date listing of the parent of the fsnode using the path index.
+
+        :param nc: The Nextcloud client object.
+        :param file_id: The file id of the fsnode.
+        :return: Tuple with parent fsnode and its attached fsnodes or None if the parent is
+            unknown, not cached or does not contain the fsnode anymore.
+        """
+        indexed = self.paths.get(await nc.user, file_id)
+        if indexed is None:
+            return None
+        _, parent_id = indexed
+        cached = await self.get(nc, parent_id)
+        if cached is None or not any(fsnode.file_id == file_id for fsnode in cached[1]):
+            return None
+        return cached
+
+    def _store(self, user: str, fsnode: FsNode, attached_fsnodes: list[FsNode]) -> None:
+        """Store the listing and index its fsnodes.
+
+        :param user: Nextcloud user id.
+        :param fsnode: The listed fsnode.
+        :param attached_fsnodes: The list of attached fsnodes.
+        """
+        self._listings.set((user, fsnode.file_id), _Listing(fsnode, list(attached_fsnodes)))
+        self.paths.add_listing(user, fsnode, attached_fsnodes)
+
+    async def set(
+        self,
+        nc: AsyncNextcloud,
+        fsnode: FsNode,
+        attached_fsnodes: list[FsNode],
+    ) -> None:
+        """Store the listing of the fsnode.
+
+        :param nc: The Nextcloud client object.
+        :param fsnode: The listed fsnode.
+        :param attached_fsnodes: The list of attached fsnodes.
+        """
+        self._store(await nc.user, fsnode, attached_fsnodes)
+
+    async def write_through(
+        self,
+        nc: AsyncNextcloud,
+        fsnode: FsNode,
+        attached_fsnodes: list[FsNode],
+    ) -> FsNode:
+        """Store the listing changed by the bot itself without listing the fsnode again.
+
+        Only the new etag of the fsnode is fetched with a Depth:0 PROPFIND, the listing is
+        stored under it as patched locally.
+
+        :param nc: The Nextcloud client object.
+        :param fsnode: The changed fsnode.
+        :param attached_fsnodes: The patched list of attached fsnodes.
+        :return: The fsnode with the new etag.
+        """
+        fsnode = await nc.files.by_path(fsnode.user_path)
+        self._store(await nc.user, fsnode, attached_fsnodes)
+        return fsnode
+
+    async def remove(self, nc: AsyncNextcloud, fsnode: FsNode) -> None:
+        """Drop the removed fsnode from the cached listing of its parent.
+
+        The parent is found with the path index, its listing is written through.
+
+        :param nc: The Nextcloud client object.
+        :param fsnode: The removed fsnode.
+        """
+        user = await nc.user
+        self._listings.pop((user, fsnode.file_id))
+        indexed = self.paths.get(user, fsnode.file_id)
+        if indexed is None:
+            return
+        _, parent_id = indexed
+        listing = self._listings.get((user, parent_id))
+        if listing is None:
+            return
+
+        attached_fsnodes = [
+            attached_fsnode
+            for attached_fsnode in listing.attached_fsnodes
+            if attached_fsnode.file_id != fsnode.file_id
+        ]
+        try:
+            parent = await nc.files.by_path(listing.fsnode.user_path)
+        except NextcloudExceptionNotFound:
+            parent = None
+        if parent is None or parent.file_id != parent_id:
+            self._listings.pop((user, parent_id))
+            return
+        self._store(user, parent, attached_fsnodes)
+
+    async def set_root(
+        self,
+        nc: AsyncNextcloud,
+        fsnode: FsNode,
+        attached_fsnodes: list[FsNode],
+    ) -> None:
+        """Store the listing of the root fsnode and remember its file id.
+
+        :param nc: The Nextcloud client object.
+        :param fsnode: The root fsnode.
+        :param attached_fsnodes: The list of fsnodes attached to the root.
+        """
+        user = await nc.user
+        self._root_ids.set(user, fsnode.file_id)
+        self._store(user, fsnode, attached_fsnodes)
+
+    async def get_root_id(self, nc: AsyncNextcloud) -> str | None:
+        """Return the file id of the user's root fsnode if it is known.
+
+        :param nc: The Nextcloud client object.
+        :return: The file id of the root fsnode or None.
+        """
+        return self._root_ids.get(await nc.user)
+
+    def invalidate_user(self, user: str) -> None:
+        """Drop all listings, paths and the root file id of the user.
+
+        :param user: Nextcloud user id.
+        """
+        self._root_ids.pop(user)
+        self._listings.discard_if(lambda key: key[0] == user)
+        self.paths.invalidate_user(user)
+
+
+class TrashbinSnapshot:
+    """Trash bin items indexed by file id with the total size kept up to date.
+
+    :param trashbin: List of files in the trash bin.
+    """
+
+    def __init__(self, trashbin: list[FsNode]) -> None:
+        self.items = {fsnode.file_id: fsnode for fsnode in trashbin}
+        self.size = sum(fsnode.info.size for fsnode in trashbin)
+
+    def get(self, file_id: str) -> FsNode | None:
+        """Return the trash bin item by its file id.
+
+        :param file_id: The file id of the fsnode.
+        :return: Item from the trash bin or None if not found.
+        """
+        return self.items.get(file_id)
+
+    def remove(self, file_id: str) -> FsNode | None:
+        """Remove the item from the snapshot.
+
+        :param file_id: The file id of the fsnode.
+        :return: The removed item or None if not found.
+        """
+        fsnode = self.items.pop(file_id, None)
+        if fsnode is not None:
+            self.size -= fsnode.info.size
+        return fsnode
+
+    def clear(self) -> None:
+        """Remove all items from the snapshot."""
+        self.items.clear()
+        self.size = 0
+
+
+class TrashbinCache:
+    """Cache of trash bin snapshots keyed by Nextcloud user.
+
+    A snapshot is fetched again once it is older than the time-to-live, the actions of
+    the bot update it in place.
+
+    :param max_size: Maximum number of cached snapshots.
+    :param ttl: Number of seconds a snapshot is trusted without revalidation.
+    """
+
+    def __init__(self, max_size: int, ttl: int) -> None:
+        self._snapshots: LRUCache[str, TrashbinSnapshot] = LRUCache(max_size, ttl=ttl)
+
+    async def get(self, nc: AsyncNextcloud, *, refresh: bool = False) -> TrashbinSnapshot:
+        """Return the trash bin snapshot of the user.
+
+        :param nc: The Nextcloud client object.
+        :param refresh: Fetch the trash bin even if the snapshot is still fresh.
+            Concurrent fetches of the user share one request.
+        :return: The trash bin snapshot.
+        """
+        user = await nc.user
+        snapshot = None if refresh else self._snapshots.get(user)
+        if snapshot is None:
+            trashbin = await coalesce(nc, ("trashbin",), nc.files.trashbin_list)
+            snapshot = TrashbinSnapshot(trashbin)
+            self._snapshots.set(user, snapshot)
+        return snapshot
+
+    def invalidate_user(self, user: str) -> None:
+        """Drop the trash bin snapshot of the user.
+
+        :param user: Nextcloud user id.
+        """
+        self._snapshots.pop(user)
+
+
+class SearchResult:
+    """Cached results of a search request.
+
+    :param fsnodes: The list of found fsnodes.
+    :param complete: Whether `fsnodes` contains all results or only the first of them.
+    """
+
+    def __init__(self, fsnodes: list[FsNode], *, complete: bool) -> None:
+        self.fsnodes = fsnodes
+        self.complete = complete
+
+
+class SearchCache:
+    """Short-living cache of search results keyed by Nextcloud user and request.
+
+    :param max_size: Maximum number of cached results.
+    :param ttl: Number of seconds the results are kept.
+    """
+
+    def __init__(self, max_size: int, ttl: int) -> None:
+        self._results: LRUCache[tuple[str, Hashable], SearchResult] = LRUCache(max_size, ttl=ttl)
+
+    async def get(self, nc: AsyncNextcloud, key: Hashable) -> SearchResult | None:
+        """Return the cached results of the request.
+
+        :param nc: The Nextcloud client object.
+        :param key: Hashable representation of the search request.
+        :return: The search results or None if they are not cached or expired.
+        """
+        return self._results.get((await nc.user, key))
+
+    async def set(self, nc: AsyncNextcloud, key: Hashable, result: SearchResult) -> None:
+        """Store the results of the request.
+
+        :param nc: The Nextcloud client object.
+        :param key: Hashable representation of the search request.
+        :param result: The search results.
+        """
+        self._results.set((await nc.user, key), result)
+
+    def invalidate_user(self, user: str) -> None:
+        """Drop all search results of the user.
+
+        :param user: Nextcloud user id.
+        """
+        self._results.discard_if(lambda key: key[0] == user)
+
+
+class TelegramFileCache:
+    """Map from Nextcloud file versions to Telegram file ids of the sent documents.
+
+    A file version is identified by its file id and etag, so a changed file is sent
+    again. The first level is an in-process LRU cache, the optional second level is
+    Redis shared by all workers, used once a client is attached with :meth:`use_redis`.
+
+    :param max_size: Maximum number of file ids in the in-process cache.
+    :param redis_ttl: Number of seconds a file id is kept in Redis, defaults to None (forever).
+    """
+
+    key_prefix = "nc_tg_bot:tg_file_id:"
+
+    def __init__(self, max_size: int, redis_ttl: int | None = None) -> None:
+        self._file_ids: LRUCache[tuple[str, str], str] = LRUCache(max_size)
+        self._redis: Redis | None = None
+        self._redis_ttl = redis_ttl
+
+    def use_redis(self, redis: Redis) -> None:
+        """Share the file ids between workers through Redis.
+
+        :param redis: Redis client, e.g. the one of the FSM storage.
+        """
+        self._redis = redis
+
+    def _redis_key(self, fsnode: FsNode) -> str:
+        etag = fsnode.etag.strip('"')
+        return f"{self.key_prefix}{fsnode.file_id}:{etag}"
+
+    async def get(self, fsnode: FsNode) -> str | None:
+        """Return the Telegram file id of the file version.
+
+        :param fsnode: The file.
+        :return: The Telegram file id or None if this version was not sent yet.
+        """
+        file_id = self._file_ids.get((fsnode.file_id, fsnode.etag))
+        if file_id is not None or self._redis is None:
+            return file_id
+
+        raw_file_id = await self._redis.get(self._redis_key(fsnode))
+        if raw_file_id is None:
+            return None
+        file_id = raw_file_id.decode()
+        self._file_ids.set((fsnode.file_id, fsnode.etag), file_id)
+        return file_id
+
+    async def set(self, fsnode: FsNode, file_id: str) -> None:
+        """Remember the Telegram file id of the sent file version.
+
+        :param fsnode: The file.
+        :param file_id: Telegram file id of the sent document.
+        """
+        self._file_ids.set((fsnode.file_id, fsnode.etag), file_id)
+        if self._redis is not None:
+            await self._redis.set(self._redis_key(fsnode), file_id, ex=self._redis_ttl)
+
+    async def invalidate(self, fsnode: FsNode) -> None:
+        """Forget the Telegram file id of the file version, e.g. if Telegram rejected it.
+
+        :param fsnode: The file.
+        """
+        self._file_ids.pop((fsnode.file_id, fsnode.etag))
+        if self._redis is not None:
+            await self._redis.delete(self._redis_key(fsnode))
+
+
+class ShareLinkCache:
+    """Cache of public share links keyed by Nextcloud user and file version.
+
+    :param max_size: Maximum number of cached links.
+    """
+
+    def __init__(self, max_size: int) -> None:
+        self._links: LRUCache[tuple[str, str, str], tuple[str, datetime]] = LRUCache(max_size)
+
+    async def get(self, nc: AsyncNextcloud, fsnode: FsNode) -> str | None:
+        """Return the share link of the file version if it is still valid.
+
+        :param nc: The Nextcloud client object.
+        :param fsnode: The shared file.
+        :return: The share link or None if it is not cached or expires soon.
+        """
+        key = (await nc.user, fsnode.file_id, fsnode.etag)
+        cached = self._links.get(key)
+        if cached is None:
+            return None
+        link, valid_until = cached
+        if valid_until <= datetime.now(UTC):
+            self._links.pop(key)
+            return None
+        return link
+
+    async def set(
+        self,
+        nc: AsyncNextcloud,
+        fsnode: FsNode,
+        link: str,
+        valid_until: datetime,
+    ) -> None:
+        """Store the share link of the file version.
+
+        :param nc: The Nextcloud client object.
+        :param fsnode: The shared file.
+        :param link: The share link.
+        :param valid_until: Time until which the link may be handed out.
+        """
+        self._links.set((await nc.user, fsnode.file_id, fsnode.etag), (link, valid_until))
+
+    def invalidate_user(self, user: str) -> None:
+        """Drop all share links of the user.
+
+        :param user: Nextcloud user id.
+        """
+        self._links.discard_if(lambda key: key[0] == user)
+
+
+listing_cache = ListingCache(
+    max_size=settings.nc.listing_cache_size,
+    paths=PathIndex(max_size=settings.nc.path_index_size),
+)
+trashbin_cache = TrashbinCache(
+    max_size=settings.nc.trashbin_cache_size,
+    ttl=settings.nc.trashbin_cache_ttl,
+)
+search_cache = SearchCache(
+    max_size=settings.nc.search_cache_size,
+    ttl=settings.nc.search_cache_ttl,
+)
+tg_file_cache = TelegramFileCache(
+    max_size=settings.nc.tg_file_cache_size,
+    redis_ttl=settings.redis.tg_file_id_ttl if settings.redis else None,
+)
+share_link_cache = ShareLinkCache(max_size=settings.nc.share_link_cache_size)
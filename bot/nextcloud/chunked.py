@@ -0,0 +1,124 @@
+"""Nextcloud chunked file upload fed chunk by chunk.
+
+:class:`AsyncNextcloud` only uploads from objects with a blocking `read` method, so the
+upload of data arriving asynchronously is implemented on top of its WebDAV session with
+the chunked upload v2 protocol. Chunks stay in the upload directory until it is assembled
+or aborted, so an interrupted upload can be resumed by its upload id.
+"""
+
+import asyncio
+import secrets
+from urllib.parse import quote
+
+from nc_py_api import AsyncNextcloud, FsNode, NextcloudException
+from nc_py_api._exceptions import check_error
+from nc_py_api.files._files import dav_get_obj_path, etag_fileid_from_response
+
+METHOD_NOT_ALLOWED = 405
+
+
+class ChunkedUpload:
+    """Chunked upload of a single file.
+
+    :param nc: The Nextcloud client object.
+    :param path: Destination path of the file relative to the user's root.
+    :param upload_id: Name of the upload directory, a random one is used if omitted.
+    :param completed: Numbers of the chunks already stored in the upload directory.
+    :param retries: Number of retries of a failed chunk, defaults to 0.
+    """
+
+    def __init__(
+        self,
+        nc: AsyncNextcloud,
+        path: str,
+        upload_id: str | None = None,
+        completed: set[int] | None = None,
+        retries: int = 0,
+    ) -> None:
+        self.nc = nc
+        self.path = path
+        self.upload_id = upload_id or f"nc-tg-bot-{secrets.token_hex(16)}"
+        self.completed = completed or set()
+        self.retries = retries
+        self.chunk_number = 0
+        self.size = 0
+        self._dav_path = ""
+        self._headers: dict[str, str] = {}
+
+    async def start(self) -> None:
+        """Create the upload directory on the server.
+
+        If the directory already exists the upload is resumed, otherwise the completed
+        chunks are forgotten as they were removed together with the directory.
+        """
+        session = self.nc._session  # noqa: SLF001
+        user = await session.user
+        self._dav_path = quote(dav_get_obj_path(user, self.upload_id, root_path="/uploads"))
+        full_path = quote(dav_get_obj_path(user, self.path))
+        self._headers = {"Destination": f"{session.cfg.dav_endpoint}{full_path}"}
+        response = await session.adapter_dav.request(
+            "MKCOL",
+            self._dav_path,
+            headers=self._headers,
+        )
+        if response.status_code == METHOD_NOT_ALLOWED:
+            return
+        check_error(response, f"chunked upload start: path={self.path}")
+        self.completed = set()
+
+    async def _put(self, chunk: bytes) -> None:
+        session = self.nc._session  # noqa: SLF001
+        response = await session.adapter_dav.put(
+            f"{self._dav_path}/{self.chunk_number}",
+            data=chunk,
+            headers=self._headers,
+        )
+        check_error(response, f"chunked upload: path={self.path}, chunk={self.chunk_number}")
+
+    async def put(self, chunk: bytes) -> bool:
+        """Upload the next chunk.
+
+        Every chunk except the last one must be at least 5 MiB. A chunk stored by the
+        resumed upload is skipped, a failed one is retried with exponential backoff.
+
+        :param chunk: Content of the chunk.
+        :return: Whether the chunk was sent to the server.
+        """
+        self.chunk_number += 1
+        self.size += len(chunk)
+        if self.chunk_number in self.completed:
+            return False
+
+        for attempt in range(self.retries + 1):
+            try:
+                await self._put(chunk)
+            except (OSError, NextcloudException):
+                if attempt == self.retries:
+                    raise
+                await asyncio.sleep(2**attempt)
+            else:
+                break
+        self.completed.add(self.chunk_number)
+        return True
+
+    async def finish(self) -> FsNode:
+        """Assemble the uploaded chunks into the destination file.
+
+        An existing file is never overwritten, the server answers with 412 Precondition
+        Failed instead.
+
+        :return: The uploaded file.
+        """
+        session = self.nc._session  # noqa: SLF001
+        response = await session.adapter_dav.request(
+            "MOVE",
+            f"{self._dav_path}/.file",
+            headers={**self._headers, "Overwrite": "F"},
+        )
+        check_error(response, f"chunked upload finish: path={self.path}, size={self.size}")
+        full_path = dav_get_obj_path(await session.user, self.path)
+        return FsNode(full_path.strip("/"), **etag_fileid_from_response(response))
+
+    async def abort(self) -> None:
+        """Remove the upload directory with all uploaded chunks."""
+        await self.nc._session.adapter_dav.delete(self._dav_path)  # noqa: SLF001
@@ -3,3 +3,7 @@
 
 class FsNodeNotFoundError(ValueError):
     """Raised when a file or directory is not found in the Nextcloud."""
+
+
+class SearchQueryError(ValueError):
+    """Raised when a filter of the search query has an invalid value."""
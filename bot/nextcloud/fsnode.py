@@ -1,15 +1,60 @@
 """Services that provides methods to interact with a Nextcloud fsnode."""
 
-import io
+import asyncio
+import os
 import pathlib
+import tempfile
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager, suppress
+from datetime import UTC, datetime, timedelta
 from typing import BinaryIO, Self
 
-from aiogram.types import BufferedInputFile
-from nc_py_api import AsyncNextcloud, FsNode
+from nc_py_api import AsyncNextcloud, FilePermissions, FsNode, NextcloudException, ShareType
 
 from bot.core import settings
-from bot.nextcloud._base import BaseService
+from bot.core.config import MIN_SHARE_LINK_DAYS
+from bot.nextcloud._base import BaseService, coalesce
+from bot.nextcloud.archive import write_archive
+from bot.nextcloud.cache import listing_cache, share_link_cache, trashbin_cache
+from bot.nextcloud.chunked import ChunkedUpload
 from bot.nextcloud.exceptions import FsNodeNotFoundError
+from bot.nextcloud.progress import UploadProgress, upload_progress
+from bot.nextcloud.ranged import RangedDownload
+from bot.nextcloud.transfer import FilePartInputFile, SpooledInputFile, transfer_budget
+
+
+async def _read_chunks(path: pathlib.Path) -> AsyncIterator[bytes]:
+    """Read the local file by `settings.nc.chunksize` chunks without blocking the loop."""
+    with path.open("rb") as file:
+        while chunk := await asyncio.to_thread(file.read, settings.nc.chunksize):
+            yield chunk
+
+
+async def _regroup_chunks(
+    pieces: AsyncIterator[bytes],
+    chunksize: int,
+    queue: asyncio.Queue[bytes | None],
+) -> None:
+    """Put the received pieces into the queue as chunks of `chunksize` bytes.
+
+    The last chunk may be smaller, None is put after it. None is also put when receiving
+    fails, so the consumer stops waiting, but not when the task is cancelled.
+    """
+    buff = bytearray()
+    try:
+        async for piece in pieces:
+            buff.extend(piece)
+            while len(buff) >= chunksize:
+                await queue.put(bytes(buff[:chunksize]))
+                del buff[:chunksize]
+        if buff:
+            await queue.put(bytes(buff))
+    except asyncio.CancelledError:
+        raise
+    except BaseException:
+        await queue.put(None)
+        raise
+    await queue.put(None)
 
 
 class BaseFsNodeService:
@@ -24,20 +69,101 @@ class BaseFsNodeService:
         self.nc = nc
         self.fsnode = fsnode
         self.attached_fsnodes = attached_fsnodes
+        self.reserved_names: set[str] = set()
 
     @staticmethod
-    async def _check_is_root_id(nc: AsyncNextcloud, file_id: str) -> FsNode:
+    async def _list_root(nc: AsyncNextcloud) -> tuple[FsNode, list[FsNode]]:
+        """List the root fsnode, using the cached listing while its etag is unchanged.
+
+        :param nc: The Nextcloud client object.
+        :return: Tuple with root fsnode and attached to root fsnodes.
+        """
+        root_id = await listing_cache.get_root_id(nc)
+        if root_id is not None:
+            cached = await listing_cache.get(nc, root_id)
+            if cached is not None:
+                return cached
+
+        fsnodes_list = await nc.files.listdir(exclude_self=False)
+        await listing_cache.set_root(nc, fsnodes_list[0], fsnodes_list[1:])
+        return fsnodes_list[0], fsnodes_list[1:]
+
+    @classmethod
+    async def _check_is_root_id(
+        cls,
+        nc: AsyncNextcloud,
+        file_id: str,
+    ) -> tuple[FsNode, list[FsNode]]:
         """Check if the given file id is the id of the root fsnode.
 
         :param nc: The Nextcloud client object.
         :param fsnode: The fsnode object.
         :return: Tuple with root fsnode and attached to root fsnodes.
         """
-        fsnodes_list = await nc.files.listdir(exclude_self=False)
-        if fsnodes_list[0].file_id == file_id:
-            return fsnodes_list[0], fsnodes_list[1:]
+        root_id = await listing_cache.get_root_id(nc)
+        if root_id is not None and root_id != file_id:
+            raise FsNodeNotFoundError
+        root, attached_fsnodes = await cls._list_root(nc)
+        if root.file_id == file_id:
+            return root, attached_fsnodes
         raise FsNodeNotFoundError
 
+    async def _find_share_link(self, valid_until: datetime) -> tuple[str, datetime] | None:
+        """Find a public read-only link share of the current fsnode that is still valid.
+
+        A share that never expires is treated as expiring at `valid_until`, so its link is
+        looked up again later.
+
+        :param valid_until: The earliest acceptable expiration of the share.
+        :return: The download link and the expiration of the share, or None if there is none.
+        """
+        found = None
+        for share in await self.nc.files.sharing.get_list(path=self.fsnode):
+            if (
+                share.share_type != ShareType.TYPE_LINK
+                or share.permissions != FilePermissions.PERMISSION_READ
+                or share.raw_data.get("password")
+                or not share.url
+            ):
+                continue
+            if share.raw_data.get("expiration"):
+                expire_date = share.expire_date.replace(tzinfo=share.expire_date.tzinfo or UTC)
+            else:
+                expire_date = valid_until
+            if expire_date < valid_until or (found is not None and expire_date <= found[1]):
+                continue
+            found = f"{share.url}/download", expire_date
+        return found
+
+    async def get_share_link(self) -> str:
+        """Return a public link to download the current fsnode directly from Nextcloud.
+
+        An existing public read-only link share of the fsnode is reused while at least a
+        day of its validity is left, otherwise a link share expiring after
+        `settings.nc.share_link_days` days is created.
+
+        :return: The download link.
+        """
+        link = await share_link_cache.get(self.nc, self.fsnode)
+        if link is not None:
+            return link
+
+        today = datetime.now(UTC).replace(hour=0, minute=0, second=0, microsecond=0)
+        found = await self._find_share_link(today + timedelta(days=MIN_SHARE_LINK_DAYS))
+        if found is not None:
+            link, expire_date = found
+        else:
+            expire_date = today + timedelta(days=settings.nc.share_link_days)
+            share = await self.nc.files.sharing.create(
+                self.fsnode,
+                ShareType.TYPE_LINK,
+                FilePermissions.PERMISSION_READ,
+                expire_date=expire_date,
+            )
+            link = f"{share.url}/download"
+        await share_link_cache.set(self.nc, self.fsnode, link, expire_date - timedelta(days=1))
+        return link
+
     def _generate_unique_name(self, name: str) -> str:
         """Generate a unique name for a fsnode.
 
@@ -46,14 +172,55 @@ class BaseFsNodeService:
         """
         i = 1
         path = pathlib.Path(name)
-        while name in [fsnode.name for fsnode in self.attached_fsnodes]:
+        taken = {fsnode.name for fsnode in self.attached_fsnodes} | self.reserved_names
+        while name in taken:
             name = f"{path.stem} ({i}){path.suffix}"
             i += 1
         return name
 
+    def reserve_name(self, name: str) -> str:
+        """Reserve a unique name for a file that is going to be uploaded.
+
+        Files uploaded concurrently to the same fsnode get distinct names without
+        listing it again.
+
+        :param name: The proposed name for the file.
+        :return: The reserved unique name.
+        """
+        name = self._generate_unique_name(name)
+        self.reserved_names.add(name)
+        return name
+
+    def _claim_name(self, name: str) -> str:
+        """Return the reserved name as is or reserve a unique one."""
+        return name if name in self.reserved_names else self.reserve_name(name)
+
+    async def _add_uploaded(self, fsnode: FsNode) -> FsNode:
+        """Release the name of the uploaded file and attach it to the current fsnode.
+
+        The upload only returns the etag and the file id of the file, so its properties
+        are fetched before the listing is written through.
+        """
+        self.reserved_names.discard(fsnode.name)
+        fsnode = await self.nc.files.by_path(fsnode.user_path)
+        self.attached_fsnodes.append(fsnode)
+        await self._write_through()
+        return fsnode
+
+    async def _write_through(self) -> None:
+        """Store the patched listing of the current fsnode under its new etag."""
+        self.fsnode = await listing_cache.write_through(
+            self.nc,
+            self.fsnode,
+            self.attached_fsnodes,
+        )
+
     async def mkdir(self, name: str) -> FsNode:
         """Create a new directory in the current fsnode.
 
+        The new directory is written through to the cached listings, so neither the
+        current fsnode nor the new directory is listed again.
+
         :param name: The name of the new directory.
         :return: The created directory.
         """
@@ -63,45 +230,319 @@ class BaseFsNodeService:
 
         name = self._generate_unique_name(name)
         new_dir = await self.nc.files.mkdir(f"{self.fsnode.user_path}{name}")
+        new_dir = await self.nc.files.by_path(new_dir.user_path)
 
         self.attached_fsnodes.append(new_dir)
+        await self._write_through()
+        await listing_cache.set(self.nc, new_dir, [])
 
         return new_dir
 
     async def delete(self) -> None:
-        """Delete the current fsnode."""
+        """Delete the current fsnode.
+
+        The fsnode is dropped from the cached listing of its parent. The cached trash bin
+        snapshot is dropped, since the fsnode is moved there.
+        """
         await self.nc.files.delete(self.fsnode)
+        await listing_cache.remove(self.nc, self.fsnode)
+        trashbin_cache.invalidate_user(await self.nc.user)
+
+    async def delete_many(
+        self,
+        fsnodes: list[FsNode],
+    ) -> tuple[list[FsNode], list[FsNode]]:
+        """Delete the fsnodes attached to the current fsnode.
 
-    async def download(self) -> BufferedInputFile:
+        The DELETE requests are sent concurrently, at most `settings.nc.delete_concurrency`
+        at once. The deleted fsnodes are removed from the attached ones and the patched
+        listing is written through to the cache, so it is not listed again.
+
+        :param fsnodes: The attached fsnodes to delete.
+        :return: Tuple with the deleted fsnodes and the fsnodes that failed to be deleted.
+        """
+        semaphore = asyncio.Semaphore(settings.nc.delete_concurrency)
+
+        async def delete_one(fsnode: FsNode) -> bool:
+            async with semaphore:
+                try:
+                    await self.nc.files.delete(fsnode)
+                except NextcloudException:
+                    return False
+                return True
+
+        results = await asyncio.gather(*(delete_one(fsnode) for fsnode in fsnodes))
+        deleted = [fsnode for fsnode, ok in zip(fsnodes, results, strict=True) if ok]
+        failed = [fsnode for fsnode, ok in zip(fsnodes, results, strict=True) if not ok]
+
+        if deleted:
+            deleted_ids = {fsnode.file_id for fsnode in deleted}
+            self.attached_fsnodes = [
+                fsnode for fsnode in self.attached_fsnodes if fsnode.file_id not in deleted_ids
+            ]
+            await self._write_through()
+            trashbin_cache.invalidate_user(await self.nc.user)
+        return deleted, failed
+
+    def _use_ranged_download(self) -> bool:
+        """Whether the current fsnode is big enough to be fetched by range requests."""
+        return (
+            settings.nc.download_connections > 1
+            and self.fsnode.info.size > max(settings.nc.spool_size, settings.nc.chunksize)
+        )
+
+    def _ranged_download(self) -> RangedDownload:
+        return RangedDownload(
+            self.nc,
+            self.fsnode,
+            connections=settings.nc.download_connections,
+            range_size=settings.nc.chunksize,
+            retries=settings.nc.download_retries,
+        )
+
+    @asynccontextmanager
+    async def download(self, *, to_disk: bool = False) -> AsyncIterator[SpooledInputFile]:
         """Download the current fsnode.
 
+        The content is kept in memory up to `settings.nc.spool_size` bytes and spooled to
+        a temporary file above it. The memory part is reserved from the global transfer
+        budget, the file is removed when the context is exited. Files that do not fit in
+        memory are fetched by concurrent range requests straight into a temporary file.
+
+        :param to_disk: Write the content straight into a temporary file, the budget is
+            only held while the content is received, defaults to False.
         :return: The downloaded fsnode.
         """
-        buff = io.BytesIO()
-        await self.nc.files.download2stream(self.fsnode, buff, chunk_size=settings.nc.chunksize)
-
-        buff.seek(0)
-        return BufferedInputFile(buff.read(), filename=self.fsnode.name)
+        if to_disk or self._use_ranged_download():
+            with tempfile.TemporaryFile() as file:
+                if self._use_ranged_download():
+                    await self._ranged_download().download(file)
+                else:
+                    async with transfer_budget.reserve(settings.nc.chunksize):
+                        await self.nc.files.download2stream(
+                            self.fsnode,
+                            file,
+                            chunk_size=settings.nc.chunksize,
+                        )
+                yield SpooledInputFile(file, filename=self.fsnode.name)
+            return
+
+        size = min(self.fsnode.info.size, settings.nc.spool_size)
+        async with transfer_budget.reserve(size):
+            with tempfile.SpooledTemporaryFile(max_size=settings.nc.spool_size) as buff:
+                await self.nc.files.download2stream(
+                    self.fsnode,
+                    buff,
+                    chunk_size=settings.nc.chunksize,
+                )
+                yield SpooledInputFile(buff, filename=self.fsnode.name)
+
+    @asynccontextmanager
+    async def download_to_dir(self, directory: str | None = None) -> AsyncIterator[pathlib.Path]:
+        """Download the current fsnode into a temporary file on disk.
+
+        The file keeps the name of the fsnode and is readable by other local users, e.g.
+        by a Telegram Bot API server sharing the directory. It is removed when the context
+        is exited.
+
+        :param directory: Directory to create the file in, defaults to the system one.
+        :return: Path to the downloaded file.
+        """
+        with tempfile.TemporaryDirectory(dir=directory) as tmp_dir:
+            tmp_path = pathlib.Path(tmp_dir)
+            tmp_path.chmod(0o755)
+            path = tmp_path / self.fsnode.name
+            if self._use_ranged_download():
+                with path.open("wb+") as file:
+                    await self._ranged_download().download(file)
+            else:
+                await self.nc.files.download2stream(
+                    self.fsnode,
+                    path,
+                    chunk_size=settings.nc.chunksize,
+                )
+            path.chmod(0o644)
+            yield path
+
+    @asynccontextmanager
+    async def download_archive(self) -> AsyncIterator[list[FilePartInputFile]]:
+        """Download the current directory as a zip archive into a temporary file.
+
+        The tree is listed by `settings.nc.archive_concurrency` concurrent requests and
+        the files are streamed into the archive one chunk at a time. An archive bigger than
+        `settings.tg.max_download_size` is split into volumes `<name>.zip.001`,
+        `<name>.zip.002` and so on, that are joined back by 7-Zip or `cat`. The file is
+        removed when the context is exited.
+
+        :return: The archive or its volumes ready to be sent to Telegram.
+        """
+        if not self.fsnode.is_dir:
+            msg = "Cannot archive the fsnode because it is not a directory."
+            raise ValueError(msg)
 
-    async def upload(self, buff: BinaryIO, name: str) -> FsNode:
+        name = f"{self.fsnode.name or 'Nextcloud'}.zip"
+        part_size = settings.tg.max_download_size
+        async with transfer_budget.reserve(settings.nc.chunksize):
+            with tempfile.TemporaryFile() as file:
+                await write_archive(
+                    self.nc,
+                    self.fsnode,
+                    file,
+                    concurrency=settings.nc.archive_concurrency,
+                    chunk_size=settings.nc.chunksize,
+                )
+                size = file.seek(0, os.SEEK_END)
+                if size <= part_size:
+                    yield [FilePartInputFile(file, 0, size, filename=name)]
+                    return
+                yield [
+                    FilePartInputFile(
+                        file,
+                        offset,
+                        min(part_size, size - offset),
+                        filename=f"{name}.{number:03}",
+                    )
+                    for number, offset in enumerate(range(0, size, part_size), start=1)
+                ]
+
+    async def upload(
+        self,
+        buff: BinaryIO | pathlib.Path,
+        name: str,
+        source: str | None = None,
+    ) -> FsNode:
         """Upload a file to the current fsnode.
 
-        :param buff: The file to upload.
-        :param name: The name of the file.
+        A local file given by path is streamed from disk chunk by chunk with the
+        resumable chunked upload.
+
+        :param buff: The file or the path to the local file to upload.
+        :param name: The name of the file, a name reserved by :meth:`reserve_name` is used
+            as is.
+        :param source: Identifier of the content making the upload resumable, see
+            :meth:`upload_chunks`, defaults to None.
         :return: The newly uploaded file.
         """
+        if isinstance(buff, pathlib.Path):
+            return await self.upload_chunks(_read_chunks(buff), name, source=source)
+
         if not self.fsnode.is_dir:
             msg = "Cannot upload file because the parent node is not a directory."
             raise ValueError(msg)
 
-        name = self._generate_unique_name(name)
+        name = self._claim_name(name)
 
         buff.seek(0)
-        return await self.nc.files.upload_stream(
+        fsnode = await self.nc.files.upload_stream(
             f"{self.fsnode.user_path}{name}",
             buff,
             chunk_size=settings.nc.chunksize,
         )
+        return await self._add_uploaded(fsnode)
+
+    def _resume_name(self, progress: UploadProgress, name: str) -> str | None:
+        """Return the name the stored upload can be resumed under.
+
+        The upload is resumed only if its destination is still inside the current fsnode
+        and no other fsnode has been created or reserved under its name since.
+
+        :param progress: The stored progress of the upload.
+        :param name: The name claimed for the file.
+        :return: The name of the destination or None if the upload must start over.
+        """
+        if progress.chunksize != settings.nc.chunksize:
+            return None
+        resume_name = pathlib.PurePosixPath(progress.path).name
+        if progress.path != f"{self.fsnode.user_path}{resume_name}":
+            return None
+        taken = {fsnode.name for fsnode in self.attached_fsnodes}
+        taken |= self.reserved_names - {name}
+        return None if resume_name in taken else resume_name
+
+    async def _start_upload(self, name: str, key: str | None) -> ChunkedUpload:
+        """Start the chunked upload or resume the one stored under the key."""
+        progress = await upload_progress.get(key) if key is not None else None
+        resume_name = self._resume_name(progress, name) if progress is not None else None
+        if progress is None or resume_name is None:
+            upload = ChunkedUpload(
+                self.nc,
+                f"{self.fsnode.user_path}{self._claim_name(name)}",
+                retries=settings.nc.upload_retries,
+            )
+        else:
+            self.reserved_names.discard(name)
+            self.reserved_names.add(resume_name)
+            upload = ChunkedUpload(
+                self.nc,
+                progress.path,
+                upload_id=progress.upload_id,
+                completed=progress.chunks,
+                retries=settings.nc.upload_retries,
+            )
+        await upload.start()
+
+        if key is not None and not upload.completed:
+            progress = UploadProgress(
+                upload_id=upload.upload_id,
+                path=upload.path,
+                chunksize=settings.nc.chunksize,
+            )
+            await upload_progress.start(key, progress)
+        return upload
+
+    async def upload_chunks(
+        self,
+        chunks: AsyncIterator[bytes],
+        name: str,
+        source: str | None = None,
+    ) -> FsNode:
+        """Upload a file to the current fsnode while its content is still being received.
+
+        Received pieces are regrouped into `settings.nc.chunksize` chunks. Every complete
+        chunk is sent to the Nextcloud chunked upload while the next one is being received,
+        so only a couple of chunks are held in memory.
+
+        When `source` is given, acknowledged chunks are persisted and a failed upload is
+        left on the server. Uploading the same content to the same directory again
+        resumes it, the chunks already stored are received but not sent.
+
+        :param chunks: Asynchronous iterator over the content of the file.
+        :param name: The name of the file, a name reserved by :meth:`reserve_name` is used
+            as is.
+        :param source: Identifier of the content, e.g. Telegram file unique id, defaults
+            to None.
+        :return: The newly uploaded file.
+        """
+        if not self.fsnode.is_dir:
+            msg = "Cannot upload file because the parent node is not a directory."
+            raise ValueError(msg)
+
+        chunksize = settings.nc.chunksize
+        queue: asyncio.Queue[bytes | None] = asyncio.Queue(maxsize=1)
+        key = None
+        if source is not None:
+            key = upload_progress.key(await self.nc.user, self.fsnode.file_id, source)
+
+        async with transfer_budget.reserve(3 * chunksize):
+            upload = await self._start_upload(name, key)
+            receiver = asyncio.create_task(_regroup_chunks(chunks, chunksize, queue))
+            try:
+                while (chunk := await queue.get()) is not None:
+                    if await upload.put(chunk) and key is not None:
+                        await upload_progress.add_chunk(key, upload.chunk_number)
+                await receiver
+                fsnode = await upload.finish()
+            except BaseException:
+                if not receiver.done():
+                    receiver.cancel()
+                    with suppress(asyncio.CancelledError):
+                        await receiver
+                if key is None:
+                    await upload.abort()
+                raise
+        if key is not None:
+            await upload_progress.finish(key)
+        return await self._add_uploaded(fsnode)
 
 
 class RootFsNodeService(BaseService[BaseFsNodeService], BaseFsNodeService):
@@ -111,57 +552,92 @@ class RootFsNodeService(BaseService[BaseFsNodeService], BaseFsNodeService):
     async def create_instance(cls, nc: AsyncNextcloud) -> Self:
         """Create a RootFsNodeService object for the root fsnode.
 
+        Concurrent identical requests of the user share one listing.
+
         :param nc: The Nextcloud client object.
         :return: The RootFsNodeService object.
         """
-        fsnodes_list = await nc.files.listdir(exclude_self=False)
-        return cls(nc, fsnodes_list[0], fsnodes_list[1:])
+        fsnode, attached_fsnodes = await coalesce(nc, ("root",), lambda: cls._list_root(nc))
+        return cls(nc, fsnode, list(attached_fsnodes))
 
 
 class FsNodeService(BaseService[BaseFsNodeService], BaseFsNodeService):
     """Service for a non root fsnode."""
 
+    @classmethod
+    async def _load(cls, nc: AsyncNextcloud, file_id: str) -> tuple[FsNode, list[FsNode]]:
+        cached = await listing_cache.get(nc, file_id)
+        if cached is not None:
+            return cached
+
+        if file_id == await listing_cache.get_root_id(nc):
+            return await cls._list_root(nc)
+
+        fsnode = await nc.files.by_id(file_id)
+        if fsnode is None:
+            return await cls._check_is_root_id(nc, file_id)
+        attached_fsnodes = await nc.files.listdir(fsnode)
+        await listing_cache.set(nc, fsnode, attached_fsnodes)
+        return fsnode, attached_fsnodes
+
     @classmethod
     async def create_instance(cls, nc: AsyncNextcloud, file_id: str) -> Self:
         """Create a FsNodeService object for the given fsnode.
 
+        The listing is taken from the cache when the fsnode etag has not changed.
         The function does an additional check for root fsnode because
-        AsynNextcloud does not return root fsnode by file_id.
+        AsynNextcloud does not return root fsnode by file_id. Concurrent identical
+        requests of the user share one listing.
 
         :param nc: The Nextcloud client object.
         :param file_id: The file id of the fsnode.
         :return: The FsNodeService object.
         """
-        fsnode = await nc.files.by_id(file_id)
-        if fsnode is None:
-            fsnode, attached_fsnodes = await cls._check_is_root_id(nc, file_id)
-            return cls(nc, fsnode, attached_fsnodes)
-        attached_fsnodes = await nc.files.listdir(fsnode)
-        return cls(nc, fsnode, attached_fsnodes)
+        fsnode, attached_fsnodes = await coalesce(
+            nc,
+            ("fsnode", file_id),
+            lambda: cls._load(nc, file_id),
+        )
+        return cls(nc, fsnode, list(attached_fsnodes))
 
 
 class PrevFsNodeService(BaseService[BaseFsNodeService], BaseFsNodeService):
     """Service for a fsnode that is the parent of the current fsnode."""
 
     @classmethod
-    async def create_instance(cls, nc: AsyncNextcloud, file_id: str) -> Self:
-        """Create a PrevFsNodeService object for the given fsnode.
+    async def _load(cls, nc: AsyncNextcloud, file_id: str) -> tuple[FsNode, list[FsNode]]:
+        cached = await listing_cache.get_parent(nc, file_id)
+        if cached is not None:
+            return cached
 
-        The function does an additional check for root fsnode because
-        AsynNextcloud does not return root fsnode by file_id.
-
-        :param nc: The Nextcloud client object.
-        :param file_id: The file id of the fsnode.
-        :return: The PrevFsNodeService object.
-        """
         fsnode = await nc.files.by_id(file_id)
         if fsnode is None:
-            fsnode, attached_fsnodes = await cls._check_is_root_id(nc, file_id)
-            return cls(nc, fsnode, attached_fsnodes)
+            return await cls._check_is_root_id(nc, file_id)
 
         path = pathlib.Path(fsnode.user_path)
         prev_path = str(path.parent) if str(path.parent) != "." else ""
 
         fsnode = await nc.files.by_path(prev_path)
         attached_fsnodes = await nc.files.listdir(fsnode)
-        return cls(nc, fsnode, attached_fsnodes)
+        await listing_cache.set(nc, fsnode, attached_fsnodes)
+        return fsnode, attached_fsnodes
+
+    @classmethod
+    async def create_instance(cls, nc: AsyncNextcloud, file_id: str) -> Self:
+        """Create a PrevFsNodeService object for the given fsnode.
+
+        The parent is resolved from the path index and its cached listing, Nextcloud is
+        asked only when either is missing. The function does an additional check for root
+        fsnode because AsynNextcloud does not return root fsnode by file_id. Concurrent
+        identical requests of the user share one listing.
+
+        :param nc: The Nextcloud client object.
+        :param file_id: The file id of the fsnode.
+        :return: The PrevFsNodeService object.
+        """
+        fsnode, attached_fsnodes = await coalesce(
+            nc,
+            ("parent", file_id),
+            lambda: cls._load(nc, file_id),
+        )
+        return cls(nc, fsnode, list(attached_fsnodes))
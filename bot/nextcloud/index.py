@@ -0,0 +1,120 @@
+"""Background crawler keeping the local fsnode index up to date."""
+
+import asyncio
+import contextlib
+import logging
+
+from nc_py_api import AsyncNextcloud, FsNode
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from bot.core import settings
+from bot.db import CachedUser, UnitOfWork, session_maker
+from bot.nextcloud.pool import nc_pool
+
+logger = logging.getLogger(__name__)
+
+
+class IndexCrawler:
+    """Periodically walks the file trees of all authorized users into the local index.
+
+    Nextcloud changes the etag of every directory up to the root when something inside
+    it changes, so only directories whose etag differs from the indexed one are listed.
+    The etag of a directory is stored after its whole subtree, so an interrupted crawl
+    is resumed by the next one and the index counts as complete only after the etag of
+    the root is stored.
+
+    :param session_factory: Factory of database sessions.
+    :param interval: Number of seconds between crawls.
+    :param concurrency: Maximum number of users crawled at once.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        interval: int,
+        concurrency: int,
+    ) -> None:
+        self._session_factory = session_factory
+        self.interval = interval
+        self.concurrency = concurrency
+        self._task: asyncio.Task[None] | None = None
+
+    async def crawl_user(self, nc: AsyncNextcloud, user_id: int) -> None:
+        """Bring the index of the user's file tree up to date.
+
+        :param nc: The Nextcloud client object of the user.
+        :param user_id: Telegram user id.
+        """
+        root = await nc.files.by_path("")
+        async with UnitOfWork(self._session_factory) as uow:
+            record = await uow.fsnodes.get_fsnode(user_id, root.file_id)
+            if record is not None and record.etag == root.etag:
+                return
+
+            stack: list[tuple[FsNode, str | None, bool]] = [(root, None, False)]
+            while stack:
+                fsnode, parent_id, listed = stack.pop()
+                if listed:
+                    await uow.fsnodes.save_etag(user_id, fsnode)
+                    await uow.commit()
+                    continue
+
+                attached_fsnodes = await nc.files.listdir(fsnode)
+                pending = await uow.fsnodes.save_listing(
+                    user_id,
+                    fsnode,
+                    attached_fsnodes,
+                    parent_id,
+                )
+                await uow.commit()
+                stack.append((fsnode, parent_id, True))
+                stack.extend(
+                    (pending_fsnode, fsnode.file_id, False) for pending_fsnode in pending
+                )
+
+    async def _crawl_user(self, user: CachedUser, semaphore: asyncio.Semaphore) -> None:
+        async with semaphore:
+            try:
+                async with nc_pool.acquire(user.id, user.nc_login, user.nc_app_password) as nc:
+                    await self.crawl_user(nc, user.id)
+            except Exception:
+                logger.exception("Failed to index the files of user %s.", user.id)
+
+    async def crawl(self) -> None:
+        """Bring the indexes of all authorized users up to date."""
+        async with UnitOfWork(self._session_factory) as uow:
+            users = [await uow.users.get_cached(user_id) for user_id in await uow.users.get_ids()]
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+        await asyncio.gather(
+            *(self._crawl_user(user, semaphore) for user in users if user is not None),
+        )
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.crawl()
+            except Exception:
+                logger.exception("Failed to crawl the fsnode index.")
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        """Start crawling in the background."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop crawling and wait for the current crawl to be cancelled."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await self._task
+        self._task = None
+
+
+index_crawler = IndexCrawler(
+    session_factory=session_maker,
+    interval=settings.nc.index_interval,
+    concurrency=settings.nc.index_concurrency,
+)
@@ -0,0 +1,155 @@
+"""Pool of Nextcloud clients shared between updates of the same user."""
+
+import time
+from collections import OrderedDict
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+from nc_py_api import AsyncNextcloud
+
+from bot.core import settings
+
+
+class _PoolEntry:
+    """Pooled client with its credentials and usage bookkeeping.
+
+    :param nc: The Nextcloud client object.
+    :param credentials: Login and app password the client was created with.
+    """
+
+    def __init__(self, nc: AsyncNextcloud, credentials: tuple[str, str]) -> None:
+        self.nc = nc
+        self.credentials = credentials
+        self.last_used = time.monotonic()
+        self.in_use = 0
+        self.evicted = False
+
+
+class NextcloudPool:
+    """LRU pool of :class:`AsyncNextcloud` clients keyed by Telegram user id.
+
+    Reusing a client keeps its HTTP sessions and their keep-alive connections,
+    so an update does not pay for a new DNS lookup and TLS handshake. Clients of
+    unauthorized users are not pooled. An evicted client is closed only after the
+    last update that uses it has been handled.
+
+    :param max_size: Maximum number of clients kept in the pool.
+    :param ttl: Number of seconds after which an idle client is evicted.
+    """
+
+    def __init__(self, max_size: int, ttl: int) -> None:
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: OrderedDict[int, _PoolEntry] = OrderedDict()
+
+    @staticmethod
+    async def _close(nc: AsyncNextcloud) -> None:
+        """Close HTTP sessions of the client.
+
+        :param nc: The Nextcloud client object.
+        """
+        await nc._session.adapter.close()  # noqa: SLF001
+        await nc._session.adapter_dav.close()  # noqa: SLF001
+
+    def _evict(self, user_id: int) -> _PoolEntry | None:
+        """Remove the user's entry from the pool.
+
+        :param user_id: Telegram user id.
+        :return: Removed entry if it can be closed right away.
+        """
+        entry = self._entries.pop(user_id)
+        entry.evicted = True
+        return entry if entry.in_use == 0 else None
+
+    def _evict_stale(self, now: float) -> list[_PoolEntry]:
+        """Remove idle and overflowing entries from the pool.
+
+        :param now: Current monotonic time.
+        :return: Removed entries that can be closed right away.
+        """
+        user_ids = [
+            user_id
+            for user_id, entry in self._entries.items()
+            if entry.in_use == 0 and now - entry.last_used >= self.ttl
+        ]
+        overflow = len(self._entries) - len(user_ids) - self.max_size
+        for user_id, entry in self._entries.items():
+            if overflow <= 0:
+                break
+            if entry.in_use == 0 and user_id not in user_ids:
+                user_ids.append(user_id)
+                overflow -= 1
+        return [entry for user_id in user_ids if (entry := self._evict(user_id)) is not None]
+
+    @asynccontextmanager
+    async def acquire(
+        self,
+        user_id: int,
+        login: str | None,
+        password: str | None,
+    ) -> AsyncIterator[AsyncNextcloud]:
+        """Provide a client for the user for the duration of an update.
+
+        A pooled client created with other credentials is replaced by a new one.
+
+        :param user_id: Telegram user id.
+        :param login: The user's Nextcloud login name.
+        :param password: The user's Nextcloud app password.
+        :return: The Nextcloud client object.
+        """
+        if login is None or password is None:
+            nc = AsyncNextcloud(nextcloud_url=settings.nc.url)
+            try:
+                yield nc
+            finally:
+                await self._close(nc)
+            return
+
+        now = time.monotonic()
+        to_close = []
+
+        entry = self._entries.get(user_id)
+        if entry is not None and entry.credentials != (login, password):
+            if (evicted := self._evict(user_id)) is not None:
+                to_close.append(evicted)
+            entry = None
+        if entry is None:
+            entry = _PoolEntry(
+                AsyncNextcloud(
+                    nextcloud_url=settings.nc.url,
+                    nc_auth_user=login,
+                    nc_auth_pass=password,
+                ),
+                (login, password),
+            )
+            self._entries[user_id] = entry
+        self._entries.move_to_end(user_id)
+        entry.in_use += 1
+        entry.last_used = now
+        to_close.extend(self._evict_stale(now))
+
+        for stale in to_close:
+            await self._close(stale.nc)
+        try:
+            yield entry.nc
+        finally:
+            entry.in_use -= 1
+            entry.last_used = time.monotonic()
+            if entry.evicted and entry.in_use == 0:
+                await self._close(entry.nc)
+
+    async def invalidate(self, user_id: int) -> None:
+        """Remove the user's client from the pool, e.g. on logout or re-authentication.
+
+        :param user_id: Telegram user id.
+        """
+        if user_id in self._entries and (entry := self._evict(user_id)) is not None:
+            await self._close(entry.nc)
+
+    async def close(self) -> None:
+        """Close all pooled clients."""
+        for user_id in list(self._entries):
+            await self.invalidate(user_id)
+
+
+nc_pool = NextcloudPool(max_size=settings.nc.pool_size, ttl=settings.nc.pool_ttl)
@@ -0,0 +1,124 @@
+"""Persisted progress of resumable chunked uploads.
+
+The progress is stored in Redis through the FSM storage client attached on startup, so
+an upload interrupted by a restart of the bot or a failure of Nextcloud continues from the
+last acknowledged chunk when the same file is uploaded to the same directory again.
+Without Redis the progress is only kept in process.
+"""
+
+from pydantic import BaseModel, Field
+from redis.asyncio import Redis
+
+from bot.core import settings
+from bot.utils import LRUCache
+
+
+class UploadProgress(BaseModel):
+    """Progress of a single chunked upload.
+
+    :param upload_id: Name of the upload directory on the server.
+    :param path: Destination path of the file relative to the user's root.
+    :param chunksize: Size of the chunks, the progress is only valid for the same size.
+    :param chunks: Numbers of the chunks acknowledged by the server.
+    """
+
+    upload_id: str
+    path: str
+    chunksize: int
+    chunks: set[int] = Field(default_factory=set)
+
+
+class UploadProgressStore:
+    """Store of upload progress keyed by Nextcloud user, destination and source file.
+
+    :param max_size: Maximum number of uploads kept in process when Redis is not used.
+    :param ttl: Number of seconds the progress of an abandoned upload is kept.
+    """
+
+    key_prefix = "nc_tg_bot:upload:"
+
+    def __init__(self, max_size: int, ttl: int) -> None:
+        self._uploads: LRUCache[str, UploadProgress] = LRUCache(max_size, ttl=ttl)
+        self._ttl = ttl
+        self._redis: Redis | None = None
+
+    def use_redis(self, redis: Redis) -> None:
+        """Persist the progress in Redis, so it survives restarts and is shared by workers.
+
+        :param redis: Redis client, e.g. the one of the FSM storage.
+        """
+        self._redis = redis
+
+    def key(self, user: str, parent_id: str, source: str) -> str:
+        """Build the key of the upload.
+
+        :param user: Nextcloud user id.
+        :param parent_id: File id of the destination directory.
+        :param source: Identifier of the uploaded content, e.g. Telegram file unique id.
+        :return: The key of the upload.
+        """
+        return f"{self.key_prefix}{user}:{parent_id}:{source}"
+
+    async def get(self, key: str) -> UploadProgress | None:
+        """Return the progress of the upload.
+
+        :param key: The key of the upload.
+        :return: The progress or None if the upload was not started.
+        """
+        if self._redis is None:
+            return self._uploads.get(key)
+
+        raw_progress = await self._redis.get(key)
+        if raw_progress is None:
+            return None
+        progress = UploadProgress.model_validate_json(raw_progress)
+        progress.chunks = {int(number) for number in await self._redis.smembers(f"{key}:chunks")}
+        return progress
+
+    async def start(self, key: str, progress: UploadProgress) -> None:
+        """Store the new upload, the progress of a previous one is dropped.
+
+        :param key: The key of the upload.
+        :param progress: The progress of the upload.
+        """
+        if self._redis is None:
+            self._uploads.set(key, progress)
+            return
+
+        async with self._redis.pipeline() as pipe:
+            pipe.set(key, progress.model_dump_json(exclude={"chunks"}), ex=self._ttl)
+            pipe.delete(f"{key}:chunks")
+            await pipe.execute()
+
+    async def add_chunk(self, key: str, number: int) -> None:
+        """Record the chunk acknowledged by the server.
+
+        :param key: The key of the upload.
+        :param number: The number of the chunk.
+        """
+        if self._redis is None:
+            progress = self._uploads.get(key)
+            if progress is not None:
+                progress.chunks.add(number)
+            return
+
+        async with self._redis.pipeline() as pipe:
+            pipe.sadd(f"{key}:chunks", number)
+            pipe.expire(f"{key}:chunks", self._ttl)
+            pipe.expire(key, self._ttl)
+            await pipe.execute()
+
+    async def finish(self, key: str) -> None:
+        """Forget the completed or aborted upload.
+
+        :param key: The key of the upload.
+        """
+        self._uploads.pop(key)
+        if self._redis is not None:
+            await self._redis.delete(key, f"{key}:chunks")
+
+
+upload_progress = UploadProgressStore(
+    max_size=settings.nc.upload_progress_size,
+    ttl=settings.nc.upload_progress_ttl,
+)
@@ -0,0 +1,141 @@
+"""Parser of the search query syntax.
+
+Besides the words matched against fsnode names the query may contain filters:
+
+- ``type:pdf`` - files with the extension, ``type:image`` (``video``, ``audio``, ``text``)
+  - files of the MIME type group, ``type:image/png`` - files of the MIME type,
+  ``type:dir`` - directories;
+- ``size:>10M`` - size compared with ``>``, ``>=``, ``<``, ``<=`` or equal to the value,
+  ``K``, ``M``, ``G`` and ``T`` suffixes are binary multiples;
+- ``modified:<30d`` - modified less than 30 days ago, ``modified:>1y`` - more than a year
+  ago, ``h``, ``d``, ``w``, ``m`` and ``y`` units are accepted, ``modified:>2024-01-31``
+  compares with the date.
+
+All filters and the name are combined into one request for :meth:`nc.files.find`.
+"""
+
+import re
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+from bot.nextcloud.exceptions import SearchQueryError
+
+DIR_MIMETYPE = "httpd/unix-directory"
+MIMETYPE_GROUPS = ("image", "video", "audio", "text", "application")
+
+_SIZE_UNITS = {"": 1, "K": 2**10, "M": 2**20, "G": 2**30, "T": 2**40}
+_AGE_UNITS = {
+    "h": timedelta(hours=1),
+    "d": timedelta(days=1),
+    "w": timedelta(weeks=1),
+    "m": timedelta(days=30),
+    "y": timedelta(days=365),
+}
+_OPERATORS = {">": "gt", ">=": "gte", "<": "lt", "<=": "lte", "": "eq"}
+_INVERTED_OPERATORS = {"gt": "lt", "gte": "lte", "lt": "gt", "lte": "gte", "eq": "eq"}
+
+_FILTER_RE = re.compile(r"^(?P<key>type|size|modified):(?P<value>\S+)$", re.IGNORECASE)
+_COMPARISON_RE = re.compile(r"^(?P<op>>=|<=|>|<)?(?P<value>.+)$")
+_SIZE_RE = re.compile(r"^(?P<number>\d+(?:\.\d+)?)(?P<unit>[KMGT]?)i?B?$", re.IGNORECASE)
+_AGE_RE = re.compile(r"^(?P<number>\d+)(?P<unit>[hdwmy])$", re.IGNORECASE)
+
+
+class SearchQuery:
+    """Parsed search query.
+
+    :param name: Words that the names of fsnodes must contain.
+    :param conditions: Filters, each of them is a list of operator, property and value.
+    """
+
+    def __init__(self, name: str, conditions: list[list[Any]]) -> None:
+        self.name = name
+        self.conditions = conditions
+
+    @property
+    def has_filters(self) -> bool:
+        """Whether the query contains any filter besides the name."""
+        return bool(self.conditions)
+
+    def to_request(self) -> list[Any]:
+        """Compile the query into the request for :meth:`nc.files.find`.
+
+        :return: The list of search parameters.
+        """
+        conditions = list(self.conditions)
+        if self.name:
+            conditions.insert(0, ["like", "name", f"%{self.name}%"])
+        if not conditions:
+            conditions.append(["like", "name", "%"])
+
+        req: list[Any] = []
+        for condition in conditions[:-1]:
+            req.extend(["and", *condition])
+        req.extend(conditions[-1])
+        return req
+
+
+def _parse_comparison(value: str) -> tuple[str, str]:
+    match = _COMPARISON_RE.match(value)
+    if match is None:
+        raise SearchQueryError(value)
+    return _OPERATORS[match["op"] or ""], match["value"]
+
+
+def _parse_type(value: str) -> list[Any]:
+    value = value.lower()
+    if value in ("dir", "folder"):
+        return ["eq", "mime", DIR_MIMETYPE]
+    if value in MIMETYPE_GROUPS:
+        return ["like", "mime", f"{value}/%"]
+    if "/" in value:
+        return ["like", "mime", value.replace("*", "%")]
+    return ["like", "name", f"%.{value.lstrip('.')}"]
+
+
+def _parse_size(value: str) -> list[Any]:
+    operator, value = _parse_comparison(value)
+    match = _SIZE_RE.match(value)
+    if match is None:
+        raise SearchQueryError(value)
+    size = int(float(match["number"]) * _SIZE_UNITS[match["unit"].upper()])
+    return [operator, "size", size]
+
+
+def _parse_modified(value: str, now: datetime) -> list[Any]:
+    operator, value = _parse_comparison(value)
+    match = _AGE_RE.match(value)
+    if match is not None:
+        # The age is compared, so "less than 30 days ago" is "after the date".
+        moment = now - int(match["number"]) * _AGE_UNITS[match["unit"].lower()]
+        return [_INVERTED_OPERATORS[operator], "last_modified", moment]
+    try:
+        moment = datetime.fromisoformat(value).replace(tzinfo=UTC)
+    except ValueError as error:
+        raise SearchQueryError(value) from error
+    return [operator, "last_modified", moment]
+
+
+def parse_search_query(text: str, now: datetime | None = None) -> SearchQuery:
+    """Parse the search query.
+
+    :param text: The search query entered by the user.
+    :param now: Moment the relative ages are counted from, defaults to the current time.
+    :raises SearchQueryError: If the value of a filter is invalid.
+    :return: The parsed query.
+    """
+    now = now or datetime.now(UTC).replace(microsecond=0)
+    words = []
+    conditions = []
+    for word in text.split():
+        match = _FILTER_RE.match(word)
+        if match is None:
+            words.append(word)
+            continue
+        key, value = match["key"].lower(), match["value"]
+        if key == "type":
+            conditions.append(_parse_type(value))
+        elif key == "size":
+            conditions.append(_parse_size(value))
+        else:
+            conditions.append(_parse_modified(value, now))
+    return SearchQuery(" ".join(words), conditions)
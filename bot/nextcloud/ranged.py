@@ -0,0 +1,142 @@
+"""Nextcloud file download over several concurrent HTTP Range requests.
+
+A single WebDAV GET is limited by the round-trip time of the connection, so big files
+are split into ranges fetched concurrently and written straight to their offsets in a
+preallocated file.
+"""
+
+import asyncio
+import os
+from typing import IO
+from urllib.parse import quote
+
+from nc_py_api import AsyncNextcloud, FsNode, NextcloudException
+from nc_py_api._exceptions import check_error
+from nc_py_api.files._files import dav_get_obj_path
+
+PARTIAL_CONTENT = 206
+PIECE_SIZE = 256 * 1024
+
+
+class RangeNotSatisfiedError(Exception):
+    """Raised when the server answered a range request with something else than the range."""
+
+
+class RangedDownload:
+    """Ranged download of a single file.
+
+    :param nc: The Nextcloud client object.
+    :param fsnode: The file to download.
+    :param connections: Maximum number of concurrent range requests.
+    :param range_size: Size of one range in bytes.
+    :param retries: Number of attempts to fetch the rest of a range after a failure.
+    """
+
+    def __init__(
+        self,
+        nc: AsyncNextcloud,
+        fsnode: FsNode,
+        connections: int,
+        range_size: int,
+        retries: int,
+    ) -> None:
+        self.nc = nc
+        self.fsnode = fsnode
+        self.connections = connections
+        self.range_size = range_size
+        self.retries = retries
+        self._dav_path = ""
+
+    async def _supports_ranges(self) -> bool:
+        """Ask the server whether it accepts range requests for the file."""
+        session = self.nc._session  # noqa: SLF001
+        response = await session.adapter_dav.request("HEAD", self._dav_path)
+        check_error(response, f"ranged download: path={self.fsnode.user_path}")
+        return response.headers.get("Accept-Ranges", "").lower() == "bytes"
+
+    async def _fetch_range(self, fd: int, start: int, end: int) -> int:
+        """Fetch the range and write it at its offset.
+
+        The range is received in `PIECE_SIZE` pieces, so concurrent workers hold little
+        memory regardless of the range size. The response is always closed, also when
+        the range is left early or the transfer fails.
+
+        :param fd: File descriptor of the preallocated file.
+        :param start: Offset of the first byte of the range.
+        :param end: Offset of the last byte of the range.
+        :return: Offset of the first byte that was not written.
+        """
+        session = self.nc._session  # noqa: SLF001
+        response = await session.adapter_dav.get(
+            self._dav_path,
+            headers={"Range": f"bytes={start}-{end}"},
+            stream=True,
+        )
+        offset = start
+        try:
+            check_error(response, f"ranged download: path={self.fsnode.user_path}")
+            if response.status_code != PARTIAL_CONTENT:
+                raise RangeNotSatisfiedError
+
+            async for data in await response.iter_raw(chunk_size=PIECE_SIZE):
+                await asyncio.to_thread(os.pwrite, fd, data[: end + 1 - offset], offset)
+                offset += len(data)
+                if offset > end:
+                    break
+        finally:
+            await response.close()
+        return offset
+
+    async def _worker(self, fd: int, ranges: asyncio.Queue[tuple[int, int]]) -> None:
+        while not ranges.empty():
+            start, end = ranges.get_nowait()
+            for attempt in range(self.retries + 1):
+                try:
+                    start = await self._fetch_range(fd, start, end)
+                except (OSError, NextcloudException):
+                    if attempt == self.retries:
+                        raise
+                    await asyncio.sleep(2**attempt)
+                    continue
+                if start > end:
+                    break
+            else:
+                raise RangeNotSatisfiedError
+
+    async def download(self, file: IO[bytes]) -> None:
+        """Download the file into the given file object.
+
+        A single stream is used if the server does not advertise range support or does not
+        honour the requested ranges.
+
+        :param file: Binary file object backed by a file descriptor.
+        """
+        self._dav_path = quote(dav_get_obj_path(await self.nc.user, self.fsnode.user_path))
+        size = self.fsnode.info.size
+        if size <= self.range_size or not await self._supports_ranges():
+            await self.nc.files.download2stream(self.fsnode, file, chunk_size=PIECE_SIZE)
+            return
+
+        file.truncate(size)
+        file.flush()
+        ranges: asyncio.Queue[tuple[int, int]] = asyncio.Queue()
+        for start in range(0, size, self.range_size):
+            ranges.put_nowait((start, min(start + self.range_size, size) - 1))
+
+        workers = [
+            asyncio.create_task(self._worker(file.fileno(), ranges))
+            for _ in range(min(self.connections, ranges.qsize()))
+        ]
+        try:
+            await asyncio.gather(*workers)
+        except RangeNotSatisfiedError:
+            for worker in workers:
+                worker.cancel()
+            file.seek(0)
+            file.truncate(0)
+            await self.nc.files.download2stream(self.fsnode, file, chunk_size=PIECE_SIZE)
+        except BaseException:
+            for worker in workers:
+                worker.cancel()
+            raise
+        file.seek(0)
@@ -1,10 +1,84 @@
 """Service that provide methods for fsnode searching in Nextcoud."""
 
+import xml.etree.ElementTree as ET
+from collections.abc import Hashable
 from typing import Any, Self
 
 from nc_py_api import AsyncNextcloud, FsNode
+from nc_py_api.files._files import (
+    build_find_request,
+    element_tree_as_str,
+    lf_parse_webdav_response,
+)
 
-from bot.nextcloud._base import BaseService
+from bot.core import settings
+from bot.db import UnitOfWork
+from bot.db.models import IndexedFsNode
+from bot.nextcloud._base import BaseService, coalesce
+from bot.nextcloud.cache import SearchResult, search_cache
+from bot.nextcloud.query import parse_search_query
+
+
+async def find_page(
+    nc: AsyncNextcloud,
+    req: list[Any],
+    limit: int,
+    offset: int = 0,
+) -> list[FsNode]:
+    """Search for fsnodes returning only one page of results.
+
+    :class:`AsyncNextcloud` always returns the whole result set, so the SEARCH request is
+    sent with `limit` and `firstresult` on its WebDAV session. The results are ordered by
+    name to keep the pages stable.
+
+    :param nc: The Nextcloud client object.
+    :param req: The list of search parameters.
+    :param limit: Maximum number of returned fsnodes.
+    :param offset: Number of fsnodes to skip, defaults to 0.
+    :return: The list of found fsnodes.
+    """
+    session = nc._session  # noqa: SLF001
+    user = await session.user
+    root = build_find_request(list(req), "", user, await session.capabilities)
+    xml_search = root[0]  # d:basicsearch
+    xml_order = ET.SubElement(
+        ET.SubElement(xml_search, "d:orderby"),
+        "d:order",
+    )
+    ET.SubElement(ET.SubElement(xml_order, "d:prop"), "d:displayname")
+    ET.SubElement(xml_order, "d:ascending")
+    xml_limit = ET.SubElement(xml_search, "d:limit")
+    ET.SubElement(xml_limit, "d:nresults").text = str(limit)
+    ET.SubElement(xml_limit, "nc:firstresult").text = str(offset)
+
+    response = await session.adapter_dav.request(
+        "SEARCH",
+        "",
+        data=element_tree_as_str(root),
+        headers={"Content-Type": "text/xml"},
+    )
+    return lf_parse_webdav_response(
+        session.cfg.dav_url_suffix,
+        response,
+        f"find: {user}, {req}, limit={limit}, offset={offset}",
+    )
+
+
+def _fsnode_from_index(user: str, record: IndexedFsNode) -> FsNode:
+    """Build the fsnode object from the indexed metadata.
+
+    :param user: Nextcloud user id.
+    :param record: The indexed fsnode.
+    :return: The fsnode object.
+    """
+    return FsNode(
+        f"files/{user}/{record.path}{'/' if record.is_dir else ''}",
+        file_id=record.file_id,
+        etag=record.etag,
+        size=record.size,
+        mimetype=record.mimetype,
+        last_modified=record.last_modified,
+    )
 
 
 class BaseSearchService:
@@ -12,24 +86,165 @@ class BaseSearchService:
 
     :param nc: The Nextcloud client object.
     :param fsnodes: The list of Nextcloud file nodes.
+    :param complete: Whether `fsnodes` contains all results or only the first of them.
     """
 
-    def __init__(self, nc: AsyncNextcloud, fsnodes: list[FsNode]) -> None:
+    def __init__(
+        self,
+        nc: AsyncNextcloud,
+        fsnodes: list[FsNode],
+        *,
+        complete: bool = True,
+    ) -> None:
         self.nc = nc
         self.fsnodes = fsnodes
+        self.complete = complete
 
 
 class SearchService(BaseService[BaseSearchService], BaseSearchService):
     """Implementation of Nextcloud search service."""
 
+    @staticmethod
+    async def _load(
+        nc: AsyncNextcloud,
+        req: list[Any],
+        count: int | None,
+        key: Hashable,
+    ) -> SearchResult:
+        result = await search_cache.get(nc, key) or SearchResult([], complete=False)
+
+        if count is None and not result.complete:
+            result = SearchResult(await nc.files.find(list(req)), complete=True)
+            await search_cache.set(nc, key, result)
+
+        while count is not None and not result.complete and len(result.fsnodes) < count:
+            window = max(settings.nc.search_window, count - len(result.fsnodes))
+            fsnodes = await find_page(nc, req, limit=window, offset=len(result.fsnodes))
+            result = SearchResult(result.fsnodes + fsnodes, complete=len(fsnodes) < window)
+            await search_cache.set(nc, key, result)
+
+        return result
+
     @classmethod
-    async def create_instance(cls, nc: AsyncNextcloud, req: list[str], **kwargs: Any) -> Self:
+    async def create_instance(
+        cls,
+        nc: AsyncNextcloud,
+        req: list[Any],
+        count: int | None = None,
+        key: Hashable | None = None,
+    ) -> Self:
         """Create a Nextcloud search service instance.
 
+        Results are cached per user and request for `settings.nc.search_cache_ttl`
+        seconds. When `count` is given, results are fetched from the server by windows of
+        `settings.nc.search_window` fsnodes until at least `count` of them are known.
+        Concurrent identical requests of the user share one search.
+
         :param nc: The Nextcloud client object.
         :param req: The list of search parameters.
-        :param kwargs: Additional search parameters.
+        :param count: Number of results needed, defaults to None (all of them).
+        :param key: Key of the results in the cache, defaults to the request itself.
         :return: The Nextcloud search service instance.
         """
-        fsnodes = await nc.files.find(req, **kwargs)
-        return cls(nc, fsnodes)
+        key = tuple(req) if key is None else key
+        result = await coalesce(
+            nc,
+            ("search", key, count),
+            lambda: cls._load(nc, req, count, key),
+        )
+        return cls(nc, list(result.fsnodes), complete=result.complete)
+
+    @classmethod
+    async def create_from_index(
+        cls,
+        nc: AsyncNextcloud,
+        uow: UnitOfWork,
+        user_id: int,
+        name: str,
+    ) -> Self | None:
+        """Create a search service instance with fsnodes whose name contains the text.
+
+        The fsnodes are found in the local index without asking Nextcloud. In the fuzzy
+        mode names and paths similar to the text are found as well, ranked by similarity
+        and recency. If the fuzzy query exceeds its time budget, only the first
+        `settings.nc.fuzzy_search_limit` names containing the text are found.
+
+        :param nc: The Nextcloud client object.
+        :param uow: Unit of work.
+        :param user_id: Telegram user id.
+        :param name: Part of the name to search for.
+        :return: The search service instance or None if the user's files are not indexed.
+        """
+        if not await uow.fsnodes.is_indexed(user_id):
+            return None
+        user = await nc.user
+
+        records = None
+        if settings.nc.fuzzy_search:
+            records = await uow.fsnodes.search_fuzzy(
+                user_id,
+                name,
+                limit=settings.nc.fuzzy_search_limit,
+                statement_timeout=settings.nc.fuzzy_search_timeout,
+            )
+        if records is None:
+            records = await uow.fsnodes.search_name(
+                user_id,
+                name,
+                limit=settings.nc.fuzzy_search_limit if settings.nc.fuzzy_search else None,
+            )
+        return cls(nc, [_fsnode_from_index(user, record) for record in records])
+
+    @classmethod
+    async def create_for_name(
+        cls,
+        nc: AsyncNextcloud,
+        uow: UnitOfWork,
+        user_id: int,
+        name: str,
+        count: int | None = None,
+    ) -> Self:
+        """Create a search service instance with fsnodes whose name contains the text.
+
+        The local index is used when it is enabled and the user's files are indexed,
+        Nextcloud is searched otherwise.
+
+        :param nc: The Nextcloud client object.
+        :param uow: Unit of work.
+        :param user_id: Telegram user id.
+        :param name: Part of the name to search for.
+        :param count: Number of results needed, defaults to None (all of them).
+        :return: The search service instance.
+        """
+        if settings.nc.index:
+            srv = await cls.create_from_index(nc, uow, user_id, name)
+            if srv is not None:
+                return srv
+        return await cls.create_instance(nc, ["like", "name", f"%{name}%"], count=count)
+
+    @classmethod
+    async def create_for_query(
+        cls,
+        nc: AsyncNextcloud,
+        uow: UnitOfWork,
+        user_id: int,
+        text: str,
+        count: int | None = None,
+    ) -> Self:
+        """Create a search service instance for the query entered by the user.
+
+        A query with filters is compiled into one request filtered by Nextcloud, a plain
+        query is searched by name.
+
+        :param nc: The Nextcloud client object.
+        :param uow: Unit of work.
+        :param user_id: Telegram user id.
+        :param text: The search query, see :mod:`bot.nextcloud.query` for its syntax.
+        :param count: Number of results needed, defaults to None (all of them).
+        :raises SearchQueryError: If the value of a filter is invalid.
+        :return: The search service instance.
+        """
+        query = parse_search_query(text)
+        if not query.has_filters:
+            return await cls.create_for_name(nc, uow, user_id, query.name, count=count)
+        return await cls.create_instance(nc, query.to_request(), count=count, key=text)
@@ -0,0 +1,57 @@
+"""Memory-bounded file transfers between Nextcloud and Telegram."""
+
+from collections.abc import AsyncGenerator
+from typing import IO, TYPE_CHECKING
+
+from aiogram.types import InputFile
+
+from bot.core import settings
+from bot.utils import MemoryBudget
+
+if TYPE_CHECKING:
+    from aiogram import Bot
+
+
+class SpooledInputFile(InputFile):
+    """Telegram input file that is read from an open file object without copying it.
+
+    :param file: Binary file object positioned at the start of the content.
+    :param filename: Filename to be propagated to Telegram.
+    """
+
+    def __init__(self, file: IO[bytes], filename: str) -> None:
+        super().__init__(filename=filename)
+        self.file = file
+
+    async def read(self, bot: "Bot") -> AsyncGenerator[bytes, None]:  # noqa: ARG002
+        """Yield the content of the file by chunks."""
+        self.file.seek(0)
+        while chunk := self.file.read(self.chunk_size):
+            yield chunk
+
+
+class FilePartInputFile(InputFile):
+    """Telegram input file that is a part of an open file object.
+
+    :param file: Binary file object the part is read from.
+    :param offset: Offset of the first byte of the part.
+    :param size: Size of the part in bytes.
+    :param filename: Filename to be propagated to Telegram.
+    """
+
+    def __init__(self, file: IO[bytes], offset: int, size: int, filename: str) -> None:
+        super().__init__(filename=filename)
+        self.file = file
+        self.offset = offset
+        self.size = size
+
+    async def read(self, bot: "Bot") -> AsyncGenerator[bytes, None]:  # noqa: ARG002
+        """Yield the content of the part by chunks."""
+        self.file.seek(self.offset)
+        left = self.size
+        while left > 0 and (chunk := self.file.read(min(self.chunk_size, left))):
+            left -= len(chunk)
+            yield chunk
+
+
+transfer_budget = MemoryBudget(limit=settings.nc.transfer_memory_limit)
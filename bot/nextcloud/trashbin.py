@@ -1,74 +1,149 @@
 """Service that provide methods for managing the trash bin in the Nextcloud."""
 
+import asyncio
+from collections.abc import Awaitable, Callable
 from typing import Self
 
-from nc_py_api import AsyncNextcloud, FsNode
+from nc_py_api import AsyncNextcloud, FsNode, NextcloudException
 
+from bot.core import settings
 from bot.nextcloud._base import BaseService
+from bot.nextcloud.cache import TrashbinSnapshot, trashbin_cache
 
 
 class BaseTrashbinService:
     """Base class for managing the trash bin in the Nextcloud.
 
+    The cached trash bin snapshot is patched in place by every action. Restored items
+    change the etags of their original directories, so their cached listings are listed
+    again when visited.
+
     :param nc: The Nextcloud client object.
-    :param trashbin: List of files in the trash bin.
+    :param snapshot: Cached snapshot of the trash bin.
     """
 
-    def __init__(self, nc: AsyncNextcloud, trashbin: list[FsNode]) -> None:
+    def __init__(self, nc: AsyncNextcloud, snapshot: TrashbinSnapshot) -> None:
         self.nc = nc
-        self.trashbin = trashbin
+        self.snapshot = snapshot
+
+    @property
+    def trashbin(self) -> list[FsNode]:
+        """List of files in the trash bin."""
+        return list(self.snapshot.items.values())
 
-    def _get_trashbin_item_by_id(self, file_id: str) -> FsNode | None:
+    async def _get_trashbin_item_by_id(self, file_id: str) -> FsNode:
         """Get an item from the trash bin by its ID.
 
+        The trash bin is fetched again if the item is missing from the snapshot, since
+        it may have been trashed after the snapshot was taken.
+
         :param file_id: The file id of the fsnode.
-        :return: Item from the trash bin or None if not found.
+        :return: Item from the trash bin.
         """
-        for trashbin_item in self.trashbin:
-            if trashbin_item.file_id == file_id:
-                return trashbin_item
-        return None
+        trashbin_item = self.snapshot.get(file_id)
+        if trashbin_item is None:
+            self.snapshot = await trashbin_cache.get(self.nc, refresh=True)
+            trashbin_item = self.snapshot.get(file_id)
+        if trashbin_item is None:
+            msg = "The file ID not found in the trashbin."
+            raise ValueError(msg)
+        return trashbin_item
 
     async def delete(self, file_id: str) -> None:
         """Delete an item from the trash bin by its ID.
 
         :param file_id: The file id of the fsnode.
         """
-        trashbin_item = self._get_trashbin_item_by_id(file_id)
-        if trashbin_item is None:
-            msg = "The file ID not found in the trashbin."
-            raise ValueError(msg)
-
+        trashbin_item = await self._get_trashbin_item_by_id(file_id)
         await self.nc.files.trashbin_delete(trashbin_item)
-        self.trashbin.remove(trashbin_item)
+        self.snapshot.remove(file_id)
 
     async def restore(self, file_id: str) -> None:
         """Restore an item from the trash bin by its ID.
 
         :param file_id: The file id of the fsnode.
         """
-        trashbin_item = self._get_trashbin_item_by_id(file_id)
-        if trashbin_item is None:
-            msg = "The file ID not found in the trashbin."
-            raise ValueError(msg)
-
+        trashbin_item = await self._get_trashbin_item_by_id(file_id)
         await self.nc.files.trashbin_restore(trashbin_item)
-        self.trashbin.remove(trashbin_item)
+        self.snapshot.remove(file_id)
+
+    def find_by_location(self, location: str) -> list[FsNode]:
+        """Return the items deleted from the directory or from any of its subdirectories.
+
+        :param location: Path of the directory relative to the user's root, e.g. "/Photos".
+        :return: Items from the trash bin whose original location is inside the directory.
+        """
+        prefix = location.strip("/")
+        if not prefix:
+            return self.trashbin
+        return [
+            trashbin_item
+            for trashbin_item in self.trashbin
+            if (original_location := trashbin_item.info.trashbin_original_location.strip("/"))
+            == prefix
+            or original_location.startswith(f"{prefix}/")
+        ]
+
+    async def _run_many(
+        self,
+        trashbin_items: list[FsNode],
+        action: Callable[[FsNode], Awaitable[None]],
+    ) -> tuple[list[FsNode], list[FsNode]]:
+        """Apply the action to the items concurrently.
+
+        At most `settings.nc.trashbin_concurrency` requests are sent at once. The items
+        the action succeeded for are removed from the snapshot.
+
+        :param trashbin_items: Items from the trash bin.
+        :param action: Coroutine function restoring or deleting a single item.
+        :return: Items the action succeeded for and items it failed for.
+        """
+        semaphore = asyncio.Semaphore(settings.nc.trashbin_concurrency)
+
+        async def run(trashbin_item: FsNode) -> bool:
+            async with semaphore:
+                try:
+                    await action(trashbin_item)
+                except NextcloudException:
+                    return False
+            self.snapshot.remove(trashbin_item.file_id)
+            return True
+
+        results = await asyncio.gather(*(run(trashbin_item) for trashbin_item in trashbin_items))
+        done = [item for item, ok in zip(trashbin_items, results, strict=True) if ok]
+        failed = [item for item, ok in zip(trashbin_items, results, strict=True) if not ok]
+        return done, failed
+
+    async def delete_many(self, trashbin_items: list[FsNode]) -> tuple[list[FsNode], list[FsNode]]:
+        """Delete the items from the trash bin permanently.
+
+        :param trashbin_items: Items from the trash bin.
+        :return: Deleted items and items that failed to be deleted.
+        """
+        return await self._run_many(trashbin_items, self.nc.files.trashbin_delete)
+
+    async def restore_many(
+        self,
+        trashbin_items: list[FsNode],
+    ) -> tuple[list[FsNode], list[FsNode]]:
+        """Restore the items from the trash bin.
+
+        :param trashbin_items: Items from the trash bin.
+        :return: Restored items and items that failed to be restored.
+        """
+        return await self._run_many(trashbin_items, self.nc.files.trashbin_restore)
 
     async def cleanup(self) -> None:
         """Clean up the trash bin by deleting all items."""
         await self.nc.files.trashbin_cleanup()
-        self.trashbin = []
+        self.snapshot.clear()
 
     def get_size(self) -> int:
-        """Calculate the total size of files in the trash bin.
+        """Return the total size of files in the trash bin.
 
         :return: Total size of files in the trash bin.
         """
-        size = 0
-        for fsnode in self.trashbin:
-            size += fsnode.info.size
-        return size
+        return self.snapshot.size
 
 
 class TrashbinService(BaseService[BaseTrashbinService], BaseTrashbinService):
@@ -78,8 +153,9 @@ class TrashbinService(BaseService[BaseTrashbinService], BaseTrashbinService):
     async def create_instance(cls, nc: AsyncNextcloud) -> Self:
         """Create an instance of the trashbin service.
 
+        The trash bin is listed only when the cached snapshot is missing or expired.
+
         :param nc: The Nextcloud client object.
         :return: Instance of the TrashbinService.
         """
-        trashbin = await nc.files.trashbin_list()
-        return cls(nc, trashbin)
+        return cls(nc, await trashbin_cache.get(nc))
@@ -1,5 +1,13 @@
 """States groups."""
 from .fsnode_menu import FsNodeMenuStatesGroup
 from .search import SearchStatesGroup
+from .selection import MAX_SELECTION, Selection
+from .trashbin import TrashbinStatesGroup
 
-__all__ = ("FsNodeMenuStatesGroup", "SearchStatesGroup")
+__all__ = (
+    "FsNodeMenuStatesGroup",
+    "SearchStatesGroup",
+    "TrashbinStatesGroup",
+    "MAX_SELECTION",
+    "Selection",
+)
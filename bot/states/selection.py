@@ -0,0 +1,91 @@
+"""Multi-select state kept in the FSM data."""
+
+from typing import ClassVar, Self
+
+from aiogram.fsm.context import FSMContext
+from nc_py_api import FsNode
+from pydantic import BaseModel, Field
+
+MAX_SELECTION = 100
+
+
+class Selection(BaseModel):
+    """Selection made in the multi-select mode of a menu message.
+
+    Buttons of the keyboard carry only the index of their item. The indexes are resolved
+    against `order`, the file ids the keyboard of the message was last rendered with, so a
+    button always refers to the item the user saw. Actions are performed on the selected
+    file ids and never on items added or reordered since.
+
+    :param message_id: ID of the menu message the selection belongs to.
+    :param order: File ids of the selectable items in the order of the keyboard.
+    :param selected: File ids of the selected items.
+    """
+
+    key: ClassVar[str] = "selection"
+
+    message_id: int
+    order: list[str] = Field(default_factory=list)
+    selected: list[str] = Field(default_factory=list)
+
+    @classmethod
+    async def load(cls, state: FSMContext, message_id: int) -> Self | None:
+        """Return the selection of the message.
+
+        :param state: State machine context.
+        :param message_id: ID of the menu message.
+        :return: The selection or None if the message is not in the multi-select mode.
+        """
+        raw_selection = (await state.get_data()).get(cls.key)
+        if raw_selection is None:
+            return None
+        selection = cls.model_validate(raw_selection)
+        return selection if selection.message_id == message_id else None
+
+    async def save(self, state: FSMContext) -> None:
+        """Store the selection in the FSM data.
+
+        :param state: State machine context.
+        """
+        await state.update_data({self.key: self.model_dump()})
+
+    @classmethod
+    async def clear(cls, state: FSMContext) -> None:
+        """Drop the selection from the FSM data.
+
+        :param state: State machine context.
+        """
+        await state.update_data({cls.key: None})
+
+    def toggle(self, index: int) -> None:
+        """Select or deselect the item rendered at the index.
+
+        :param index: Index of the item in the keyboard.
+        """
+        if index >= len(self.order):
+            return
+        file_id = self.order[index]
+        if file_id in self.selected:
+            self.selected.remove(file_id)
+        else:
+            self.selected.append(file_id)
+
+    def render(self, fsnodes: list[FsNode]) -> set[int]:
+        """Remember the order of the keyboard being rendered.
+
+        Selected items that are gone are dropped from the selection.
+
+        :param fsnodes: Items in the order of the keyboard.
+        :return: Indexes of the selected items in the keyboard.
+        """
+        self.order = [fsnode.file_id for fsnode in fsnodes[:MAX_SELECTION]]
+        self.selected = [file_id for file_id in self.selected if file_id in self.order]
+        return {index for index, file_id in enumerate(self.order) if file_id in self.selected}
+
+    def resolve(self, fsnodes: list[FsNode]) -> list[FsNode]:
+        """Return the selected items that are still present.
+
+        :param fsnodes: Items in the order of the keyboard.
+        :return: The selected items in the order of the keyboard.
+        """
+        return [fsnode for fsnode in fsnodes if fsnode.file_id in self.selected]
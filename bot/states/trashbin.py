@@ -0,0 +1,11 @@
+"""Trash bin states group."""
+from aiogram.fsm.state import State, StatesGroup
+
+
+class TrashbinStatesGroup(StatesGroup):
+    """A group of states for handling actions related to the trash bin.
+
+    This includes waiting for the directory whose deleted items are restored or deleted at once.
+    """
+
+    FILTER = State()
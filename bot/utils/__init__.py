@@ -1,4 +1,7 @@
 """Utility components."""
+from .lru_cache import LRUCache
+from .memory_budget import MemoryBudget
 from .mime_symbols import MIME_SYMBOLS
+from .single_flight import SingleFlight
 
-__all__ = ("MIME_SYMBOLS",)
+__all__ = ("MIME_SYMBOLS", "LRUCache", "MemoryBudget", "SingleFlight")
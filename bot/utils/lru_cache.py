@@ -0,0 +1,73 @@
+"""In-process LRU cache with optional time-to-live."""
+
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from typing import Generic, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class LRUCache(Generic[K, V]):
+    """Mapping that keeps at most `max_size` recently used items.
+
+    :param max_size: Maximum number of items kept in the cache.
+    :param ttl: Number of seconds after which an item expires, defaults to None (never).
+    """
+
+    def __init__(self, max_size: int, ttl: float | None = None) -> None:
+        self.max_size = max_size
+        self.ttl = ttl
+        self._items: OrderedDict[K, tuple[float, V]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def get(self, key: K) -> V | None:
+        """Return the item and mark it as recently used.
+
+        :param key: Key of the item.
+        :return: The item or None if it is missing or expired.
+        """
+        item = self._items.get(key)
+        if item is None:
+            return None
+        stored_at, value = item
+        if self.ttl is not None and time.monotonic() - stored_at >= self.ttl:
+            del self._items[key]
+            return None
+        self._items.move_to_end(key)
+        return value
+
+    def set(self, key: K, value: V) -> None:
+        """Store the item, evicting the least recently used ones on overflow.
+
+        :param key: Key of the item.
+        :param value: The item.
+        """
+        self._items[key] = (time.monotonic(), value)
+        self._items.move_to_end(key)
+        while len(self._items) > self.max_size:
+            self._items.popitem(last=False)
+
+    def pop(self, key: K) -> V | None:
+        """Remove the item from the cache.
+
+        :param key: Key of the item.
+        :return: The removed item or None if it was missing.
+        """
+        item = self._items.pop(key, None)
+        return None if item is None else item[1]
+
+    def discard_if(self, predicate: Callable[[K], bool]) -> None:
+        """Remove all items whose key matches the predicate.
+
+        :param predicate: Function that receives a key and tells whether to remove it.
+        """
+        for key in [key for key in self._items if predicate(key)]:
+            del self._items[key]
+
+    def clear(self) -> None:
+        """Remove all items from the cache."""
+        self._items.clear()
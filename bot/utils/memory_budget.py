@@ -0,0 +1,34 @@
+"""Ceiling for the memory held by concurrent operations."""
+
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+
+class MemoryBudget:
+    """Global ceiling for the memory held by in-flight transfers.
+
+    :param limit: Maximum number of bytes that transfers may hold in memory at once.
+    """
+
+    def __init__(self, limit: int) -> None:
+        self.limit = limit
+        self.used = 0
+        self._condition = asyncio.Condition()
+
+    @asynccontextmanager
+    async def reserve(self, size: int) -> AsyncIterator[None]:
+        """Wait until the requested number of bytes is available and hold it.
+
+        :param size: Number of bytes to reserve, capped by the limit.
+        """
+        size = min(size, self.limit)
+        async with self._condition:
+            await self._condition.wait_for(lambda: self.used + size <= self.limit)
+            self.used += size
+        try:
+            yield
+        finally:
+            async with self._condition:
+                self.used -= size
+                self._condition.notify_all()
@@ -0,0 +1,51 @@
+"""Coalescing of concurrent identical calls."""
+
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any, Generic, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class SingleFlight(Generic[K]):
+    """Runs at most one call per key at a time, concurrent callers share its result.
+
+    The call runs in its own task, so a cancelled caller does not cancel the call for
+    the others.
+    """
+
+    def __init__(self) -> None:
+        self._tasks: dict[K, asyncio.Future[Any]] = {}
+        self.calls = 0
+        self.collapsed = 0
+
+    @property
+    def stats(self) -> dict[str, int]:
+        """Return the number of made, collapsed and in-flight calls."""
+        return {"calls": self.calls, "collapsed": self.collapsed, "in_flight": len(self._tasks)}
+
+    async def do(self, key: K, func: Callable[[], Awaitable[V]]) -> V:
+        """Call the function or join the call in flight with the same key.
+
+        :param key: Key identifying identical calls.
+        :param func: Function making the call.
+        :return: Result of the call.
+        """
+        task = self._tasks.get(key)
+        if task is None:
+            self.calls += 1
+            task = asyncio.ensure_future(func())
+            self._tasks[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+        else:
+            self.collapsed += 1
+        result: V = await asyncio.shield(task)
+        return result
+
+    def _forget(self, key: K, task: asyncio.Future[Any]) -> None:
+        if self._tasks.get(key) is task:
+            del self._tasks[key]
+        if not task.cancelled():
+            # Mark the exception as retrieved if every caller was cancelled.
+            task.exception()
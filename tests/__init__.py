@@ -0,0 +1 @@
+"""Tests of the Nextcloud Telegram Bot."""
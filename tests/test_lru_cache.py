@@ -0,0 +1,83 @@
+"""Tests of the in-process LRU cache."""
+
+import pytest
+
+from bot.utils import LRUCache, lru_cache
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> _Clock:
+    """Replace the monotonic clock of the cache with a manual one."""
+    fake = _Clock()
+    monkeypatch.setattr(lru_cache.time, "monotonic", fake)
+    return fake
+
+
+def test_evicts_least_recently_used() -> None:
+    """The least recently used item is evicted on overflow."""
+    cache: LRUCache[str, int] = LRUCache(max_size=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert len(cache) == 2
+
+
+def test_set_refreshes_recency() -> None:
+    """Overwriting an item marks it as recently used."""
+    cache: LRUCache[str, int] = LRUCache(max_size=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.set("a", 10)
+    cache.set("c", 3)
+
+    assert cache.get("a") == 10
+    assert cache.get("b") is None
+
+
+def test_expires_after_ttl(clock: _Clock) -> None:
+    """An item is dropped once its time-to-live has elapsed."""
+    cache: LRUCache[str, int] = LRUCache(max_size=10, ttl=60)
+    cache.set("a", 1)
+
+    clock.now = 59.9
+    assert cache.get("a") == 1
+    clock.now = 60
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_without_ttl_never_expires(clock: _Clock) -> None:
+    """Items of a cache without time-to-live are only evicted by size."""
+    cache: LRUCache[str, int] = LRUCache(max_size=10)
+    cache.set("a", 1)
+
+    clock.now = 10**9
+    assert cache.get("a") == 1
+
+
+def test_pop_and_discard_if() -> None:
+    """Items are removed by key or by a predicate on the key."""
+    cache: LRUCache[tuple[str, int], int] = LRUCache(max_size=10)
+    for number in range(4):
+        cache.set(("user", number), number)
+    cache.set(("other", 0), 0)
+
+    assert cache.pop(("user", 0)) == 0
+    assert cache.pop(("user", 0)) is None
+    cache.discard_if(lambda key: key[0] == "user")
+
+    assert len(cache) == 1
+    assert cache.get(("other", 0)) == 0
@@ -0,0 +1,101 @@
+"""Tests of the memory budget of transfers."""
+
+import asyncio
+
+import pytest
+
+from bot.utils import MemoryBudget
+
+
+def test_waits_until_memory_is_released() -> None:
+    """A reservation that does not fit waits for another one to be released."""
+
+    async def scenario() -> None:
+        budget = MemoryBudget(limit=100)
+        order = []
+
+        async def hold(name: str, size: int, release: asyncio.Event) -> None:
+            async with budget.reserve(size):
+                order.append(name)
+                await release.wait()
+
+        release_first = asyncio.Event()
+        release_second = asyncio.Event()
+        first = asyncio.create_task(hold("first", 70, release_first))
+        await asyncio.sleep(0)
+        second = asyncio.create_task(hold("second", 50, release_second))
+        await asyncio.sleep(0)
+
+        assert order == ["first"]
+        assert budget.used == 70
+
+        release_first.set()
+        await first
+        await asyncio.sleep(0)
+        assert order == ["first", "second"]
+        assert budget.used == 50
+
+        release_second.set()
+        await second
+        assert budget.used == 0
+
+    asyncio.run(scenario())
+
+
+def test_released_on_exception() -> None:
+    """The reservation is returned when the transfer fails."""
+
+    async def scenario() -> None:
+        budget = MemoryBudget(limit=100)
+
+        async def transfer() -> None:
+            async with budget.reserve(80):
+                assert budget.used == 80
+                msg = "failed"
+                raise OSError(msg)
+
+        with pytest.raises(OSError, match="failed"):
+            await transfer()
+
+        assert budget.used == 0
+        async with budget.reserve(100):
+            assert budget.used == 100
+
+    asyncio.run(scenario())
+
+
+def test_released_on_cancellation() -> None:
+    """The reservation of a cancelled transfer is returned and waiters proceed."""
+
+    async def scenario() -> None:
+        budget = MemoryBudget(limit=100)
+        started = asyncio.Event()
+
+        async def hold() -> None:
+            async with budget.reserve(100):
+                started.set()
+                await asyncio.Event().wait()
+
+        task = asyncio.create_task(hold())
+        await started.wait()
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+        assert budget.used == 0
+        async with asyncio.timeout(1), budget.reserve(100):
+            assert budget.used == 100
+
+    asyncio.run(scenario())
+
+
+def test_oversized_reservation_is_capped() -> None:
+    """A reservation bigger than the limit takes the whole budget instead of waiting forever."""
+
+    async def scenario() -> None:
+        budget = MemoryBudget(limit=100)
+        async with asyncio.timeout(1), budget.reserve(1000):
+            assert budget.used == 100
+        assert budget.used == 0
+
+    asyncio.run(scenario())
@@ -0,0 +1,75 @@
+"""Tests of the search query parser."""
+
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+from bot.nextcloud.exceptions import SearchQueryError
+from bot.nextcloud.query import DIR_MIMETYPE, parse_search_query
+
+NOW = datetime(2024, 6, 1, 12, 0, tzinfo=UTC)
+
+
+def test_words_without_filters() -> None:
+    """Words that are not filters form the name."""
+    query = parse_search_query("annual  report", now=NOW)
+
+    assert query.name == "annual report"
+    assert not query.has_filters
+    assert query.to_request() == ["like", "name", "%annual report%"]
+
+
+def test_empty_query_matches_everything() -> None:
+    """A query without words and filters matches all names."""
+    assert parse_search_query("", now=NOW).to_request() == ["like", "name", "%"]
+
+
+@pytest.mark.parametrize(
+    ("text", "condition"),
+    [
+        ("type:pdf", ["like", "name", "%.pdf"]),
+        ("type:.PDF", ["like", "name", "%.pdf"]),
+        ("type:image", ["like", "mime", "image/%"]),
+        ("type:image/png", ["like", "mime", "image/png"]),
+        ("type:dir", ["eq", "mime", DIR_MIMETYPE]),
+        ("size:>10M", ["gt", "size", 10 * 2**20]),
+        ("size:<=1.5K", ["lte", "size", 1536]),
+        ("size:100", ["eq", "size", 100]),
+        ("modified:<30d", ["gt", "last_modified", NOW - timedelta(days=30)]),
+        ("modified:>1y", ["lt", "last_modified", NOW - timedelta(days=365)]),
+        ("modified:>=2024-01-31", ["gte", "last_modified", datetime(2024, 1, 31, tzinfo=UTC)]),
+    ],
+)
+def test_filter(text: str, condition: list[object]) -> None:
+    """Each filter is compiled into its condition."""
+    query = parse_search_query(text, now=NOW)
+
+    assert query.name == ""
+    assert query.conditions == [condition]
+
+
+def test_name_and_filters_are_combined() -> None:
+    """The name and all filters are joined by "and" in one request."""
+    query = parse_search_query("report TYPE:pdf size:>1M", now=NOW)
+
+    assert query.has_filters
+    assert query.to_request() == [
+        "and",
+        "like",
+        "name",
+        "%report%",
+        "and",
+        "like",
+        "name",
+        "%.pdf",
+        "gt",
+        "size",
+        2**20,
+    ]
+
+
+@pytest.mark.parametrize("text", ["size:big", "size:>", "modified:<soon", "modified:2024-13-01"])
+def test_invalid_filter(text: str) -> None:
+    """An invalid filter value is reported."""
+    with pytest.raises(SearchQueryError):
+        parse_search_query(text, now=NOW)
@@ -0,0 +1,71 @@
+"""Tests of the multi-select state."""
+
+import asyncio
+
+from aiogram.fsm.context import FSMContext
+from aiogram.fsm.storage.base import StorageKey
+from aiogram.fsm.storage.memory import MemoryStorage
+from nc_py_api import FsNode
+
+from bot.states import MAX_SELECTION, Selection
+
+
+def _fsnodes(*file_ids: str) -> list[FsNode]:
+    return [FsNode(f"files/user/{file_id}.txt", file_id=file_id) for file_id in file_ids]
+
+
+def _state() -> FSMContext:
+    return FSMContext(
+        storage=MemoryStorage(),
+        key=StorageKey(bot_id=1, chat_id=1, user_id=1),
+    )
+
+
+def test_toggle_resolves_rendered_order() -> None:
+    """An index refers to the item rendered at it, even after the items are reordered."""
+    selection = Selection(message_id=1)
+    assert selection.render(_fsnodes("a", "b", "c")) == set()
+
+    selection.toggle(1)
+    selection.toggle(2)
+    selection.toggle(2)
+
+    assert selection.selected == ["b"]
+    assert [fsnode.file_id for fsnode in selection.resolve(_fsnodes("c", "b", "a"))] == ["b"]
+
+
+def test_render_prunes_vanished_items() -> None:
+    """Selected items that are gone are dropped and the rest keep their new indexes."""
+    selection = Selection(message_id=1, selected=["a", "c"])
+
+    assert selection.render(_fsnodes("x", "c", "y")) == {1}
+    assert selection.selected == ["c"]
+
+
+def test_render_limits_selectable_items() -> None:
+    """Only the first `MAX_SELECTION` items can be selected."""
+    selection = Selection(message_id=1)
+    selection.render(_fsnodes(*(str(number) for number in range(MAX_SELECTION + 5))))
+
+    selection.toggle(MAX_SELECTION)
+
+    assert len(selection.order) == MAX_SELECTION
+    assert selection.selected == []
+
+
+def test_load_only_for_its_message() -> None:
+    """The stored selection is returned for its own message only and can be cleared."""
+
+    async def scenario() -> None:
+        state = _state()
+        await Selection(message_id=1, order=["a"], selected=["a"]).save(state)
+
+        loaded = await Selection.load(state, message_id=1)
+        assert loaded is not None
+        assert loaded.selected == ["a"]
+        assert await Selection.load(state, message_id=2) is None
+
+        await Selection.clear(state)
+        assert await Selection.load(state, message_id=1) is None
+
+    asyncio.run(scenario())
@@ -0,0 +1,103 @@
+"""Tests of the coalescing of concurrent identical calls."""
+
+import asyncio
+
+import pytest
+
+from bot.utils import SingleFlight
+
+
+def test_coalesces_concurrent_calls() -> None:
+    """Concurrent callers with the same key share one call and its result."""
+
+    async def scenario() -> None:
+        flight: SingleFlight[str] = SingleFlight()
+        release = asyncio.Event()
+        calls = 0
+
+        async def fetch() -> int:
+            nonlocal calls
+            calls += 1
+            await release.wait()
+            return 42
+
+        waiters = [asyncio.create_task(flight.do("key", fetch)) for _ in range(5)]
+        await asyncio.sleep(0)
+        release.set()
+
+        assert await asyncio.gather(*waiters) == [42] * 5
+        assert calls == 1
+        assert flight.stats == {"calls": 1, "collapsed": 4, "in_flight": 0}
+
+    asyncio.run(scenario())
+
+
+def test_distinct_keys_are_not_coalesced() -> None:
+    """Calls with different keys run separately."""
+
+    async def scenario() -> None:
+        flight: SingleFlight[str] = SingleFlight()
+
+        async def fetch(value: int) -> int:
+            await asyncio.sleep(0)
+            return value
+
+        results = await asyncio.gather(
+            flight.do("a", lambda: fetch(1)),
+            flight.do("b", lambda: fetch(2)),
+        )
+
+        assert results == [1, 2]
+        assert flight.stats["calls"] == 2
+
+    asyncio.run(scenario())
+
+
+def test_exception_is_shared_and_forgotten() -> None:
+    """All callers get the error and the next call is made again."""
+
+    async def scenario() -> None:
+        flight: SingleFlight[str] = SingleFlight()
+
+        async def fail() -> int:
+            await asyncio.sleep(0)
+            raise LookupError
+
+        results = await asyncio.gather(
+            flight.do("key", fail),
+            flight.do("key", fail),
+            return_exceptions=True,
+        )
+        assert all(isinstance(result, LookupError) for result in results)
+
+        async def succeed() -> int:
+            return 1
+
+        assert await flight.do("key", succeed) == 1
+        assert flight.stats["calls"] == 2
+
+    asyncio.run(scenario())
+
+
+def test_cancelled_caller_does_not_cancel_the_call() -> None:
+    """A cancelled caller leaves the shared call running for the others."""
+
+    async def scenario() -> None:
+        flight: SingleFlight[str] = SingleFlight()
+        release = asyncio.Event()
+
+        async def fetch() -> int:
+            await release.wait()
+            return 7
+
+        first = asyncio.create_task(flight.do("key", fetch))
+        second = asyncio.create_task(flight.do("key", fetch))
+        await asyncio.sleep(0)
+        first.cancel()
+        release.set()
+
+        assert await second == 7
+        with pytest.raises(asyncio.CancelledError):
+            await first
+
+    asyncio.run(scenario())